@@ -2,8 +2,7 @@
 Audio Player - Головний файл запуску
 """
 import sys
-from PyQt6.QtWidgets import QApplication
-from player.ui import MainWindow
+from player.cli import COMMANDS, build_parser, run_command
 from player.utils.logger import setup_logger, get_logger
 
 
@@ -11,11 +10,22 @@ def main():
     """Головна функція запуску програми"""
     # Налаштовуємо логування
     logger = setup_logger("AudioPlayer")
+    
+    # Без підкоманди всі аргументи належать Qt (наприклад, -style fusion)
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS + ('-h', '--help'):
+        args = build_parser().parse_args()
+        logger.info(f"Консольна команда: {args.command}")
+        return run_command(args)
+    
     logger.info("=" * 50)
     logger.info("Запуск Audio Player")
     logger.info("=" * 50)
     
     try:
+        # Qt імпортується лише для графічного режиму, консольні команди працюють без нього
+        from PyQt6.QtWidgets import QApplication
+        from player.ui import MainWindow
+        
         app = QApplication(sys.argv)
         app.setApplicationName("Audio Player")
         app.setOrganizationName("AudioPlayer")
@@ -35,5 +45,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
@@ -2,8 +2,16 @@
 Audio Player Package
 """
 
-from .audio_player import AudioPlayer
-from .playlist import Playlist
-
 __all__ = ['AudioPlayer', 'Playlist']
 
+
+def __getattr__(name):
+    # Ліниве імпортування (PEP 562): консольні команди та утиліти
+    # не завантажують Qt Multimedia, доки не потрібен сам програвач
+    if name == 'AudioPlayer':
+        from .audio_player import AudioPlayer
+        return AudioPlayer
+    if name == 'Playlist':
+        from .playlist import Playlist
+        return Playlist
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,12 @@
 """
 Audio player core module
 """
-from typing import Optional
+from typing import Optional, List, Iterator
 from pathlib import Path
-import random
+from collections import deque
 from enum import IntEnum
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-from mutagen import File as MutagenFile
-from mutagen.id3 import ID3NoHeaderError
 
 from .playlist import Playlist
 from .utils.logger import get_logger
@@ -23,6 +21,15 @@ class RepeatMode(IntEnum):
     ALL = 2  # Повторювати весь плейлист
 
 
+class ShuffleMode(IntEnum):
+    """Режими випадкового відтворення"""
+    OFF = 0  # За порядком плейлиста
+    RANDOM = 1  # Кожен трек один раз за прохід
+    SMART = 2  # Зважено: рідко відтворені частіше, нещодавні - рідше
+    ALBUM = 3  # Випадковий порядок альбомів, треки альбому підряд
+    FOLDER = 4  # Випадковий порядок папок, треки папки підряд
+
+
 class AudioPlayer(QObject):
     """Основний клас аудіо програвача"""
     
@@ -32,6 +39,7 @@ class AudioPlayer(QObject):
     state_changed = pyqtSignal(int)  # Стан програвача
     track_changed = pyqtSignal(str)  # Зміна треку
     error_occurred = pyqtSignal(str)  # Помилка
+    track_tags_ready = pyqtSignal(str, dict)  # Теги треку прочитано у фоні (шлях, теги)
     
     def __init__(self):
         super().__init__()
@@ -42,15 +50,32 @@ class AudioPlayer(QObject):
             self._player.setAudioOutput(self._audio_output)
             
             self._playlist = Playlist()
+            self._queue = deque()  # Черга "відтворити наступним" (плейлист не змінюється)
+            self._played_from_queue = set()  # Треки черги поза плейлистом, до яких можна повернутись
+            self._current_file = None  # Завантажений трек (з плейлиста або з черги)
             self._repeat_mode = RepeatMode.OFF
-            self._shuffle_mode = False
-            self._shuffle_history = []  # Історія відтворених треків для shuffle
+            self._shuffle_mode = ShuffleMode.OFF
+            self._shuffle_engine = None  # Випадковий порядок (ініціалізується при потребі)
+            self._weighted_shuffle = None  # Зважений вибір для SMART (ініціалізується при потребі)
+            self._group_shuffle = None  # Порядок груп для ALBUM та FOLDER (створюється при виборі режиму)
+            self._navigation = None  # Історія переходів назад/вперед (ініціалізується при потребі)
             self._volume = 50  # 0-100
             self._history = None  # Історія відтворення (ініціалізується при потребі)
             self._statistics = None  # Статистика відтворення (ініціалізується при потребі)
             self._artwork_cache = None  # Кеш обкладинок (ініціалізується при потребі)
+            self._metadata_index = None  # Індекс метаданих (ініціалізується при потребі)
+            self._tags_cache = None  # LRU-кеш тегів (ініціалізується при потребі)
+            self._metadata_prefetcher = None  # Фонове читання метаданих (ініціалізується при потребі)
+            self._library_scanner = None  # Інкрементальний сканер бібліотеки (ініціалізується при потребі)
+            self._library_watcher = None  # Нагляд за папками бібліотеки (ініціалізується при потребі)
+            self._search_index = None  # Пошуковий індекс треків (ініціалізується при потребі)
+            self._track_validator = None  # Фонова перевірка наявності треків (ініціалізується при потребі)
             
             # Підключення сигналів
+            self._playlist.rows_inserted.connect(self._on_shuffle_rows_inserted)
+            self._playlist.row_changed.connect(self._on_shuffle_row_changed)
+            self._playlist.playlist_reset.connect(self._on_shuffle_playlist_reset)
+            self._playlist.current_index_changed.connect(self._on_shuffle_current_changed)
             self._player.positionChanged.connect(self._on_position_changed)
             self._player.durationChanged.connect(self._on_duration_changed)
             self._player.playbackStateChanged.connect(self._on_state_changed)
@@ -91,7 +116,7 @@ class AudioPlayer(QObject):
         """Обробка завершення треку"""
         if self._repeat_mode == RepeatMode.ONE:
             # Повторюємо поточний трек (без додавання до історії)
-            current = self._playlist.get_current_track()
+            current = self._current_file or self._playlist.get_current_track()
             if current:
                 self.load_file(current)
                 self._player.play()  # Використовуємо _player.play() напряму, щоб не додавати до історії
@@ -127,6 +152,8 @@ class AudioPlayer(QObject):
             logger.info(f"Завантаження файлу: {file_path}")
             url = QUrl.fromLocalFile(str(file_path_obj.absolute()))
             self._player.setSource(url)
+            self._current_file = file_path
+            self.get_navigation_history().push(file_path)
             logger.debug(f"Файл успішно завантажено: {file_path}")
             return True
         except Exception as e:
@@ -147,9 +174,9 @@ class AudioPlayer(QObject):
         
         # Додаємо до історії та статистики тільки якщо це нове відтворення (не було паузи)
         if not was_playing:
-            current = self._playlist.get_current_track()
+            current = self._current_file
             if current:
-                info = self.get_track_info(current)
+                info = self.get_track_tags(current)
                 self.get_history().add_track(
                     current,
                     info.get('title'),
@@ -157,6 +184,8 @@ class AudioPlayer(QObject):
                 )
                 # Оновлюємо статистику
                 self.get_statistics().increment_play_count(current)
+                if self._weighted_shuffle is not None:
+                    self._weighted_shuffle.update(current)
     
     def pause(self):
         """Призупиняє відтворення"""
@@ -168,13 +197,26 @@ class AudioPlayer(QObject):
     
     def next(self):
         """Переходить до наступного треку"""
+        # Черга має пріоритет над порядком плейлиста
+        while self._queue:
+            track = self._queue.popleft()
+            if self.load_file(track):
+                if not self._playlist.contains(track):
+                    self._played_from_queue.add(track)
+                self.play()
+                self.track_changed.emit(track)
+                return
+        
         if self._playlist.get_count() == 0:
             return
         
-        if self._shuffle_mode:
-            track = self._get_shuffle_next()
-        else:
-            track = self._playlist.next_track()
+        # Після кроків назад спершу повертаємось тим самим шляхом
+        track = self._navigate(self.get_navigation_history().forward())
+        if not track:
+            if self._shuffle_mode:
+                track = self._get_shuffle_next()
+            else:
+                track = self._playlist.next_track()
         
         if track:
             if self.load_file(track):
@@ -182,44 +224,139 @@ class AudioPlayer(QObject):
                 self.track_changed.emit(track)
     
     def _get_shuffle_next(self) -> Optional[str]:
-        """Отримує наступний трек у режимі shuffle"""
-        tracks = self._playlist.get_tracks()
-        if not tracks:
+        """Отримує наступний трек у режимі shuffle (O(1) або O(log n) на крок)"""
+        if self._shuffle_mode == ShuffleMode.SMART:
+            track = self.get_weighted_shuffle().next(self._playlist.get_current_track())
+        elif self._group_shuffle is not None:
+            track = self._group_shuffle.next()
+        else:
+            track = self.get_shuffle_engine().next()
+        if track is None:
             return None
         
-        current_index = self._playlist.get_current_index()
-        
-        # Якщо всі треки відтворені, очищаємо історію
-        if len(self._shuffle_history) >= len(tracks):
-            self._shuffle_history.clear()
-        
-        # Отримуємо доступні треки (ті, що ще не відтворені)
-        available_indices = [i for i in range(len(tracks)) if i not in self._shuffle_history]
-        
-        # Якщо немає доступних, очищаємо історію
-        if not available_indices:
-            self._shuffle_history.clear()
-            available_indices = list(range(len(tracks)))
-        
-        # Вибираємо випадковий індекс
-        next_index = random.choice(available_indices)
-        self._shuffle_history.append(next_index)
-        
         # Встановлюємо поточний індекс
-        self._playlist.set_current_index(next_index)
-        return tracks[next_index]
+        self._playlist.set_current_index(self._playlist.index_of(track))
+        return track
     
-    def previous(self):
-        """Переходить до попереднього треку"""
-        if self._playlist.get_count() == 0:
+    def get_shuffle_engine(self):
+        """Отримує рушій випадкового порядку, синхронізований з плейлистом"""
+        if self._shuffle_engine is None:
+            from .utils.shuffle import ShuffleEngine
+            self._shuffle_engine = ShuffleEngine(self._playlist.get_tracks_view, self._playlist.contains)
+            self._shuffle_engine.reset(self._playlist.get_current_track())
+        return self._shuffle_engine
+    
+    def get_weighted_shuffle(self):
+        """Отримує зважений вибір треків за статистикою відтворення"""
+        if self._weighted_shuffle is None:
+            from .utils.weighted_shuffle import WeightedShuffle
+            self._weighted_shuffle = WeightedShuffle(
+                self._playlist.get_tracks_view,
+                self.get_statistics().get_stats,
+                self._playlist.contains
+            )
+        return self._weighted_shuffle
+    
+    def _get_indexed_tags(self, file_paths: List[str]) -> dict:
+        """Теги треків з індексу метаданих одним запитом (без звернень до файлів)"""
+        rows = self.get_metadata_index().get_many(file_paths)
+        return {file_path: row[2] for file_path, row in rows.items()}
+    
+    def _shuffle_orders(self) -> list:
+        """Створені порядки shuffle, які треба тримати в синхроні з плейлистом"""
+        orders = (self._shuffle_engine, self._weighted_shuffle, self._group_shuffle)
+        return [order for order in orders if order is not None]
+    
+    def _on_shuffle_rows_inserted(self, first: int, last: int):
+        """Нові треки потрапляють у пул поточного проходу"""
+        orders = self._shuffle_orders()
+        if not orders:
             return
-        
-        track = self._playlist.previous_track()
+        tracks = list(self._playlist.get_tracks_view()[first:last + 1])
+        for order in orders:
+            order.add_many(tracks)
+    
+    def _on_shuffle_row_changed(self, index: int):
+        """Перейменований трек додається в пул під новим шляхом"""
+        track = self._playlist.get_track_at(index)
+        if track:
+            for order in self._shuffle_orders():
+                order.add(track)
+    
+    def _on_shuffle_playlist_reset(self):
+        """Вміст плейлиста змінився повністю - пули перебудуються при наступному кроці"""
+        for order in self._shuffle_orders():
+            order.invalidate()
+    
+    def _on_shuffle_current_changed(self, index: int):
+        """Трек, вибраний користувачем, не повториться в поточному проході"""
+        if self._shuffle_mode == ShuffleMode.RANDOM:
+            order = self._shuffle_engine
+        elif self._group_shuffle is not None:
+            # Група вибраного треку дограє від нього до кінця
+            order = self._group_shuffle
+        else:
+            return
+        track = self._playlist.get_track_at(index)
+        if track:
+            order.set_current(track)
+    
+    def previous(self):
+        """Переходить до попереднього треку (фактично відтвореного, зокрема в shuffle)"""
+        track = self._navigate(self.get_navigation_history().back())
+        if not track and not self._shuffle_mode:
+            # Історія вичерпана - попередній за порядком плейлиста
+            track = self._playlist.previous_track()
+            if track:
+                self.get_navigation_history().push_back(track)
         if track:
             if self.load_file(track):
                 self.play()
                 self.track_changed.emit(track)
     
+    def enqueue(self, file_paths: List[str], play_next: bool = False) -> int:
+        """
+        Додає треки в чергу відтворення (без зміни плейлиста)
+        
+        Args:
+            file_paths: Шляхи треків (наприклад, увесь альбом)
+            play_next: True - перед уже доданими в чергу, інакше - в кінець
+            
+        Returns:
+            Кількість треків у черзі
+        """
+        if play_next:
+            self._queue.extendleft(reversed(file_paths))
+        else:
+            self._queue.extend(file_paths)
+        logger.debug(f"У чергу додано {len(file_paths)} треків, у черзі: {len(self._queue)}")
+        return len(self._queue)
+    
+    def get_queue(self) -> List[str]:
+        """Повертає треки черги в порядку відтворення"""
+        return list(self._queue)
+    
+    def clear_queue(self):
+        """Очищає чергу відтворення"""
+        self._queue.clear()
+    
+    def get_navigation_history(self):
+        """Отримує історію переходів між треками"""
+        if self._navigation is None:
+            from .utils.navigation import NavigationHistory
+            self._navigation = NavigationHistory(contains=self._is_navigable)
+        return self._navigation
+    
+    def _is_navigable(self, track: str) -> bool:
+        """Трек з історії доступний, якщо він у плейлисті або відтворювався з черги"""
+        return self._playlist.contains(track) or track in self._played_from_queue
+    
+    def _navigate(self, track: Optional[str]) -> Optional[str]:
+        """Робить трек з історії поточним у плейлисті"""
+        if track:
+            self._playlist.set_current_index(self._playlist.index_of(track))
+        return track
+    
     def set_position(self, position: int):
         """
         Встановлює позицію відтворення
@@ -299,74 +436,338 @@ class AudioPlayer(QObject):
         return self._statistics
     
     def set_shuffle(self, enabled: bool):
-        """Встановлює режим випадкового відтворення"""
-        self._shuffle_mode = enabled
-        if enabled:
-            # Очищаємо історію при увімкненні shuffle
-            self._shuffle_history = []
-        else:
-            # Очищаємо історію при вимкненні shuffle
-            self._shuffle_history = []
+        """
+        Вмикає або вимикає випадкове відтворення
+        
+        Увімкнення зберігає вже вибраний режим shuffle (за замовчуванням RANDOM).
+        """
+        if not enabled:
+            self.set_shuffle_mode(ShuffleMode.OFF)
+        elif self._shuffle_mode == ShuffleMode.OFF:
+            self.set_shuffle_mode(ShuffleMode.RANDOM)
     
     def get_shuffle(self) -> bool:
         """Повертає стан режиму випадкового відтворення"""
-        return self._shuffle_mode
+        return self._shuffle_mode != ShuffleMode.OFF
+    
+    def set_shuffle_mode(self, mode: int):
+        """
+        Встановлює режим випадкового відтворення
+        
+        Args:
+            mode: ShuffleMode.OFF (0), RANDOM (1), SMART (2), ALBUM (3) або FOLDER (4)
+        """
+        try:
+            self._shuffle_mode = ShuffleMode(mode)
+        except ValueError:
+            logger.warning(f"Невірний режим shuffle: {mode}, встановлюю OFF")
+            self._shuffle_mode = ShuffleMode.OFF
+        if self._shuffle_mode == ShuffleMode.RANDOM:
+            # Новий прохід починається з поточного треку
+            self.get_shuffle_engine().reset(self._playlist.get_current_track())
+        
+        self._group_shuffle = None
+        if self._shuffle_mode in (ShuffleMode.ALBUM, ShuffleMode.FOLDER):
+            from .utils.group_shuffle import GroupShuffle, album_key, folder_key
+            key_func = album_key if self._shuffle_mode == ShuffleMode.ALBUM else folder_key
+            self._group_shuffle = GroupShuffle(
+                self._playlist.get_tracks_view,
+                key_func,
+                self._get_indexed_tags if key_func is album_key else None,
+                self._playlist.index_of,
+                self._playlist.contains
+            )
+            self._group_shuffle.reset(self._playlist.get_current_track())
+    
+    def get_shuffle_mode(self) -> int:
+        """Повертає поточний режим випадкового відтворення"""
+        return int(self._shuffle_mode)
     
     def get_playlist(self) -> Playlist:
         """Повертає об'єкт плейлисту"""
         return self._playlist
     
-    def get_track_info(self, file_path: str) -> dict:
+    def get_metadata_index(self):
+        """Отримує персистентний індекс метаданих"""
+        if self._metadata_index is None:
+            from .utils.metadata_index import MetadataIndex
+            self._metadata_index = MetadataIndex()
+        return self._metadata_index
+    
+    def get_tags_cache(self):
+        """Отримує LRU-кеш тегів у пам'яті"""
+        if self._tags_cache is None:
+            from .utils.metadata_cache import TrackTagsCache
+            self._tags_cache = TrackTagsCache()
+        return self._tags_cache
+    
+    def get_library_scanner(self):
+        """Отримує інкрементальний сканер бібліотеки"""
+        if self._library_scanner is None:
+            from .utils.library_scanner import LibraryScanner
+            self._library_scanner = LibraryScanner()
+        return self._library_scanner
+    
+    def get_library_watcher(self):
+        """Отримує спостерігача за папками бібліотеки"""
+        if self._library_watcher is None:
+            from .utils.library_watcher import LibraryWatcher
+            self._library_watcher = LibraryWatcher(self.get_library_scanner(), parent=self)
+        return self._library_watcher
+    
+    def get_track_validator(self):
+        """Отримує фонову перевірку наявності треків"""
+        if self._track_validator is None:
+            from .utils.track_validator import TrackValidator
+            self._track_validator = TrackValidator(parent=self)
+        return self._track_validator
+    
+    def invalidate_track_tags(self, file_paths: List[str]):
         """
-        Отримує метадані треку
+        Видаляє теги треків з кешу в пам'яті (індекс перевіряє актуальність сам)
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        cache = self.get_tags_cache()
+        for file_path in file_paths:
+            cache.invalidate(file_path)
+    
+    def get_search_index(self):
+        """Отримує пошуковий індекс треків"""
+        if self._search_index is None:
+            from .utils.search_index import SearchIndex
+            self._search_index = SearchIndex()
+        return self._search_index
+    
+    def _index_track(self, file_path: str, info: Optional[dict]):
+        """Додає трек у пошуковий індекс (без тегів - лише за іменем файлу)"""
+        info = info or {}
+        self.get_search_index().add(file_path, (
+            info.get('title', ''),
+            info.get('artist', ''),
+            info.get('album', ''),
+            Path(file_path).stem
+        ))
+    
+    def _on_track_tags_ready(self, file_path: str, info: dict):
+        """Оновлює пошуковий індекс та групи shuffle, коли теги прочитано у фоні"""
+        if file_path in self.get_search_index():
+            self._index_track(file_path, info)
+        if self._group_shuffle is not None:
+            self._group_shuffle.regroup(file_path, info)
+    
+    def index_tracks(self, file_paths: List[str]):
+        """
+        Додає треки в пошуковий індекс за даними індексу метаданих (одним запитом)
+        
+        Треки без метаданих індексуються за іменем файлу і оновлюються,
+        коли теги прочитано у фоні (сигнал track_tags_ready).
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        search_index = self.get_search_index()
+        new_paths = [path for path in file_paths if path not in search_index]
+        if not new_paths:
+            return
+        rows = self.get_metadata_index().get_many(new_paths)
+        for file_path in new_paths:
+            row = rows.get(file_path)
+            self._index_track(file_path, row[2] if row else None)
+    
+    def search_tracks(self, query: str) -> List[str]:
+        """
+        Шукає треки за назвою, виконавцем, альбомом та іменем файлу
+        
+        Args:
+            query: Рядок пошуку
+            
+        Returns:
+            Список шляхів знайдених треків
+        """
+        return self.get_search_index().search(query)
+    
+    def forget_tracks(self, file_paths: List[str]):
+        """
+        Видаляє дані видалених файлів з кешу тегів, індексу та кешу обкладинок
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        self.invalidate_track_tags(file_paths)
+        self.get_metadata_index().remove_many(file_paths)
+        self.get_artwork_cache().remove(file_paths)
+        search_index = self.get_search_index()
+        for file_path in file_paths:
+            search_index.remove(file_path)
+    
+    def rename_track_data(self, old_path: str, new_path: str):
+        """
+        Переносить дані переміщеного файлу в індексі та кеші обкладинок
+        
+        Args:
+            old_path: Старий шлях
+            new_path: Новий шлях
+        """
+        self.invalidate_track_tags([old_path])
+        if Path(old_path).stem == Path(new_path).stem:
+            self.get_metadata_index().rename(old_path, new_path)
+        else:
+            # Назва без тегів береться з імені файлу - запис треба перечитати
+            self.get_metadata_index().remove(old_path)
+        self.get_artwork_cache().rename(old_path, new_path)
+        if old_path in self.get_search_index():
+            self.get_search_index().remove(old_path)
+            self.index_tracks([new_path])
+    
+    def _read_track_tags(self, file_path: str) -> dict:
+        """
+        Повертає теги треку: LRU-кеш -> індекс -> читання файлу
         
         Args:
             file_path: Шлях до аудіофайлу
             
         Returns:
-            Словник з метаданими
+            Словник з метаданими (не змінювати - спільний з кешем)
         """
-        info = {
-            'title': Path(file_path).stem,
-            'artist': 'Невідомий виконавець',
-            'album': 'Невідомий альбом',
-            'duration': 0,
-            'file_path': file_path,
-            'artwork': None
-        }
+        from .utils.metadata import default_track_tags, read_track_tags
+        from .utils.metadata_index import get_file_signature
         
-        try:
-            audio_file = MutagenFile(file_path)
-            if audio_file is not None:
-                # Отримуємо тривалість
-                if hasattr(audio_file, 'info') and hasattr(audio_file.info, 'length'):
-                    info['duration'] = int(audio_file.info.length * 1000)  # Конвертуємо в мс
-                
-                # Отримуємо метадані
-                if 'TIT2' in audio_file or 'TITLE' in audio_file:
-                    title = audio_file.get('TIT2', audio_file.get('TITLE', ['']))
-                    if title:
-                        info['title'] = str(title[0])
-                
-                if 'TPE1' in audio_file or 'ARTIST' in audio_file:
-                    artist = audio_file.get('TPE1', audio_file.get('ARTIST', ['']))
-                    if artist:
-                        info['artist'] = str(artist[0])
-                
-                if 'TALB' in audio_file or 'ALBUM' in audio_file:
-                    album = audio_file.get('TALB', audio_file.get('ALBUM', ['']))
-                    if album:
-                        info['album'] = str(album[0])
-                
-                # Отримуємо обкладинку
-                # Використовуємо кеш обкладинок
-                if self._artwork_cache is None:
-                    from .utils.artwork_cache import ArtworkCache
-                    self._artwork_cache = ArtworkCache()
-                info['artwork'] = self._artwork_cache.get_artwork(file_path)
-        except (ID3NoHeaderError, Exception) as e:
-            # Якщо не вдалося прочитати метадані, використовуємо значення за замовчуванням
-            logger.debug(f"Помилка читання метаданих {file_path}: {e}")
+        cache = self.get_tags_cache()
+        info = cache.get(file_path)
+        if info is not None:
+            return info
         
+        signature = get_file_signature(file_path)
+        if signature is None:
+            return default_track_tags(file_path)
+        
+        mtime_ns, size = signature
+        index = self.get_metadata_index()
+        info = index.get(file_path, mtime_ns, size)
+        if info is None:
+            info = read_track_tags(file_path)
+            index.put(file_path, mtime_ns, size, info)
+        cache.put(file_path, signature, info)
         return info
-
+    
+    def get_cached_track_tags(self, file_path: str) -> Optional[dict]:
+        """
+        Повертає теги треку лише якщо вони вже є в кеші чи індексі (без читання файлу)
+        
+        Args:
+            file_path: Шлях до аудіофайлу
+            
+        Returns:
+            Словник з метаданими або None якщо запис відсутній чи застарів
+        """
+        from .utils.metadata import default_track_tags
+        from .utils.metadata_index import get_file_signature
+        
+        cache = self.get_tags_cache()
+        info = cache.get(file_path)
+        if info is not None:
+            return dict(info)
+        
+        signature = get_file_signature(file_path)
+        if signature is None:
+            return default_track_tags(file_path)
+        info = self.get_metadata_index().get(file_path, *signature)
+        if info is not None:
+            cache.put(file_path, signature, info)
+            return dict(info)
+        return None
+    
+    def get_metadata_prefetcher(self):
+        """Отримує пул фонового читання метаданих"""
+        if self._metadata_prefetcher is None:
+            from .utils.metadata_prefetch import MetadataPrefetcher
+            self._metadata_prefetcher = MetadataPrefetcher(self._read_track_tags)
+            self._metadata_prefetcher.track_tags_ready.connect(self.track_tags_ready)
+            self.track_tags_ready.connect(self._on_track_tags_ready)
+        return self._metadata_prefetcher
+    
+    def prefetch_track_tags(self, file_paths: List[str]):
+        """
+        Запускає фонове читання тегів; результати надходять через сигнал track_tags_ready
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        self.get_metadata_prefetcher().prefetch(file_paths)
+    
+    def cancel_prefetch(self):
+        """Скасовує заплановане фонове читання тегів"""
+        if self._metadata_prefetcher is not None:
+            self._metadata_prefetcher.cancel()
+    
+    def get_track_tags(self, file_path: str) -> dict:
+        """
+        Отримує теги треку без обкладинки (дешевий шлях для сортування, списків, статистики)
+        
+        Args:
+            file_path: Шлях до аудіофайлу
+            
+        Returns:
+            Словник з метаданими (title, artist, album, duration, format, file_path)
+        """
+        return dict(self._read_track_tags(file_path))
+    
+    def get_track_infos(self, file_paths: List[str], chunk_size: int = 256,
+                        max_workers: Optional[int] = None) -> Iterator[dict]:
+        """
+        Пакетно отримує теги треків, розподіляючи читання файлів між процесами
+        
+        Актуальні записи беруться з індексу, решта читаються пулом процесів
+        частинами по chunk_size і одразу зберігаються в індекс. Результати
+        повертаються по мірі готовності (порядок не гарантується).
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+            chunk_size: Кількість файлів в одному завданні процесу
+            max_workers: Кількість процесів (None - за кількістю ядер)
+            
+        Yields:
+            Словники з метаданими (як get_track_tags)
+        """
+        from .utils.metadata import read_track_tags_many
+        
+        yield from read_track_tags_many(self.get_metadata_index(), file_paths, chunk_size, max_workers)
+    
+    def get_artwork_cache(self):
+        """Отримує кеш обкладинок"""
+        if self._artwork_cache is None:
+            from .utils.artwork_cache import ArtworkCache
+            self._artwork_cache = ArtworkCache()
+        return self._artwork_cache
+    
+    def get_artwork(self, file_path: str):
+        """
+        Отримує обкладинку треку через кеш обкладинок
+        
+        Args:
+            file_path: Шлях до аудіофайлу
+            
+        Returns:
+            QPixmap з обкладинкою або None
+        """
+        if not Path(file_path).exists():
+            return None
+        
+        return self.get_artwork_cache().get_artwork(file_path)
+    
+    def get_track_info(self, file_path: str) -> dict:
+        """
+        Отримує метадані треку
+        
+        Обкладинка завантажується ліниво - лише при зверненні до ключа 'artwork'.
+        
+        Args:
+            file_path: Шлях до аудіофайлу
+            
+        Returns:
+            Словник з метаданими
+        """
+        from .utils.metadata import TrackInfo
+        return TrackInfo(self._read_track_tags(file_path), lambda: self.get_artwork(file_path))
@@ -0,0 +1,236 @@
+"""
+Консольні команди: сканування, індексація, експорт плейлиста, статистика
+
+Команди не використовують Qt, тож підходять для запуску з cron на
+серверах без графічного оточення.
+"""
+from pathlib import Path
+from typing import List, Tuple
+import argparse
+import os
+import sys
+import time
+
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MB = 1024 * 1024
+COMMANDS = ('scan', 'index', 'export-playlist', 'stats')
+SORT_FIELDS = ('path', 'title', 'artist', 'album')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Створює розбирач аргументів командного рядка
+
+    Returns:
+        ArgumentParser з підкомандами scan, index, export-playlist, stats
+    """
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Audio Player. Без команди запускається графічний інтерфейс."
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='КОМАНДА')
+
+    scan_parser = subparsers.add_parser('scan', help="Інкрементально просканувати папки бібліотеки")
+    scan_parser.add_argument('folders', nargs='+', metavar='ПАПКА')
+
+    index_parser = subparsers.add_parser('index', help="Прочитати теги нових та змінених файлів в індекс")
+    index_parser.add_argument('folders', nargs='+', metavar='ПАПКА')
+    index_parser.add_argument('--workers', type=int, default=None,
+                              help="Кількість процесів (за замовчуванням - за кількістю ядер)")
+    index_parser.add_argument('--chunk-size', type=int, default=256,
+                              help="Кількість файлів в одному завданні процесу")
+
+    export_parser = subparsers.add_parser('export-playlist', help="Зберегти аудіофайли папок у плейлист")
+    export_parser.add_argument('folders', nargs='+', metavar='ПАПКА')
+    export_parser.add_argument('-o', '--output', required=True, help="Файл плейлиста (.m3u або .json)")
+    export_parser.add_argument('--sort', choices=SORT_FIELDS, default='path', help="Порядок треків")
+
+    stats_parser = subparsers.add_parser('stats', help="Показати статистику відтворення та бібліотеки")
+    stats_parser.add_argument('--top', type=int, default=10, help="Кількість треків у топі")
+
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """
+    Виконує підкоманду
+
+    Args:
+        args: Результат build_parser().parse_args()
+
+    Returns:
+        Код завершення процесу
+    """
+    handlers = {
+        'scan': _cmd_scan,
+        'index': _cmd_index,
+        'export-playlist': _cmd_export_playlist,
+        'stats': _cmd_stats,
+    }
+    try:
+        return handlers[args.command](args)
+    except FileNotFoundError as e:
+        print(f"Помилка: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        logger.error(f"Помилка виконання команди {args.command}: {e}", exc_info=True)
+        print(f"Помилка: {e}", file=sys.stderr)
+        return 1
+
+
+def _format_throughput(count: int, total_bytes: int, elapsed: float, unit: str = "файлів") -> str:
+    """Форматує підсумок: кількість, обсяг, час та швидкість"""
+    elapsed = max(elapsed, 1e-6)
+    return (f"{count} {unit}, {total_bytes / MB:.1f} МБ за {elapsed:.2f} с "
+            f"({count / elapsed:.0f} {unit}/с, {total_bytes / MB / elapsed:.1f} МБ/с)")
+
+
+def _format_duration(milliseconds: int) -> str:
+    """Форматує тривалість у H:MM:SS"""
+    total_seconds = milliseconds // 1000
+    return f"{total_seconds // 3600}:{total_seconds % 3600 // 60:02d}:{total_seconds % 60:02d}"
+
+
+def _scan_folders(folders: List[str], index=None) -> Tuple[List[str], int, list]:
+    """
+    Сканує папки через LibraryScanner (зі знімками, як у графічному інтерфейсі)
+
+    Args:
+        folders: Кореневі папки
+        index: MetadataIndex для синхронізації видалених і переміщених файлів
+
+    Returns:
+        Кортеж (шляхи аудіофайлів, загальний розмір у байтах, список ScanDelta)
+    """
+    from .utils.library_scanner import LibraryScanner
+
+    missing = [folder for folder in folders if not os.path.isdir(folder)]
+    if missing:
+        raise FileNotFoundError(f"Папку не знайдено: {', '.join(missing)}")
+
+    scanner = LibraryScanner()
+    file_paths, total_bytes, deltas = [], 0, []
+    for folder in folders:
+        delta = scanner.scan(folder)
+        if index is not None:
+            for old_path, new_path in delta.renamed:
+                index.rename(old_path, new_path)
+            index.remove_many(delta.removed)
+        deltas.append(delta)
+        file_paths.extend(scanner.get_files(folder))
+        total_bytes += scanner.get_total_size(folder)
+    return file_paths, total_bytes, deltas
+
+
+def _cmd_scan(args: argparse.Namespace) -> int:
+    """Команда scan: оновлює знімки папок та звітує про зміни"""
+    start = time.perf_counter()
+    file_paths, total_bytes, deltas = _scan_folders(args.folders)
+    elapsed = time.perf_counter() - start
+
+    print(f"Нових: {sum(len(d.added) for d in deltas)}, "
+          f"видалених: {sum(len(d.removed) for d in deltas)}, "
+          f"змінених: {sum(len(d.changed) for d in deltas)}, "
+          f"переміщених: {sum(len(d.renamed) for d in deltas)}")
+    print(f"Папок перечитано: {sum(d.dirs_listed for d in deltas)}, "
+          f"без змін: {sum(d.dirs_skipped for d in deltas)}")
+    print(f"Сканування: {_format_throughput(len(file_paths), total_bytes, elapsed)}")
+    return 0
+
+
+def _cmd_index(args: argparse.Namespace) -> int:
+    """Команда index: прогріває індекс метаданих (перечитуються лише змінені файли)"""
+    from .utils.metadata import read_track_tags_many
+    from .utils.metadata_index import MetadataIndex
+
+    index = MetadataIndex()
+    try:
+        start = time.perf_counter()
+        file_paths, total_bytes, _ = _scan_folders(args.folders, index)
+        count = sum(1 for _ in read_track_tags_many(index, file_paths, args.chunk_size, args.workers))
+        elapsed = time.perf_counter() - start
+
+        print(f"Записів в індексі: {index.get_count()}, виконавців: {len(index.get_artists())}")
+        print(f"Індексація: {_format_throughput(count, total_bytes, elapsed)}")
+    finally:
+        index.close()
+    return 0
+
+
+def _cmd_export_playlist(args: argparse.Namespace) -> int:
+    """Команда export-playlist: зберігає аудіофайли папок у M3U або JSON"""
+    from .utils.metadata import read_track_tags_many
+    from .utils.metadata_index import MetadataIndex
+    from .utils.playlist_io import save_m3u_playlist, save_json_playlist
+
+    index = MetadataIndex()
+    try:
+        start = time.perf_counter()
+        file_paths, total_bytes, _ = _scan_folders(args.folders, index)
+
+        if args.sort != 'path':
+            # Теги беруться з індексу, читаються лише нові та змінені файли
+            keys = {info['file_path']: str(info.get(args.sort) or '').casefold()
+                    for info in read_track_tags_many(index, file_paths)}
+            file_paths.sort(key=lambda path: (keys.get(path, ''), path))
+
+        output = args.output
+        if output.endswith('.json'):
+            metadata = {
+                'name': Path(output).stem,
+                'count': len(file_paths)
+            }
+            success = save_json_playlist(output, file_paths, metadata)
+        else:
+            if not output.endswith('.m3u'):
+                output += '.m3u'
+            success = save_m3u_playlist(output, file_paths)
+        elapsed = time.perf_counter() - start
+    finally:
+        index.close()
+
+    if not success:
+        print(f"Не вдалося зберегти плейлист: {output}", file=sys.stderr)
+        return 1
+    print(f"Плейлист збережено: {output}")
+    print(f"Експорт: {_format_throughput(len(file_paths), total_bytes, elapsed)}")
+    return 0
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    """Команда stats: статистика відтворення та підсумки бібліотеки з індексу"""
+    from .utils.metadata_index import MetadataIndex
+    from .utils.statistics import PlayStatistics, STATS_FILE
+
+    start = time.perf_counter()
+    statistics = PlayStatistics()
+    all_stats = statistics.get_all_stats()
+    top_tracks = statistics.get_top_tracks(args.top)
+
+    index = MetadataIndex()
+    try:
+        artists = index.get_artists()
+        tags = index.get_many([path for path, _ in top_tracks])
+    finally:
+        index.close()
+    elapsed = time.perf_counter() - start
+
+    total_plays = sum(stats.get('play_count', 0) for stats in all_stats.values())
+    print(f"Треків у статистиці: {len(all_stats)}, відтворень: {total_plays}")
+    print(f"Бібліотека: {sum(count for _, count, _ in artists)} треків, {len(artists)} виконавців, "
+          f"тривалість {_format_duration(sum(duration for _, _, duration in artists))}")
+
+    if top_tracks:
+        print(f"Топ-{len(top_tracks)}:")
+        for position, (file_path, play_count) in enumerate(top_tracks, 1):
+            info = tags[file_path][2] if file_path in tags else {}
+            title = info.get('title') or Path(file_path).stem
+            artist = info.get('artist') or "Невідомий виконавець"
+            print(f"{position:>3}. {artist} - {title} ({play_count})")
+
+    stats_bytes = STATS_FILE.stat().st_size if STATS_FILE.exists() else 0
+    print(f"Статистика: {_format_throughput(len(all_stats), stats_bytes, elapsed, unit='записів')}")
+    return 0
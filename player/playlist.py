@@ -1,20 +1,58 @@
 """
 Playlist management module
 """
+from array import array
 from typing import List, Optional
 from pathlib import Path
 
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .utils.edit_journal import EditJournal, DEFAULT_BUDGET
 from .utils.logger import get_logger
+from .utils.track_store import TrackList, CompactTrackList, TrackView
 
 logger = get_logger(__name__)
 
+COMPACT_THRESHOLD = 100_000  # З такої кількості треків плейлист переходить на компактне сховище
+_JOURNAL_ENTRY_BYTES = 64  # Оцінка пам'яті запису журналу без даних
+_JOURNAL_PATH_BYTES = 56  # Оцінка пам'яті на збережений шлях (без символів)
+
 
-class Playlist:
-    """Клас для управління плейлистом аудіофайлів"""
+class Playlist(QObject):
+    """
+    Клас для управління плейлистом аудіофайлів
+    
+    Кожна зміна повідомляється сигналом з конкретними рядками, тож
+    представлення оновлюють лише змінені рядки, а не весь список.
+    
+    Зміни записуються в журнал для undo/redo у вигляді дельт: діапазони
+    індексів, перестановки, видалені шляхи; очищення зберігає старе
+    сховище цілком, без копіювання.
+    """
     
-    def __init__(self):
-        self._tracks: List[str] = []
+    rows_inserted = pyqtSignal(int, int)  # Перший та останній індекс доданих треків
+    rows_removed = pyqtSignal(int, int)  # Перший та останній індекс видалених треків (до видалення)
+    rows_moved = pyqtSignal(int, int, int)  # Початок, кінець та позиція призначення (як rowsMoved у Qt)
+    row_changed = pyqtSignal(int)  # Шлях треку замінено (файл переміщено)
+    playlist_reset = pyqtSignal()  # Вміст змінився повністю (очищення, сортування)
+    current_index_changed = pyqtSignal(int)
+    
+    def __init__(self, compact: Optional[bool] = None, journal_budget: int = DEFAULT_BUDGET,
+                 parent: QObject = None):
+        """
+        Args:
+            compact: True - компактне сховище шляхів, False - звичайне,
+                None - перейти на компактне при COMPACT_THRESHOLD треків
+            journal_budget: Пам'ять журналу undo/redo (байти); 0 - без журналу
+            parent: Батьківський об'єкт
+        """
+        super().__init__(parent)
+        self._compact = compact
+        # Шляхи з індексом позицій: перевірка наявності та пошук за O(1)
+        self._tracks = self._new_store()
         self._current_index: int = -1
+        self._journal = EditJournal(journal_budget) if journal_budget > 0 else None
+        self._replaying = False  # Виконується undo/redo - зміни не записуються як нові
     
     def add_track(self, file_path: str) -> bool:
         """
@@ -38,6 +76,9 @@ class Playlist:
             
             if file_path not in self._tracks:
                 self._tracks.append(file_path)
+                self._check_compact()
+                self._record('insert', [(len(self._tracks) - 1, 1)])
+                self.rows_inserted.emit(len(self._tracks) - 1, len(self._tracks) - 1)
                 logger.debug(f"Трек додано до плейлисту: {file_path}")
                 return True
             else:
@@ -47,51 +88,198 @@ class Playlist:
             logger.error(f"Помилка додавання треку {file_path}: {e}", exc_info=True)
             return False
     
-    def add_tracks(self, file_paths: List[str]) -> int:
+    def add_tracks(self, file_paths: List[str], validate: bool = True) -> int:
         """
         Додає кілька треків до плейлисту
         
         Args:
             file_paths: Список шляхів до аудіофайлів
+            validate: Перевіряти наявність кожного файлу; False - треки додаються
+                одразу, а перевіряються пізніше у фоні (див. TrackValidator)
             
         Returns:
             Кількість успішно доданих треків
         """
+        tracks = self._tracks
         added = 0
         for path in file_paths:
-            if self.add_track(path):
-                added += 1
+            if not path or path in tracks:
+                continue
+            if validate and not Path(path).exists():
+                logger.warning(f"Файл не існує: {path}")
+                continue
+            tracks.append(path)
+            added += 1
+        if added:
+            logger.debug(f"До плейлисту додано {added} треків")
+            self._check_compact()
+            self._record('insert', [(len(self._tracks) - added, added)])
+            self.rows_inserted.emit(len(self._tracks) - added, len(self._tracks) - 1)
         return added
     
-    def remove_track(self, index: int) -> bool:
+    def remove_track(self, index: int, record: bool = True) -> bool:
         """
         Видаляє трек з плейлисту за індексом
         
         Args:
             index: Індекс треку для видалення
+            record: Записати зміну в журнал undo (див. remove_tracks)
             
         Returns:
             True якщо трек успішно видалено, False інакше
         """
         if 0 <= index < len(self._tracks):
-            removed_track = self._tracks.pop(index)
+            if record:
+                self._record('remove', [(index, [self._tracks[index]])])
+            else:
+                self._forget_journal()
+            self._tracks.pop(index)
+            self.rows_removed.emit(index, index)
             
             # Коригуємо поточний індекс якщо потрібно
             if index < self._current_index:
-                self._current_index -= 1
+                self._set_current(self._current_index - 1)
             elif index == self._current_index:
-                if self._current_index >= len(self._tracks):
-                    self._current_index = len(self._tracks) - 1
-                if self._current_index < 0:
-                    self._current_index = -1
+                self._set_current(min(self._current_index, len(self._tracks) - 1))
             
             return True
         return False
     
+    def remove_tracks(self, file_paths: List[str], record: bool = True) -> int:
+        """
+        Видаляє треки з плейлисту за шляхами (один прохід по списку)
+        
+        Args:
+            file_paths: Шляхи треків для видалення
+            record: Записати зміну в журнал undo; False - треки прибирає
+                система (файлів вже немає на диску), скасувати це не можна
+            
+        Returns:
+            Кількість видалених треків
+        """
+        to_remove = set(file_paths)
+        if not to_remove:
+            return 0
+        
+        kept = []
+        runs = []  # Суцільні діапазони видалених рядків (перший індекс, шляхи)
+        new_index = -1
+        for index, track in enumerate(self._tracks):
+            if index == self._current_index:
+                # Позиція поточного треку (або наступного, якщо його видалено)
+                new_index = len(kept)
+            if track not in to_remove:
+                kept.append(track)
+            elif runs and runs[-1][0] + len(runs[-1][1]) == index:
+                runs[-1][1].append(track)
+            else:
+                runs.append((index, [track]))
+        
+        removed = len(self._tracks) - len(kept)
+        if removed:
+            if record:
+                self._record('remove', runs)
+            else:
+                self._forget_journal()
+            self._tracks.assign(kept)
+            # З кінця - індекси попередніх діапазонів лишаються дійсними
+            for first, paths in reversed(runs):
+                self.rows_removed.emit(first, first + len(paths) - 1)
+            if self._current_index >= 0:
+                self._set_current(min(new_index, len(kept) - 1))
+        return removed
+    
+    def rename_track(self, old_path: str, new_path: str, record: bool = True) -> bool:
+        """
+        Замінює шлях треку, зберігаючи його позицію (файл переміщено)
+        
+        Args:
+            old_path: Старий шлях
+            new_path: Новий шлях
+            record: Записати зміну в журнал undo (False - файл перемістили поза плеєром)
+            
+        Returns:
+            True якщо трек знайдено та перейменовано
+        """
+        index = self._tracks.index_of(old_path)
+        if index < 0:
+            return False
+        
+        if new_path in self._tracks:
+            # Новий шлях вже в плейлисті - просто прибираємо старий запис
+            return self.remove_track(index, record)
+        if record:
+            self._record('rename', (index, old_path))
+        self._tracks.replace(index, new_path)
+        self.row_changed.emit(index)
+        logger.debug(f"Трек перейменовано: {old_path} -> {new_path}")
+        return True
+    
+    def move(self, src_range: range, dest: int) -> bool:
+        """
+        Переносить треки на нову позицію, зберігаючи поточний трек
+        
+        Змінюються лише позиції між джерелом та місцем призначення.
+        
+        Args:
+            src_range: Суцільний діапазон індексів, наприклад range(3, 5)
+            dest: Індекс (до переносу), перед яким стануть треки; len - у кінець
+            
+        Returns:
+            True якщо порядок змінився
+        """
+        start, stop = src_range.start, src_range.stop
+        count = len(self._tracks)
+        if src_range.step != 1 or not 0 <= start < stop <= count or not 0 <= dest <= count:
+            logger.warning(f"Невірне переміщення треків: {src_range} -> {dest}")
+            return False
+        if start <= dest <= stop:
+            return False  # Треки залишаються на місці
+        
+        self._record('move', (start, stop, dest))
+        self._tracks.move(start, stop, dest)
+        self.rows_moved.emit(start, stop - 1, dest)
+        
+        # Коригуємо поточний індекс
+        size = stop - start
+        current = self._current_index
+        if start <= current < stop:
+            self._set_current(current - start + (dest if dest < start else dest - size))
+        elif dest <= current < start:
+            self._set_current(current + size)
+        elif stop <= current < dest:
+            self._set_current(current - size)
+        return True
+    
+    def apply_permutation(self, perm: List[int]) -> bool:
+        """
+        Переставляє треки, зберігаючи поточний трек
+        
+        Args:
+            perm: Нові позиції: perm[i] - старий індекс треку, що стане i-м
+            
+        Returns:
+            True якщо перестановку застосовано
+        """
+        count = len(self._tracks)
+        if len(perm) != count or set(perm) != set(range(count)):
+            logger.warning("Невірна перестановка плейлисту")
+            return False
+        
+        self._record('permute', array('I', perm))
+        self._tracks.permute(perm)
+        self.playlist_reset.emit()
+        if self._current_index >= 0:
+            self._set_current(perm.index(self._current_index))
+        return True
+    
     def clear(self):
-        """Очищає плейлист"""
-        self._tracks.clear()
-        self._current_index = -1
+        """Очищає плейлист (старе сховище зберігається в журналі для undo)"""
+        if len(self._tracks):
+            self._record('assign', self._tracks)
+        self._tracks = self._new_store()
+        self.playlist_reset.emit()
+        self._set_current(-1)
     
     def get_current_track(self) -> Optional[str]:
         """Повертає шлях до поточного треку"""
@@ -110,7 +298,7 @@ class Playlist:
             True якщо індекс встановлено, False інакше
         """
         if 0 <= index < len(self._tracks):
-            self._current_index = index
+            self._set_current(index)
             return True
         return False
     
@@ -120,9 +308,9 @@ class Playlist:
             return None
         
         if self._current_index < len(self._tracks) - 1:
-            self._current_index += 1
+            self._set_current(self._current_index + 1)
         else:
-            self._current_index = 0  # Loop to start
+            self._set_current(0)  # Loop to start
         
         return self.get_current_track()
     
@@ -132,15 +320,24 @@ class Playlist:
             return None
         
         if self._current_index > 0:
-            self._current_index -= 1
+            self._set_current(self._current_index - 1)
         else:
-            self._current_index = len(self._tracks) - 1  # Loop to end
+            self._set_current(len(self._tracks) - 1)  # Loop to end
         
         return self.get_current_track()
     
     def get_tracks(self) -> List[str]:
-        """Повертає список всіх треків"""
-        return self._tracks.copy()
+        """Повертає копію списку всіх треків (для збереження; для читання - get_tracks_view)"""
+        return self._tracks.to_list()
+    
+    def get_tracks_view(self) -> TrackView:
+        """
+        Повертає представлення треків лише для читання, без копіювання
+        
+        Підтримує len, індекси, зрізи та ітерацію; зміни плейлисту одразу
+        видно через представлення.
+        """
+        return TrackView(lambda: self._tracks)
     
     def get_current_index(self) -> int:
         """Повертає поточний індекс"""
@@ -155,4 +352,213 @@ class Playlist:
         if 0 <= index < len(self._tracks):
             return self._tracks[index]
         return None
+    
+    def index_of(self, file_path: str) -> int:
+        """
+        Повертає позицію треку в плейлисті
+        
+        Args:
+            file_path: Шлях до аудіофайлу
+            
+        Returns:
+            Індекс треку або -1 якщо його немає
+        """
+        return self._tracks.index_of(file_path)
+    
+    def contains(self, file_path: str) -> bool:
+        """Перевіряє чи трек є в плейлисті"""
+        return file_path in self._tracks
+    
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._tracks
+    
+    def is_compact(self) -> bool:
+        """Перевіряє чи використовується компактне сховище шляхів"""
+        return isinstance(self._tracks, CompactTrackList)
+    
+    def undo(self) -> bool:
+        """
+        Скасовує останню зміну плейлисту
+        
+        Returns:
+            True якщо зміну скасовано
+        """
+        entry = self._journal.pop_undo() if self._journal else None
+        if entry is None:
+            return False
+        inverse = self._replay(entry)
+        self._journal.push_redo(inverse, self._entry_size(inverse))
+        logger.debug(f"Скасовано зміну плейлисту: {entry[0]}")
+        return True
+    
+    def redo(self) -> bool:
+        """
+        Повторює скасовану зміну
+        
+        Returns:
+            True якщо зміну повторено
+        """
+        entry = self._journal.pop_redo() if self._journal else None
+        if entry is None:
+            return False
+        inverse = self._replay(entry)
+        self._journal.push_undo(inverse, self._entry_size(inverse))
+        logger.debug(f"Повторено зміну плейлисту: {entry[0]}")
+        return True
+    
+    def can_undo(self) -> bool:
+        """Перевіряє чи є зміни для скасування"""
+        return self._journal is not None and self._journal.can_undo()
+    
+    def can_redo(self) -> bool:
+        """Перевіряє чи є зміни для повтору"""
+        return self._journal is not None and self._journal.can_redo()
+    
+    def clear_journal(self):
+        """Забуває історію змін (наприклад, після відновлення стану при запуску)"""
+        if self._journal is not None:
+            self._journal.clear()
+    
+    def set_journal_budget(self, budget: int):
+        """
+        Змінює пам'ять журналу undo/redo
+        
+        Args:
+            budget: Байти; 0 - вимкнути журнал
+        """
+        if budget <= 0:
+            self._journal = None
+        elif self._journal is None:
+            self._journal = EditJournal(budget)
+        else:
+            self._journal.set_budget(budget)
+    
+    def _record(self, kind: str, data):
+        """Записує зміну в журнал (до її виконання - зберігається поточний індекс)"""
+        if self._journal is None or self._replaying:
+            return
+        entry = (kind, data, self._current_index)
+        self._journal.record(entry, self._entry_size(entry))
+    
+    def _forget_journal(self):
+        """Очищає журнал перед видаленням без запису: індекси в його записах застаріють"""
+        if self._journal is None or self._replaying:
+            return
+        if self._journal.can_undo() or self._journal.can_redo():
+            self._journal.clear()
+            logger.debug("Журнал змін плейлисту очищено: треки прибрано системою")
+    
+    @staticmethod
+    def _entry_size(entry) -> int:
+        """Оцінка пам'яті запису журналу"""
+        kind, data, _ = entry
+        if kind == 'insert':
+            return _JOURNAL_ENTRY_BYTES + 16 * len(data)
+        if kind == 'remove':
+            return _JOURNAL_ENTRY_BYTES + sum(len(path) + _JOURNAL_PATH_BYTES for _, paths in data for path in paths)
+        if kind == 'rename':
+            return _JOURNAL_ENTRY_BYTES + len(data[1]) + _JOURNAL_PATH_BYTES
+        if kind == 'permute':
+            return _JOURNAL_ENTRY_BYTES + data.itemsize * len(data)
+        if kind == 'assign':
+            return _JOURNAL_ENTRY_BYTES + len(data) * data.ENTRY_BYTES
+        return _JOURNAL_ENTRY_BYTES
+    
+    def _replay(self, entry):
+        """Виконує зворотну дію без запису в журнал та повертає її запис"""
+        self._replaying = True
+        try:
+            return self._revert(entry)
+        finally:
+            self._replaying = False
+    
+    def _revert(self, entry):
+        """
+        Виконує дію, зворотну до запису журналу
+        
+        Returns:
+            Запис зворотної дії (для протилежного стеку)
+        """
+        kind, data, current = entry
+        before = self._current_index
+        if kind == 'insert':
+            runs = [(first, [self._tracks[index] for index in range(first, first + count)])
+                    for first, count in data]
+            self._remove_runs(runs)
+            inverse = ('remove', runs, before)
+        elif kind == 'remove':
+            self._insert_runs(data)
+            inverse = ('insert', [(first, len(paths)) for first, paths in data], before)
+        elif kind == 'rename':
+            index, path = data
+            inverse = ('rename', (index, self._tracks[index]), before)
+            self._tracks.replace(index, path)
+            self.row_changed.emit(index)
+        elif kind == 'move':
+            start, stop, dest = data
+            size = stop - start
+            if dest < start:
+                self.move(range(dest, dest + size), stop)
+                inverse = ('move', (dest, dest + size, stop), before)
+            else:
+                self.move(range(dest - size, dest), start)
+                inverse = ('move', (dest - size, dest, start), before)
+        elif kind == 'permute':
+            order = array('I', [0]) * len(data)
+            for position, index in enumerate(data):
+                order[index] = position
+            self.apply_permutation(order)
+            inverse = ('permute', order, before)
+        else:  # assign
+            inverse = ('assign', self._tracks, before)
+            self._tracks = data
+            self._check_compact()
+            self.playlist_reset.emit()
+        self._set_current(current if current < len(self._tracks) else len(self._tracks) - 1)
+        return inverse
+    
+    def _insert_runs(self, runs: list):
+        """Вставляє діапазони треків (перший індекс у підсумковому списку, шляхи)"""
+        old = self._tracks.to_list()
+        result = []
+        position = 0
+        for first, paths in runs:
+            take = first - len(result)
+            result.extend(old[position:position + take])
+            position += take
+            result.extend(paths)
+        result.extend(old[position:])
+        self._tracks.assign(result)
+        self._check_compact()
+        for first, paths in runs:
+            self.rows_inserted.emit(first, first + len(paths) - 1)
+    
+    def _remove_runs(self, runs: list):
+        """Видаляє діапазони треків (перший індекс до видалення, шляхи)"""
+        old = self._tracks.to_list()
+        result = []
+        position = 0
+        for first, paths in runs:
+            result.extend(old[position:first])
+            position = first + len(paths)
+        result.extend(old[position:])
+        self._tracks.assign(result)
+        for first, paths in reversed(runs):
+            self.rows_removed.emit(first, first + len(paths) - 1)
+    
+    def _new_store(self):
+        """Створює порожнє сховище шляхів відповідно до режиму"""
+        return CompactTrackList() if self._compact else TrackList()
+    
+    def _set_current(self, index: int):
+        """Змінює поточний індекс та повідомляє про зміну"""
+        if index != self._current_index:
+            self._current_index = index
+            self.current_index_changed.emit(index)
+    
+    def _check_compact(self):
+        """Переводить великий плейлист на компактне сховище (автоматичний режим)"""
+        if self._compact is None and not self.is_compact() and len(self._tracks) >= COMPACT_THRESHOLD:
+            self._tracks = CompactTrackList(self._tracks)
+            logger.info(f"Плейлист переведено на компактне сховище ({len(self._tracks)} треків)")
 
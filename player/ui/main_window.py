@@ -2,13 +2,15 @@
 Main window UI module
 """
 from pathlib import Path
+import os
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QSlider, QLabel, QListWidget, QListWidgetItem, QFileDialog,
-    QMessageBox, QFrame, QSizePolicy, QLineEdit, QMenu, QComboBox, QSplitter, QDialog, QMenuBar
+    QMessageBox, QFrame, QSizePolicy, QLineEdit, QMenu, QComboBox, QSplitter, QDialog, QMenuBar,
+    QTreeWidget, QTreeWidgetItem, QAbstractItemView, QHeaderView
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSlot, QPoint
-from PyQt6.QtGui import QIcon, QFont, QPalette, QColor, QPixmap, QShortcut, QKeySequence, QCursor, QAction
+from PyQt6.QtGui import QIcon, QFont, QPalette, QColor, QPixmap, QShortcut, QKeySequence, QCursor, QAction, QActionGroup
 from PyQt6.QtMultimedia import QMediaPlayer
 
 # Спробуємо імпортувати бібліотеки для покращення UI
@@ -21,7 +23,11 @@ except ImportError:
     HAS_QTA = False
     HAS_QDARKSTYLE = False
 
-from ..audio_player import AudioPlayer
+from ..audio_player import AudioPlayer, ShuffleMode
+from .playlist_view import PlaylistBinding
+from ..utils.metadata import DEFAULT_ARTIST, DEFAULT_ALBUM
+
+SEARCH_RESULTS_LIMIT = 1000  # Максимум рядків у списку результатів пошуку
 
 
 class MainWindow(QMainWindow):
@@ -229,6 +235,12 @@ class MainWindow(QMainWindow):
         add_folder_action = file_menu.addAction("Додати папку...")
         add_folder_action.triggered.connect(self._add_folder)
         
+        refresh_library_action = file_menu.addAction("Оновити бібліотеку")
+        refresh_library_action.triggered.connect(self._refresh_library)
+        
+        library_browser_action = file_menu.addAction("Бібліотека...")
+        library_browser_action.triggered.connect(self._show_library_browser)
+        
         file_menu.addSeparator()
         
         save_playlist_action = file_menu.addAction("Зберегти плейлист...")
@@ -256,9 +268,40 @@ class MainWindow(QMainWindow):
         
         playlist_menu.addSeparator()
         
+        # Режими випадкового відтворення
+        shuffle_menu = playlist_menu.addMenu("Випадковий порядок")
+        shuffle_group = QActionGroup(self)
+        self._shuffle_mode_actions = {}
+        for mode, title in (
+            (ShuffleMode.OFF, "Вимкнено"),
+            (ShuffleMode.RANDOM, "Звичайний"),
+            (ShuffleMode.SMART, "Розумний (рідко відтворені частіше)"),
+            (ShuffleMode.ALBUM, "За альбомами"),
+            (ShuffleMode.FOLDER, "За папками"),
+        ):
+            action = shuffle_menu.addAction(title)
+            action.setCheckable(True)
+            action.setActionGroup(shuffle_group)
+            action.triggered.connect(lambda checked, m=mode: self._set_shuffle_mode(m))
+            self._shuffle_mode_actions[mode] = action
+        self._shuffle_mode_actions[ShuffleMode.OFF].setChecked(True)
+        
+        playlist_menu.addSeparator()
+        
         clear_playlist_action = playlist_menu.addAction("Очистити плейлист")
         clear_playlist_action.triggered.connect(self._clear_playlist)
         
+        clear_queue_action = playlist_menu.addAction("Очистити чергу")
+        clear_queue_action.triggered.connect(self._player.clear_queue)
+        
+        playlist_menu.addSeparator()
+        
+        undo_action = playlist_menu.addAction("Скасувати зміну (Ctrl+Z)")
+        undo_action.triggered.connect(self._undo_playlist_edit)
+        
+        redo_action = playlist_menu.addAction("Повторити зміну (Ctrl+Y)")
+        redo_action.triggered.connect(self._redo_playlist_edit)
+        
         # Меню Інструменти
         tools_menu = menubar.addMenu("Інструменти")
         
@@ -522,6 +565,7 @@ class MainWindow(QMainWindow):
         <b>Плейлист:</b><br>
         • Ctrl+O - Додати файли<br>
         • Ctrl+L - Відкрити плейлист<br>
+        • Ctrl+Z / Ctrl+Y - Скасувати / повторити зміну плейлисту<br>
         </div>
         """
         
@@ -608,7 +652,7 @@ class MainWindow(QMainWindow):
         """Отримує список останніх плейлистів"""
         try:
             from player.utils.state_manager import load_state
-            state = load_state()
+            state = load_state(validate=False)
             return state.get('recent_playlists', [])[:5]  # Максимум 5
         except:
             return []
@@ -617,7 +661,7 @@ class MainWindow(QMainWindow):
         """Зберігає плейлист в список останніх"""
         try:
             from player.utils.state_manager import load_state, save_state
-            state = load_state()
+            state = load_state(validate=False)
             recent = state.get('recent_playlists', [])
             
             # Видаляємо якщо вже є
@@ -643,16 +687,17 @@ class MainWindow(QMainWindow):
         
         from player.utils.playlist_io import load_m3u_playlist, load_json_playlist
         
+        # Наявність файлів перевіряється у фоні (одне читання на папку)
         if playlist_path.endswith('.json'):
-            tracks, metadata = load_json_playlist(playlist_path)
+            tracks, metadata = load_json_playlist(playlist_path, validate=False)
         else:
-            tracks = load_m3u_playlist(playlist_path)
+            tracks = load_m3u_playlist(playlist_path, validate=False)
         
         if tracks:
             # Замінюємо поточний плейлист
             self._player.get_playlist().clear()
-            added = self._player.get_playlist().add_tracks(tracks)
-            self._update_playlist_display()
+            added = self._add_tracks_to_playlist(tracks, validate=False)
+            self._player.get_track_validator().validate(tracks)
             self._show_message( "Успіх", f"Завантажено {added} треків!")
     
     def _show_statistics(self):
@@ -675,7 +720,7 @@ class MainWindow(QMainWindow):
             file_path = entry.get('file_path')
             if file_path and Path(file_path).exists():
                 # Отримуємо тривалість треку
-                info = self._player.get_track_info(file_path)
+                info = self._player.get_track_tags(file_path)
                 duration = info.get('duration', 0)
                 total_time_ms += duration
                 
@@ -694,7 +739,7 @@ class MainWindow(QMainWindow):
         stats_text = f"""
         <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
         <b>📊 Загальна статистика:</b><br>
-        • Треків у плейлисті: <span style='color: #6366f1;'>{len(playlist.get_tracks())}</span><br>
+        • Треків у плейлисті: <span style='color: #6366f1;'>{playlist.get_count()}</span><br>
         • Всього відтворено: <span style='color: #6366f1;'>{len(history_data)}</span><br>
         • Загальний час: <span style='color: #6366f1;'>{total_hours}г {total_minutes}хв</span><br>
         • Унікальних треків: <span style='color: #6366f1;'>{len(track_counts)}</span><br><br>
@@ -1527,7 +1572,6 @@ class MainWindow(QMainWindow):
         # Компактний пошук
         self._search_input = QLineEdit()
         self._search_input.setPlaceholderText("Пошук...")
-        self._search_input.textChanged.connect(self._filter_playlist)
         self._search_input.setFixedHeight(30)
         self._search_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self._search_input.setStyleSheet("""
@@ -1556,9 +1600,38 @@ class MainWindow(QMainWindow):
         self._playlist_widget.customContextMenuRequested.connect(self._show_playlist_context_menu)
         # Увімкнення drag & drop
         self._playlist_widget.setDragDropMode(QListWidget.DragDropMode.InternalMove)
-        self._playlist_widget.model().rowsInserted.connect(self._on_playlist_reordered)
+        self._playlist_widget.model().rowsMoved.connect(self._on_playlist_reordered)
+        # Рядки оновлюються за сигналами плейлисту
+        self._playlist_binding = PlaylistBinding(
+            self._player.get_playlist(), self._playlist_widget,
+            lambda item, track_path: item.setText(Path(track_path).name), parent=self
+        )
         layout.addWidget(self._playlist_widget, 1)
         
+        # Результати пошуку - окремий список лише зі знайденими рядками
+        self._search_results = QListWidget()
+        self._search_results.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self._search_results.itemDoubleClicked.connect(self._on_playlist_item_double_clicked)
+        self._search_results.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self._search_results.customContextMenuRequested.connect(self._show_playlist_context_menu)
+        self._search_results.hide()
+        layout.addWidget(self._search_results, 1)
+        
+        self._search_results_label = QLabel()
+        self._search_results_label.setStyleSheet("color: #888888; font-size: 11px;")
+        self._search_results_label.hide()
+        layout.addWidget(self._search_results_label, 0)
+        
+        # Запити виконуються у фоні після паузи у введенні; застарілі відкидаються
+        from player.utils.search_runner import SearchRunner
+        self._search_runner = SearchRunner(self._player.get_search_index(), parent=self)
+        self._search_runner.results_ready.connect(self._show_playlist_search_results)
+        self._search_input.textChanged.connect(self._filter_playlist)
+        # Зміни плейлисту під час пошуку оновлюють результати
+        playlist = self._player.get_playlist()
+        for signal in (playlist.rows_inserted, playlist.rows_removed, playlist.row_changed, playlist.playlist_reset):
+            signal.connect(self._refresh_playlist_search)
+        
         # Компактна панель кнопок - з правильними відступами
         buttons_container = QWidget()
         buttons_container.setFixedHeight(36)
@@ -1995,6 +2068,7 @@ class MainWindow(QMainWindow):
         self._player.state_changed.connect(self._on_player_state_changed)
         self._player.track_changed.connect(self._on_track_changed)
         self._player.error_occurred.connect(self._on_player_error)
+        self._player.get_track_validator().tracks_missing.connect(self._on_tracks_missing)
     
     def _setup_shortcuts(self):
         """Налаштовує гарячі клавіші"""
@@ -2056,6 +2130,26 @@ class MainWindow(QMainWindow):
         # Open playlist
         playlist_shortcut = QShortcut(QKeySequence("Ctrl+L"), self)
         playlist_shortcut.activated.connect(self._toggle_playlist)
+        
+        # Undo/redo змін плейлисту
+        self._add_undo_shortcuts(self)
+    
+    def _add_undo_shortcuts(self, widget: QWidget):
+        """Додає Ctrl+Z / Ctrl+Y (та Ctrl+Shift+Z) для змін плейлисту у вікно"""
+        undo_shortcut = QShortcut(QKeySequence("Ctrl+Z"), widget)
+        undo_shortcut.activated.connect(self._undo_playlist_edit)
+        
+        for sequence in ("Ctrl+Y", "Ctrl+Shift+Z"):
+            redo_shortcut = QShortcut(QKeySequence(sequence), widget)
+            redo_shortcut.activated.connect(self._redo_playlist_edit)
+    
+    def _undo_playlist_edit(self):
+        """Скасовує останню зміну плейлисту"""
+        self._player.get_playlist().undo()
+    
+    def _redo_playlist_edit(self):
+        """Повторює скасовану зміну плейлисту"""
+        self._player.get_playlist().redo()
     
     def _volume_up(self):
         """Збільшує гучність"""
@@ -2095,7 +2189,15 @@ class MainWindow(QMainWindow):
         resume = settings.get('resume', True)
         autoplay = settings.get('autoplay', False)
         
-        state = load_state()
+        # Звіряємо папки бібліотеки зі знімками (зміни поки програма була закрита)
+        # та ставимо їх під нагляд; треки з цих папок не перевіряються поштучно
+        watcher = self._player.get_library_watcher()
+        deltas = watcher.watch_all()
+        watcher.library_changed.connect(self._on_library_changed)
+        
+        # Треки додаються одразу, а решта перевіряється у фоні
+        trusted = tuple(os.path.join(folder, '') for folder in watcher.get_folders())
+        state = load_state(validate=False)
         if state:
             # Відновлюємо геометрію вікна
             geometry = state.get('window_geometry')
@@ -2106,13 +2208,24 @@ class MainWindow(QMainWindow):
                     geometry.get('width', 900),
                     geometry.get('height', 600)
                 )
-            # Відновлюємо плейлист
-            if state.get('playlist'):
-                self._player.get_playlist().add_tracks(state['playlist'])
-                self._update_playlist_display()
+            # Відновлюємо плейлист (переміщені файли зберігають своє місце)
+            tracks = state.get('playlist', [])
+            current_index = state.get('current_index', -1)
+            current_path = tracks[current_index] if 0 <= current_index < len(tracks) else None
+            for delta in deltas:
+                self._apply_library_delta(delta, add_new=False)
+                tracks = delta.apply_to(tracks)
+                current_path = dict(delta.renamed).get(current_path, current_path)
+            if current_path is not None:
+                current_index = tracks.index(current_path) if current_path in tracks else current_index
+            if tracks:
+                self._add_tracks_to_playlist(tracks, validate=False)
+                # Відновлений плейлист - відправна точка, а не зміна для undo
+                self._player.get_playlist().clear_journal()
+                self._player.get_track_validator().validate(
+                    [track for track in tracks if not (trusted and track.startswith(trusted))])
             
             # Відновлюємо поточний трек
-            current_index = state.get('current_index', -1)
             if 0 <= current_index < self._player.get_playlist().get_count():
                 self._player.get_playlist().set_current_index(current_index)
                 current = self._player.get_playlist().get_current_track()
@@ -2146,8 +2259,11 @@ class MainWindow(QMainWindow):
                 self._repeat_btn.setText("Repeat: One")
             else:
                 self._repeat_btn.setText("Repeat: All")
-            self._player.set_shuffle(state.get('shuffle', False))
-            self._shuffle_btn.setChecked(state.get('shuffle', False))
+            default_shuffle = ShuffleMode.RANDOM if state.get('shuffle', False) else ShuffleMode.OFF
+            self._player.set_shuffle_mode(state.get('shuffle_mode', default_shuffle))
+            self._sync_shuffle_controls()
+            # Черга невелика - відсутні файли відкидаються одразу
+            self._player.enqueue([path for path in state.get('queue', []) if os.path.exists(path)])
     
     def _load_settings(self) -> dict:
         """Завантажує налаштування з файлу"""
@@ -2225,9 +2341,17 @@ class MainWindow(QMainWindow):
             position=position,
             repeat=self._player.get_repeat(),
             shuffle=self._player.get_shuffle(),
+            shuffle_mode=self._player.get_shuffle_mode(),
+            queue=self._player.get_queue(),
             window_geometry=geometry
         )
         
+        self._player.get_library_watcher().stop()
+        self._player.get_track_validator().cancel()
+        self._player.cancel_prefetch()
+        if hasattr(self, '_search_runner'):
+            self._search_runner.cancel()
+            self._search_runner.wait()
         event.accept()
     
     def dragEnterEvent(self, event):
@@ -2239,24 +2363,13 @@ class MainWindow(QMainWindow):
         """Обробник drop - додає файли до плейлисту"""
         urls = event.mimeData().urls()
         if urls:
-            audio_extensions = {'.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac', '.wma', '.mp4'}
-            file_paths = []
+            from player.utils.library_scanner import scan_audio_files
             
-            for url in urls:
-                file_path = url.toLocalFile()
-                if Path(file_path).is_file():
-                    # Перевіряємо розширення
-                    if Path(file_path).suffix.lower() in audio_extensions:
-                        file_paths.append(file_path)
-                elif Path(file_path).is_dir():
-                    # Якщо папка - додаємо всі аудіофайли
-                    for ext in audio_extensions:
-                        file_paths.extend([str(f) for f in Path(file_path).glob(f"*{ext}")])
-                        file_paths.extend([str(f) for f in Path(file_path).glob(f"*{ext.upper()}")])
+            # Файли та папки (рекурсивно) за один прохід
+            file_paths = list(scan_audio_files(url.toLocalFile() for url in urls))
             
             if file_paths:
-                added = self._player.get_playlist().add_tracks(file_paths)
-                self._update_playlist_display()
+                added = self._add_tracks_to_playlist(file_paths)
                 
                 # Якщо це перший трек, встановлюємо його як поточний
                 if self._player.get_playlist().get_current_index() == -1 and added > 0:
@@ -2381,7 +2494,6 @@ class MainWindow(QMainWindow):
         album_text = info['album'] if info['album'] else ""
         self._track_artist_label.setText(artist_text)
         self._album_label.setText(album_text)
-        self._update_playlist_selection()
         self._update_artwork(info.get('artwork'))
     
     def _update_marquee(self):
@@ -2451,6 +2563,20 @@ class MainWindow(QMainWindow):
     def _on_shuffle_toggled(self, checked: bool):
         """Обробник перемикача Shuffle"""
         self._player.set_shuffle(checked)
+        self._sync_shuffle_controls()
+    
+    def _set_shuffle_mode(self, mode: int):
+        """Обробник вибору режиму shuffle в меню"""
+        self._player.set_shuffle_mode(mode)
+        self._sync_shuffle_controls()
+    
+    def _sync_shuffle_controls(self):
+        """Оновлює кнопку та меню відповідно до режиму shuffle"""
+        mode = self._player.get_shuffle_mode()
+        self._shuffle_btn.setChecked(mode != ShuffleMode.OFF)
+        action = self._shuffle_mode_actions.get(mode)
+        if action:
+            action.setChecked(True)
     
     def _on_position_slider_pressed(self):
         """Обробник натискання на слайдер позиції"""
@@ -2476,6 +2602,24 @@ class MainWindow(QMainWindow):
                 if hasattr(self, '_duration_label'):
                     self._duration_label.setText(self._format_time(duration))
     
+    def _add_tracks_to_playlist(self, file_paths: list, validate: bool = True) -> int:
+        """
+        Додає треки до плейлисту та запускає фонове читання їх метаданих
+        
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+            validate: Перевіряти наявність файлів; False - перевірку виконує
+                викликач (TrackValidator), відсутні треки приберуться пізніше
+            
+        Returns:
+            Кількість доданих треків
+        """
+        added = self._player.get_playlist().add_tracks(file_paths, validate=validate)
+        if added > 0:
+            self._player.index_tracks(file_paths)
+            self._player.prefetch_track_tags(file_paths)
+        return added
+    
     def _add_files(self):
         """Додає файли до плейлисту"""
         file_paths, _ = QFileDialog.getOpenFileNames(
@@ -2486,8 +2630,7 @@ class MainWindow(QMainWindow):
         )
         
         if file_paths:
-            added = self._player.get_playlist().add_tracks(file_paths)
-            self._update_playlist_display()
+            added = self._add_tracks_to_playlist(file_paths)
             
             # Якщо це перший трек, встановлюємо його як поточний
             if self._player.get_playlist().get_current_index() == -1 and added > 0:
@@ -2507,17 +2650,14 @@ class MainWindow(QMainWindow):
         folder_path = QFileDialog.getExistingDirectory(self, "Оберіть папку з аудіофайлами")
         
         if folder_path:
-            audio_extensions = {'.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac', '.wma', '.mp4'}
-            audio_files = []
+            # Повторне додавання перечитує лише змінені папки; далі папка під наглядом
+            delta = self._player.get_library_watcher().watch(folder_path)
+            self._apply_library_delta(delta, add_new=False)
+            file_paths = self._player.get_library_scanner().get_files(folder_path)
             
-            for ext in audio_extensions:
-                audio_files.extend(Path(folder_path).glob(f"*{ext}"))
-                audio_files.extend(Path(folder_path).glob(f"*{ext.upper()}"))
-            
-            if audio_files:
-                file_paths = [str(f) for f in audio_files]
-                added = self._player.get_playlist().add_tracks(file_paths)
-                self._update_playlist_display()
+            if file_paths:
+                # Шляхи щойно отримано сканером - повторна перевірка наявності зайва
+                added = self._add_tracks_to_playlist(file_paths, validate=False)
                 
                 if self._player.get_playlist().get_current_index() == -1 and added > 0:
                     self._player.get_playlist().set_current_index(0)
@@ -2530,50 +2670,268 @@ class MainWindow(QMainWindow):
             else:
                 self._show_message( "Інформація", "У вибраній папці не знайдено аудіофайлів")
     
+    def _apply_library_delta(self, delta, add_new: bool = True) -> int:
+        """
+        Застосовує результат пересканування до плейлисту та кешу тегів
+        
+        Args:
+            delta: ScanDelta від LibraryScanner
+            add_new: Додавати нові файли до плейлисту
+            
+        Returns:
+            Кількість змін у плейлисті
+        """
+        playlist = self._player.get_playlist()
+        changes = 0
+        for old_path, new_path in delta.renamed:
+            self._player.rename_track_data(old_path, new_path)
+            changes += playlist.rename_track(old_path, new_path, record=False)
+        if delta.removed:
+            self._player.forget_tracks(delta.removed)
+            changes += playlist.remove_tracks(delta.removed, record=False)
+        if delta.changed:
+            self._player.invalidate_track_tags(delta.changed)
+            self._player.prefetch_track_tags(delta.changed)
+        if add_new and delta.added:
+            changes += self._add_tracks_to_playlist(delta.added, validate=False)
+        return changes
+    
+    def _on_library_changed(self, delta):
+        """Обробник змін у папках бібліотеки від LibraryWatcher"""
+        self._apply_library_delta(delta)
+    
+    def _on_tracks_missing(self, file_paths: list):
+        """Прибирає з плейлисту треки, яких не виявилось на диску (фонова перевірка)"""
+        removed = self._player.get_playlist().remove_tracks(file_paths, record=False)
+        if removed:
+            self._player.forget_tracks(file_paths)
+    
+    def _refresh_library(self):
+        """Пересканує всі додані папки (лише змінені каталоги)"""
+        watcher = self._player.get_library_watcher()
+        folders = watcher.get_folders()
+        if not folders:
+            self._show_message("Інформація", "Ще не додано жодної папки")
+            return
+        
+        added = removed = changed = moved = 0
+        for folder in folders:
+            delta = watcher.watch(folder)
+            self._apply_library_delta(delta)
+            added += len(delta.added)
+            removed += len(delta.removed)
+            changed += len(delta.changed)
+            moved += len(delta.renamed)
+        
+        self._show_message("Бібліотеку оновлено",
+                           f"Нових файлів: {added}\nВидалених: {removed}\n"
+                           f"Змінених: {changed}\nПереміщених: {moved}")
+    
+    def _show_library_browser(self):
+        """Показує бібліотеку з групуванням виконавець → альбом → трек або за жанром"""
+        metadata_index = self._player.get_metadata_index()
+        
+        dialog, layout = self._create_dialog("Бібліотека", 720, 560)
+        self._add_dialog_title(layout, "Бібліотека")
+        
+        group_combo = QComboBox()
+        group_combo.addItems(["Виконавець → Альбом → Трек", "Жанр → Трек"])
+        layout.addWidget(group_combo)
+        
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["Назва", "Треків", "Тривалість"])
+        tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        tree.setUniformRowHeights(True)
+        # Подвійний клік додає групу до плейлисту, розкриття - стрілкою
+        tree.setExpandsOnDoubleClick(False)
+        tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        tree.setStyleSheet("""
+            QTreeWidget {
+                background: #1a1a1a;
+                border: 1px solid #2a2a2a;
+                border-radius: 6px;
+                color: #ffffff;
+                padding: 8px;
+                font-size: 13px;
+            }
+            QTreeWidget::item {
+                padding: 4px;
+            }
+            QTreeWidget::item:hover {
+                background: #2a2a2a;
+            }
+            QTreeWidget::item:selected {
+                background: #6366f1;
+                color: #ffffff;
+            }
+            QHeaderView::section {
+                background: #1a1a1a;
+                color: #888888;
+                border: none;
+                padding: 4px;
+            }
+        """)
+        layout.addWidget(tree)
+        
+        summary_label = QLabel()
+        summary_label.setStyleSheet("color: #888888; font-size: 12px; border: none;")
+        layout.addWidget(summary_label)
+        
+        def make_item(text, count, duration, facet):
+            item = QTreeWidgetItem([text, str(count), self._format_time(duration)])
+            item.setData(0, Qt.ItemDataRole.UserRole, facet)
+            if facet[0] != 'track':
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            return item
+        
+        def facet_tracks(facet):
+            if facet[0] == 'artist':
+                return metadata_index.get_facet_tracks(artist=facet[1])
+            if facet[0] == 'album':
+                return metadata_index.get_facet_tracks(artist=facet[1], album=facet[2])
+            return metadata_index.get_facet_tracks(genre=facet[1])
+        
+        def populate():
+            # Верхній рівень будується з готових агрегатів, без обходу треків
+            tree.clear()
+            if group_combo.currentIndex() == 0:
+                rows = metadata_index.get_artists()
+                items = [make_item(artist or DEFAULT_ARTIST, count, duration, ('artist', artist))
+                         for artist, count, duration in rows]
+            else:
+                rows = metadata_index.get_genres()
+                items = [make_item(genre or "Без жанру", count, duration, ('genre', genre))
+                         for genre, count, duration in rows]
+            tree.addTopLevelItems(items)
+            total_count = sum(row[1] for row in rows)
+            total_duration = sum(row[2] for row in rows)
+            summary_label.setText(f"Треків у бібліотеці: {total_count}, "
+                                  f"загальна тривалість: {self._format_time(total_duration)}")
+        
+        def on_item_expanded(item):
+            # Дочірні вузли завантажуються при першому розкритті
+            if item.childCount():
+                return
+            facet = item.data(0, Qt.ItemDataRole.UserRole)
+            if facet[0] == 'artist':
+                children = [make_item(album or DEFAULT_ALBUM, count, duration, ('album', facet[1], album))
+                            for album, count, duration in metadata_index.get_albums(facet[1])]
+            else:
+                children = [make_item(title or Path(path).stem, 1, duration, ('track', path))
+                            for path, title, duration in facet_tracks(facet)]
+            item.addChildren(children)
+        
+        def selected_paths(items):
+            file_paths = []
+            for item in items:
+                facet = item.data(0, Qt.ItemDataRole.UserRole)
+                if facet[0] == 'track':
+                    file_paths.append(facet[1])
+                else:
+                    file_paths.extend(path for path, _, _ in facet_tracks(facet))
+            return file_paths
+        
+        def add_to_playlist(items):
+            file_paths = selected_paths(items)
+            if not file_paths:
+                return
+            
+            # Уся вибрана група додається одним викликом
+            playlist = self._player.get_playlist()
+            added = self._add_tracks_to_playlist(file_paths)
+            if playlist.get_current_index() == -1 and added > 0:
+                playlist.set_current_index(0)
+                current = playlist.get_current_track()
+                if current:
+                    self._on_track_changed(current)
+            summary_label.setText(f"Додано до плейлисту: {added} з {len(file_paths)}")
+        
+        def add_to_queue(items):
+            # Альбом чи виконавець стає в чергу цілком, плейлист не змінюється
+            file_paths = selected_paths(items)
+            if file_paths:
+                count = self._player.enqueue(file_paths)
+                summary_label.setText(f"Додано в чергу: {len(file_paths)}, у черзі: {count}")
+        
+        group_combo.currentIndexChanged.connect(populate)
+        tree.itemExpanded.connect(on_item_expanded)
+        tree.itemDoubleClicked.connect(lambda item, column: add_to_playlist([item]))
+        
+        # Кнопки
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(8)
+        
+        add_btn = QPushButton("Додати до плейлисту")
+        add_btn.setFixedHeight(32)
+        add_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: 1px solid #444;
+                border-radius: 4px;
+                color: #ffffff;
+                font-size: 13px;
+                padding: 0 16px;
+            }
+            QPushButton:hover {
+                background: #2a2a2a;
+                border: 1px solid #6366f1;
+            }
+            QPushButton:pressed {
+                background: #1a1a1a;
+            }
+        """)
+        add_btn.clicked.connect(lambda: add_to_playlist(tree.selectedItems()))
+        buttons_layout.addWidget(add_btn)
+        
+        queue_btn = QPushButton("Додати в чергу")
+        queue_btn.setFixedHeight(32)
+        queue_btn.setStyleSheet(add_btn.styleSheet())
+        queue_btn.clicked.connect(lambda: add_to_queue(tree.selectedItems()))
+        buttons_layout.addWidget(queue_btn)
+        
+        buttons_layout.addStretch()
+        
+        close_btn = QPushButton("Закрити")
+        close_btn.setFixedHeight(32)
+        close_btn.setStyleSheet("""
+            QPushButton {
+                background: #6366f1;
+                border: none;
+                border-radius: 4px;
+                color: #ffffff;
+                font-size: 13px;
+                padding: 0 20px;
+            }
+            QPushButton:hover {
+                background: #4f46e5;
+            }
+            QPushButton:pressed {
+                background: #3730a3;
+            }
+        """)
+        close_btn.clicked.connect(dialog.accept)
+        buttons_layout.addWidget(close_btn)
+        
+        layout.addLayout(buttons_layout)
+        
+        populate()
+        dialog.exec()
+    
     def _remove_track(self):
         """Видаляє вибраний трек з плейлисту"""
         current_item = self._playlist_widget.currentItem()
         if current_item:
-            index = self._playlist_widget.row(current_item)
-            if self._player.get_playlist().remove_track(index):
-                self._update_playlist_display()
+            self._player.get_playlist().remove_track(self._playlist_widget.row(current_item))
     
     def _clear_playlist(self):
         """Очищає плейлист"""
         if self._show_question("Підтвердження", "Ви впевнені, що хочете очистити плейлист?"):
             self._player.stop()
+            self._player.cancel_prefetch()
             self._player.get_playlist().clear()
-            self._update_playlist_display()
             self._track_title_label.setText("Оберіть трек для відтворення")
             self._track_artist_label.setText("")
     
-    def _update_playlist_display(self):
-        """Оновлює відображення плейлисту"""
-        # Перевіряємо чи існує віджет плейлисту (може не бути в новому дизайні)
-        if not hasattr(self, '_playlist_widget') or not self._playlist_widget:
-            return
-        
-        self._playlist_widget.clear()
-        playlist = self._player.get_playlist()
-        
-        for i, track_path in enumerate(playlist.get_tracks()):
-            track_name = Path(track_path).name
-            item = QListWidgetItem(track_name)
-            item.setData(Qt.ItemDataRole.UserRole, track_path)
-            self._playlist_widget.addItem(item)
-        
-        self._update_playlist_selection()
-    
-    def _update_playlist_selection(self):
-        """Оновлює виділення поточного треку в плейлисті"""
-        # Перевіряємо чи існує віджет плейлисту
-        if not hasattr(self, '_playlist_widget') or not self._playlist_widget:
-            return
-        
-        current_index = self._player.get_playlist().get_current_index()
-        if 0 <= current_index < self._playlist_widget.count():
-            self._playlist_widget.setCurrentRow(current_index)
-    
     def _update_artwork(self, artwork: QPixmap = None):
         """Оновлює обкладинку альбому"""
         from player.utils.artwork import create_placeholder_pixmap
@@ -2593,16 +2951,30 @@ class MainWindow(QMainWindow):
     
     def _show_playlist_context_menu(self, position: QPoint):
         """Показує контекстне меню для плейлисту"""
-        item = self._playlist_widget.itemAt(position)
+        # Меню викликається як з вбудованого списку, так і з вікна плейлисту
+        list_widget = self.sender()
+        item = list_widget.itemAt(position)
         if item is None:
             return
         
+        # Дії з чергою застосовуються до всіх вибраних треків
+        selected = list_widget.selectedItems() if item.isSelected() else [item]
+        file_paths = [selected_item.data(Qt.ItemDataRole.UserRole) for selected_item in selected]
+        
         menu = QMenu(self)
         
         # Дія: Відтворити
         play_action = menu.addAction("Відтворити")
         play_action.triggered.connect(lambda: self._on_playlist_item_double_clicked(item))
         
+        # Дія: Відтворити наступним
+        play_next_action = menu.addAction("Відтворити наступним")
+        play_next_action.triggered.connect(lambda: self._player.enqueue(file_paths, play_next=True))
+        
+        # Дія: Додати в чергу
+        enqueue_action = menu.addAction("Додати в чергу")
+        enqueue_action.triggered.connect(lambda: self._player.enqueue(file_paths))
+        
         menu.addSeparator()
         
         # Дія: Інформація
@@ -2620,7 +2992,7 @@ class MainWindow(QMainWindow):
         remove_action.triggered.connect(lambda: self._remove_track_from_context_menu(item))
         
         # Показуємо меню
-        menu.exec(self._playlist_widget.mapToGlobal(position))
+        menu.exec(list_widget.mapToGlobal(position))
     
     def _show_track_info(self, item: QListWidgetItem):
         """Показує інформацію про трек"""
@@ -2628,7 +3000,7 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
         
-        info = self._player.get_track_info(file_path)
+        info = self._player.get_track_tags(file_path)
         from pathlib import Path
         
         message = f"""
@@ -2648,26 +3020,43 @@ class MainWindow(QMainWindow):
     
     def _remove_track_from_context_menu(self, item: QListWidgetItem):
         """Видаляє трек з контекстного меню"""
-        index = self._playlist_widget.row(item)
-        if self._player.get_playlist().remove_track(index):
-            self._update_playlist_display()
+        # Індекс за шляхом: рядок може бути з відфільтрованого списку результатів
+        playlist = self._player.get_playlist()
+        playlist.remove_track(playlist.index_of(item.data(Qt.ItemDataRole.UserRole)))
     
     def _filter_playlist(self, text: str):
-        """Фільтрує плейлист за текстом пошуку"""
-        search_text = text.lower().strip()
-        
-        for i in range(self._playlist_widget.count()):
-            item = self._playlist_widget.item(i)
-            if item:
-                item_text = item.text().lower()
-                file_path = item.data(Qt.ItemDataRole.UserRole)
-                
-                # Перевіряємо назву файлу та шлях
-                matches = search_text in item_text
-                if file_path:
-                    matches = matches or search_text in file_path.lower()
-                
-                item.setHidden(not matches)
+        """Планує пошук у плейлисті (у фоні, після паузи у введенні); порожній рядок - весь плейлист"""
+        if not text.strip():
+            self._search_runner.cancel()
+            self._search_results.hide()
+            self._search_results_label.hide()
+            self._playlist_widget.show()
+            return
+        self._search_runner.submit(text)
+    
+    def _refresh_playlist_search(self, *args):
+        """Повторює активний пошук після зміни плейлисту"""
+        text = self._search_input.text()
+        if text.strip():
+            self._search_runner.submit(text)
+    
+    def _show_playlist_search_results(self, query: str, keys: list):
+        """Показує знайдені треки плейлисту за релевантністю замість повного списку"""
+        matches = [item for item in map(self._playlist_binding.item, keys) if item is not None]
+        
+        self._search_results.setUpdatesEnabled(False)
+        self._search_results.clear()
+        for source in matches[:SEARCH_RESULTS_LIMIT]:
+            self._search_results.addItem(source.clone())
+        self._search_results.setUpdatesEnabled(True)
+        
+        if len(matches) > SEARCH_RESULTS_LIMIT:
+            self._search_results_label.setText(f"Показано {SEARCH_RESULTS_LIMIT} з {len(matches)} результатів")
+        else:
+            self._search_results_label.setText(f"Знайдено: {len(matches)}")
+        self._search_results_label.show()
+        self._playlist_widget.hide()
+        self._search_results.show()
     
     def _save_playlist(self):
         """Зберігає поточний плейлист"""
@@ -2717,10 +3106,11 @@ class MainWindow(QMainWindow):
         if file_path:
             from player.utils.playlist_io import load_m3u_playlist, load_json_playlist
             
+            # Наявність файлів перевіряється у фоні (одне читання на папку)
             if file_path.endswith('.json'):
-                tracks, metadata = load_json_playlist(file_path)
+                tracks, metadata = load_json_playlist(file_path, validate=False)
             else:
-                tracks = load_m3u_playlist(file_path)
+                tracks = load_m3u_playlist(file_path, validate=False)
             
             if tracks:
                 # Питаємо чи додати до поточного чи замінити
@@ -2812,8 +3202,8 @@ class MainWindow(QMainWindow):
                     self._player.stop()
                 
                 # Додаємо треки
-                added = self._player.get_playlist().add_tracks(tracks)
-                self._update_playlist_display()
+                added = self._add_tracks_to_playlist(tracks, validate=False)
+                self._player.get_track_validator().validate(tracks)
                 
                 if added > 0:
                     self._save_recent_playlist(file_path)
@@ -2832,71 +3222,37 @@ class MainWindow(QMainWindow):
             else:
                 self._show_message( "Помилка", "Не вдалося завантажити плейлист або він порожній!")
     
-    def _on_playlist_reordered(self, parent=None, start=None, end=None, destination=None, row=None):
-        """Обробник зміни порядку треків через drag & drop"""
-        # Використовуємо QTimer для відкладеної обробки після завершення drag & drop
-        QTimer.singleShot(100, self._update_playlist_order)
-    
-    def _update_playlist_order(self):
-        """Оновлює порядок треків в плейлисті після drag & drop"""
-        playlist = self._player.get_playlist()
+    def _on_playlist_reordered(self, parent, start: int, end: int, destination, row: int):
+        """
+        Обробник зміни порядку треків через drag & drop
         
-        # Отримуємо новий порядок з UI
-        new_order = []
-        for i in range(self._playlist_widget.count()):
-            item = self._playlist_widget.item(i)
-            if item:
-                file_path = item.data(Qt.ItemDataRole.UserRole)
-                if file_path:
-                    new_order.append(file_path)
-        
-        # Перевіряємо чи порядок дійсно змінився
-        current_tracks = playlist.get_tracks()
-        if new_order != current_tracks and len(new_order) == len(current_tracks):
-            current_track = playlist.get_current_track()
-            
-            # Оновлюємо плейлист
-            playlist.clear()
-            playlist.add_tracks(new_order)
-            
-            # Відновлюємо поточний індекс
-            if current_track and current_track in new_order:
-                new_index = new_order.index(current_track)
-                playlist.set_current_index(new_index)
-                self._update_playlist_selection()
+        Модель списку повідомляє про кожне переміщення (rowsMoved), тож
+        плейлист повторює саме його, без перебудови всього порядку.
+        """
+        self._player.get_playlist().move(range(start, end + 1), row)
     
     def _sort_playlist(self, index: int):
         """Сортує плейлист"""
         playlist = self._player.get_playlist()
-        tracks = playlist.get_tracks()
+        tracks = playlist.get_tracks_view()
         
         if not tracks:
             return
         
-        current_track = playlist.get_current_track()
-        current_index = playlist.get_current_index()
-        
         if index == 0:  # Без сортування
             return
         elif index == 1:  # За назвою
-            sorted_tracks = sorted(tracks, key=lambda x: Path(x).stem.lower())
+            key = lambda x: Path(x).stem.lower()
         elif index == 2:  # За виконавцем
-            sorted_tracks = sorted(tracks, key=lambda x: self._player.get_track_info(x).get('artist', '').lower())
+            key = lambda x: self._player.get_track_tags(x).get('artist', '').lower()
         elif index == 3:  # За альбомом
-            sorted_tracks = sorted(tracks, key=lambda x: self._player.get_track_info(x).get('album', '').lower())
+            key = lambda x: self._player.get_track_tags(x).get('album', '').lower()
         else:
             return
         
-        # Оновлюємо плейлист
-        playlist.clear()
-        playlist.add_tracks(sorted_tracks)
-        
-        # Відновлюємо поточний трек
-        if current_track and current_track in sorted_tracks:
-            new_index = sorted_tracks.index(current_track)
-            playlist.set_current_index(new_index)
-        
-        self._update_playlist_display()
+        # Переставляємо треки на місці (поточний трек зберігається)
+        keys = [key(track) for track in tracks]
+        playlist.apply_permutation(sorted(range(len(tracks)), key=keys.__getitem__))
     
     def _show_history(self):
         """Показує вікно з історією відтворення"""
@@ -3006,13 +3362,11 @@ class MainWindow(QMainWindow):
         if file_path and Path(file_path).exists():
             # Додаємо до плейлисту якщо немає
             playlist = self._player.get_playlist()
-            if file_path not in playlist.get_tracks():
-                playlist.add_track(file_path)
-                self._update_playlist_display()
+            if not playlist.contains(file_path):
+                self._add_tracks_to_playlist([file_path])
             
             # Встановлюємо як поточний та відтворюємо
-            index = playlist.get_tracks().index(file_path)
-            playlist.set_current_index(index)
+            playlist.set_current_index(playlist.index_of(file_path))
             self._player.load_file(file_path)
             self._player.play()
             self._on_track_changed(file_path)
@@ -3055,13 +3409,15 @@ class MainWindow(QMainWindow):
                 background: #252525;
             }
         """)
-        search_input.textChanged.connect(self._filter_playlist)
         layout.addWidget(search_input, 0)
         
         # Ctrl+F фокусує пошук
         search_shortcut = QShortcut(QKeySequence("Ctrl+F"), dialog)
         search_shortcut.activated.connect(search_input.setFocus)
         
+        # Головне вікно не отримує клавіші, поки відкрито модальне вікно
+        self._add_undo_shortcuts(dialog)
+        
         # Список плейлисту
         playlist_list = QListWidget()
         playlist_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -3089,36 +3445,93 @@ class MainWindow(QMainWindow):
         
         playlist_list.keyPressEvent = handle_playlist_keys
         
-        # Заповнюємо список
-        playlist = self._player.get_playlist()
-        for i, track_path in enumerate(playlist.get_tracks()):
-            # Отримуємо інфо про трек
-            info = self._player.get_track_info(track_path)
-            duration_str = self._format_time(info.get('duration', 0))
-            
-            # Назва з тривалістю
-            track_name = f"{Path(track_path).stem} ({duration_str})"
-            item = QListWidgetItem(track_name)
-            item.setData(Qt.ItemDataRole.UserRole, track_path)
-            
-            # Tooltip з повною інформацією
-            bitrate = info.get('bitrate', 'Unknown')
-            file_format = Path(track_path).suffix[1:].upper()
-            tooltip = f"{Path(track_path).name}\n"
-            tooltip += f"Виконавець: {info.get('artist', 'Невідомо')}\n"
-            tooltip += f"Альбом: {info.get('album', 'Невідомо')}\n"
-            tooltip += f"Формат: {file_format} • {bitrate}"
-            item.setToolTip(tooltip)
-            
-            playlist_list.addItem(item)
+        # Заповнюємо список (лише з індексу; відсутні метадані дочитуються у фоні);
+        # далі рядки оновлюються за сигналами плейлисту, поки вікно відкрите
+        pending_paths = []
         
-        # Виділяємо поточний трек
-        current_index = playlist.get_current_index()
-        if 0 <= current_index < playlist_list.count():
-            playlist_list.setCurrentRow(current_index)
+        def format_item(item, track_path):
+            info = self._player.get_cached_track_tags(track_path)
+            if info is None:
+                pending_paths.append(track_path)
+            self._format_playlist_item(item, track_path, info)
+        
+        binding = PlaylistBinding(self._player.get_playlist(), playlist_list, format_item, parent=dialog)
+        dialog.finished.connect(binding.unbind)
+        
+        # Рядки заповнюються по мірі надходження метаданих
+        def on_track_tags_ready(track_path, info):
+            item = binding.item(track_path)
+            if item is not None:
+                self._format_playlist_item(item, track_path, info)
+        
+        self._player.track_tags_ready.connect(on_track_tags_ready)
+        dialog.finished.connect(lambda: self._player.track_tags_ready.disconnect(on_track_tags_ready))
+        self._player.prefetch_track_tags(pending_paths)
         
         layout.addWidget(playlist_list, 1)
         
+        # Результати пошуку - окремий список лише зі знайденими рядками
+        results_list = QListWidget()
+        results_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        results_list.itemDoubleClicked.connect(self._on_playlist_item_double_clicked)
+        results_list.hide()
+        layout.addWidget(results_list, 1)
+        
+        results_label = QLabel()
+        results_label.setStyleSheet("color: #888888; font-size: 11px;")
+        results_label.hide()
+        layout.addWidget(results_label, 0)
+        
+        def handle_results_keys(event):
+            if event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
+                current = results_list.currentItem()
+                if current:
+                    self._on_playlist_item_double_clicked(current)
+            elif event.key() == Qt.Key.Key_Escape:
+                search_input.clear()
+                playlist_list.setFocus()
+            else:
+                QListWidget.keyPressEvent(results_list, event)
+        
+        results_list.keyPressEvent = handle_results_keys
+        
+        # Запити виконуються у фоні після паузи у введенні; застарілі відкидаються
+        from player.utils.search_runner import SearchRunner
+        search_runner = SearchRunner(self._player.get_search_index(), parent=dialog)
+        
+        def on_search_text_changed(text):
+            if not text.strip():
+                search_runner.cancel()
+                results_list.hide()
+                results_label.hide()
+                playlist_list.show()
+                return
+            search_runner.submit(text)
+        
+        def show_search_results(query, keys):
+            # Результати за релевантністю, лише треки цього плейлисту
+            matches = [item for item in map(binding.item, keys) if item is not None]
+            
+            results_list.setUpdatesEnabled(False)
+            results_list.clear()
+            for source in matches[:SEARCH_RESULTS_LIMIT]:
+                results_list.addItem(source.clone())
+            results_list.setUpdatesEnabled(True)
+            
+            if len(matches) > SEARCH_RESULTS_LIMIT:
+                results_label.setText(f"Показано {SEARCH_RESULTS_LIMIT} з {len(matches)} результатів")
+            else:
+                results_label.setText(f"Знайдено: {len(matches)}")
+            results_label.show()
+            playlist_list.hide()
+            results_list.show()
+            if results_list.count():
+                results_list.setCurrentRow(0)
+        
+        search_input.textChanged.connect(on_search_text_changed)
+        search_runner.results_ready.connect(show_search_results)
+        dialog.finished.connect(lambda: (search_runner.cancel(), search_runner.wait()))
+        
         # Компактні кнопки знизу
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(8)
@@ -3247,20 +3660,49 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
     
+    def _format_playlist_item(self, item: QListWidgetItem, track_path: str, info: dict = None):
+        """
+        Заповнює текст та підказку рядка плейлисту
+        
+        Args:
+            item: Рядок списку
+            track_path: Шлях до треку
+            info: Теги треку (None - ще не прочитані)
+        """
+        if info is None:
+            item.setText(Path(track_path).stem)
+            item.setToolTip(Path(track_path).name)
+            return
+        
+        duration_str = self._format_time(info.get('duration', 0))
+        
+        # Назва з тривалістю
+        item.setText(f"{Path(track_path).stem} ({duration_str})")
+        
+        # Tooltip з повною інформацією
+        bitrate = info.get('bitrate', 'Unknown')
+        file_format = info.get('format') or Path(track_path).suffix[1:].upper()
+        tooltip = f"{Path(track_path).name}\n"
+        tooltip += f"Виконавець: {info.get('artist', 'Невідомо')}\n"
+        tooltip += f"Альбом: {info.get('album', 'Невідомо')}\n"
+        tooltip += f"Формат: {file_format} • {bitrate}"
+        item.setToolTip(tooltip)
+    
     def _remove_track_from_list(self, playlist_widget):
         """Видаляє трек з плейлисту"""
         current_item = playlist_widget.currentItem()
         if current_item:
-            index = playlist_widget.row(current_item)
-            if self._player.get_playlist().remove_track(index):
-                playlist_widget.takeItem(index)
-                self._update_playlist_display()
+            # Рядок прибирає прив'язка списку до плейлисту
+            self._player.get_playlist().remove_track(playlist_widget.row(current_item))
     
     def _on_playlist_item_double_clicked(self, item: QListWidgetItem):
         """Обробник подвійного кліку на елемент плейлисту - відтворює трек"""
         file_path = item.data(Qt.ItemDataRole.UserRole)
         if file_path:
-            index = self._playlist_widget.row(item) if hasattr(self, '_playlist_widget') and self._playlist_widget else item.listWidget().row(item)
+            # Індекс за шляхом: рядок може бути з відфільтрованого списку результатів
+            index = self._player.get_playlist().index_of(file_path)
+            if index < 0:
+                return
             self._player.get_playlist().set_current_index(index)
             self._player.load_file(file_path)
             self._player.play()
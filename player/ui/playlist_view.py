@@ -0,0 +1,123 @@
+"""
+Прив'язка QListWidget до плейлисту з покроковим оновленням рядків
+"""
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt, QObject
+
+from ..playlist import Playlist
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PlaylistBinding(QObject):
+    """
+    Тримає QListWidget у відповідності до плейлисту
+    
+    Замість перебудови всього списку після кожної зміни застосовує
+    сигнали Playlist: додавання 10 треків до 50 тис. створює 10 рядків.
+    Шлях треку зберігається в Qt.ItemDataRole.UserRole рядка.
+    """
+    
+    def __init__(self, playlist: Playlist, widget: QListWidget,
+                 format_item: Callable[[QListWidgetItem, str], None], parent: QObject = None):
+        """
+        Args:
+            playlist: Плейлист
+            widget: Список, що відображає плейлист
+            format_item: Заповнює текст рядка за шляхом треку
+            parent: Батьківський об'єкт
+        """
+        super().__init__(parent)
+        self._playlist = playlist
+        self._widget = widget
+        self._format_item = format_item
+        self._items: Dict[str, QListWidgetItem] = {}  # {шлях: рядок}
+        
+        self._connections = [
+            (playlist.rows_inserted, self._on_rows_inserted),
+            (playlist.rows_removed, self._on_rows_removed),
+            (playlist.rows_moved, self._on_rows_moved),
+            (playlist.row_changed, self._on_row_changed),
+            (playlist.playlist_reset, self._reset),
+            (playlist.current_index_changed, self._on_current_index_changed),
+        ]
+        for signal, slot in self._connections:
+            signal.connect(slot)
+        self._reset()
+    
+    def item(self, file_path: str) -> Optional[QListWidgetItem]:
+        """Повертає рядок треку або None"""
+        return self._items.get(file_path)
+    
+    def unbind(self):
+        """Від'єднується від сигналів плейлисту (список більше не оновлюється)"""
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections = []
+    
+    def _create_item(self, file_path: str) -> QListWidgetItem:
+        """Створює рядок для треку"""
+        item = QListWidgetItem()
+        item.setData(Qt.ItemDataRole.UserRole, file_path)
+        self._format_item(item, file_path)
+        self._items[file_path] = item
+        return item
+    
+    def _take_item(self, row: int):
+        """Видаляє рядок зі списку"""
+        item = self._widget.takeItem(row)
+        if item is not None:
+            self._items.pop(item.data(Qt.ItemDataRole.UserRole), None)
+    
+    def _reset(self):
+        """Перебудовує весь список (очищення, сортування)"""
+        widget = self._widget
+        widget.setUpdatesEnabled(False)
+        widget.clear()
+        self._items.clear()
+        for file_path in self._playlist.get_tracks_view():
+            widget.addItem(self._create_item(file_path))
+        widget.setUpdatesEnabled(True)
+        self._on_current_index_changed(self._playlist.get_current_index())
+    
+    def _on_rows_inserted(self, first: int, last: int):
+        """Додає рядки нових треків"""
+        tracks = self._playlist.get_tracks_view()[first:last + 1]
+        for row, file_path in enumerate(tracks, first):
+            self._widget.insertItem(row, self._create_item(file_path))
+    
+    def _on_rows_removed(self, first: int, last: int):
+        """Прибирає рядки видалених треків"""
+        for row in range(last, first - 1, -1):
+            self._take_item(row)
+    
+    def _on_rows_moved(self, start: int, end: int, dest: int):
+        """Переносить рядки (якщо перенос почався не з самого списку)"""
+        size = end - start + 1
+        new_first = dest if dest < start else dest - size
+        # Перетягування в цьому списку - рядки вже на нових місцях
+        moved = self._widget.item(new_first)
+        if moved is not None and moved.data(Qt.ItemDataRole.UserRole) == self._playlist.get_track_at(new_first):
+            return
+        items = [self._widget.takeItem(start) for _ in range(size)]
+        for offset, item in enumerate(items):
+            self._widget.insertItem(new_first + offset, item)
+    
+    def _on_row_changed(self, row: int):
+        """Оновлює рядок треку, шлях якого змінився"""
+        item = self._widget.item(row)
+        if item is None:
+            return
+        self._items.pop(item.data(Qt.ItemDataRole.UserRole), None)
+        file_path = self._playlist.get_track_at(row)
+        item.setData(Qt.ItemDataRole.UserRole, file_path)
+        self._format_item(item, file_path)
+        self._items[file_path] = item
+    
+    def _on_current_index_changed(self, index: int):
+        """Виділяє поточний трек"""
+        if 0 <= index < self._widget.count():
+            self._widget.setCurrentRow(index)
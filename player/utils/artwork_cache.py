@@ -2,7 +2,8 @@
 Кешування обкладинок альбомів
 """
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+import os
 import pickle
 import hashlib
 
@@ -151,6 +152,49 @@ class ArtworkCache:
         except Exception as e:
             logger.error(f"Помилка очищення кешу: {e}", exc_info=True)
     
+    def remove(self, file_paths: List[str]):
+        """
+        Видаляє обкладинки треків з кешу
+        
+        Args:
+            file_paths: Шляхи до аудіофайлів
+        """
+        try:
+            removed = 0
+            for file_path in file_paths:
+                cache_path_str = self._index.pop(self._get_file_hash(file_path), None)
+                if cache_path_str is None:
+                    continue
+                removed += 1
+                cache_path = Path(cache_path_str)
+                if cache_path.exists():
+                    cache_path.unlink()
+            if removed:
+                self._save_index()
+        except Exception as e:
+            logger.error(f"Помилка видалення з кешу: {e}", exc_info=True)
+    
+    def rename(self, old_path: str, new_path: str):
+        """
+        Переносить обкладинку на новий шлях треку
+        
+        Args:
+            old_path: Старий шлях до аудіофайлу
+            new_path: Новий шлях до аудіофайлу
+        """
+        try:
+            old_hash = self._get_file_hash(old_path)
+            if old_hash not in self._index:
+                return
+            new_hash = self._get_file_hash(new_path)
+            new_cache_path = self._get_cache_path(new_hash)
+            # os.replace зберігає mtime файлу кешу, тож перевірка актуальності не змінюється
+            os.replace(self._index.pop(old_hash), new_cache_path)
+            self._index[new_hash] = str(new_cache_path)
+            self._save_index()
+        except Exception as e:
+            logger.error(f"Помилка перейменування в кеші: {e}", exc_info=True)
+    
     def clear_cache(self):
         """Очищає весь кеш"""
         try:
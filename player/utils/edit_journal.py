@@ -0,0 +1,96 @@
+"""
+Журнал змін для скасування та повтору з обмеженням пам'яті
+"""
+from collections import deque
+from typing import Any, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUDGET = 16 * 1024 * 1024  # Байт на всі записи скасування та повтору
+
+
+class EditJournal:
+    """
+    Стеки скасування та повтору з записами довільного вигляду
+
+    Кожен запис має оцінку розміру; коли сума перевищує бюджет,
+    відкидаються найстаріші записи (спочатку зі стеку скасування).
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        """
+        Args:
+            budget: Максимальний сумарний розмір записів (байти)
+        """
+        self._budget = budget
+        self._undo = deque()  # (запис, розмір), останній - найновіший
+        self._redo = deque()
+        self._size = 0
+
+    def record(self, entry: Any, size: int):
+        """Додає нову зміну (стек повтору очищується)"""
+        self._drop_redo()
+        self.push_undo(entry, size)
+
+    def push_undo(self, entry: Any, size: int):
+        """Додає запис у стек скасування"""
+        self._undo.append((entry, size))
+        self._size += size
+        self._trim()
+
+    def push_redo(self, entry: Any, size: int):
+        """Додає запис у стек повтору"""
+        self._redo.append((entry, size))
+        self._size += size
+        self._trim()
+
+    def pop_undo(self) -> Optional[Any]:
+        """Знімає останній запис скасування або повертає None"""
+        return self._pop(self._undo)
+
+    def pop_redo(self) -> Optional[Any]:
+        """Знімає останній запис повтору або повертає None"""
+        return self._pop(self._redo)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self):
+        """Очищає обидва стеки"""
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+    def get_size(self) -> int:
+        """Повертає оцінку пам'яті всіх записів (байти)"""
+        return self._size
+
+    def set_budget(self, budget: int):
+        """Змінює бюджет пам'яті, відкидаючи зайві записи"""
+        self._budget = budget
+        self._trim()
+
+    def _pop(self, stack: deque) -> Optional[Any]:
+        if not stack:
+            return None
+        entry, size = stack.pop()
+        self._size -= size
+        return entry
+
+    def _drop_redo(self):
+        for _, size in self._redo:
+            self._size -= size
+        self._redo.clear()
+
+    def _trim(self):
+        """Відкидає найстаріші записи, поки розмір перевищує бюджет"""
+        while self._size > self._budget and (self._undo or self._redo):
+            stack = self._undo if self._undo else self._redo
+            _, size = stack.popleft()
+            self._size -= size
+            logger.debug(f"Журнал змін: відкинуто запис ({size} байт)")
@@ -0,0 +1,518 @@
+"""
+Швидке читання тегів лише із заголовків (MP3/FLAC/OGG/M4A)
+
+Читаються тільки блоки, потрібні для списків (назва, виконавець, альбом,
+тривалість). Обкладинки та інші великі блоки пропускаються через seek, без
+читання їх вмісту - це суттєво для файлів на мережевих дисках.
+"""
+from typing import Optional, BinaryIO
+import os
+import struct
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+MPEG_SCAN_LIMIT = 64 * 1024  # Скільки байт шукати перший MPEG-фрейм
+OGG_TAIL_SIZE = 64 * 1024  # Скільки байт з кінця читати для пошуку останньої сторінки
+MAX_COMMENT_SIZE = 64 * 1024  # Більші Vorbis-коментарі (обкладинки) пропускаються
+
+ID3_FRAMES = {
+    'TIT2': 'title', 'TPE1': 'artist', 'TALB': 'album', 'TCON': 'genre',
+    'TT2': 'title', 'TP1': 'artist', 'TAL': 'album', 'TCO': 'genre',
+}
+VORBIS_FIELDS = {'TITLE': 'title', 'ARTIST': 'artist', 'ALBUM': 'album', 'GENRE': 'genre'}
+MP4_FIELDS = {b'\xa9nam': 'title', b'\xa9ART': 'artist', b'\xa9alb': 'album', b'\xa9gen': 'genre'}
+
+MPEG_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+
+class _UnsupportedError(Exception):
+    """Файл потребує повного розбору через mutagen"""
+
+
+def read_fast_tags(file_path: str) -> Optional[dict]:
+    """
+    Читає теги та тривалість лише із заголовків файлу
+
+    Args:
+        file_path: Шлях до аудіофайлу
+
+    Returns:
+        Словник з ключами duration (мс) та знайденими title/artist/album/genre,
+        або None якщо формат не підтримується і потрібен mutagen
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            magic = f.read(12)
+            f.seek(0)
+            if magic[:4] == b'fLaC':
+                return _read_flac(f)
+            if magic[:4] == b'OggS':
+                return _read_ogg(f)
+            if magic[4:8] == b'ftyp':
+                return _read_mp4(f)
+            if magic[:3] == b'ID3' or (len(magic) >= 2 and magic[0] == 0xFF and magic[1] & 0xE0 == 0xE0):
+                return _read_mp3(f)
+    except (_UnsupportedError, OSError, struct.error, ValueError, UnicodeDecodeError, IndexError) as e:
+        logger.debug(f"Швидке читання тегів недоступне для {file_path}: {e}")
+    return None
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    """Читає рівно size байт або кидає помилку"""
+    data = f.read(size)
+    if len(data) != size:
+        raise _UnsupportedError("Неочікуваний кінець файлу")
+    return data
+
+
+def _file_size(f: BinaryIO) -> int:
+    """Повертає розмір відкритого файлу"""
+    return os.fstat(f.fileno()).st_size
+
+
+# MP3 (ID3v2 + MPEG)
+
+def _synchsafe(data: bytes) -> int:
+    """Декодує synchsafe-ціле ID3v2"""
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+    return value
+
+
+def _decode_id3_text(data: bytes) -> str:
+    """Декодує текстовий фрейм ID3 (повертає перше значення)"""
+    if not data:
+        return ''
+    encoding, payload = data[0], data[1:]
+    if encoding == 0:
+        text = payload.decode('latin-1')
+    elif encoding == 1:
+        text = payload.decode('utf-16')
+    elif encoding == 2:
+        text = payload.decode('utf-16-be')
+    elif encoding == 3:
+        text = payload.decode('utf-8')
+    else:
+        raise _UnsupportedError(f"Невідоме кодування ID3: {encoding}")
+    return text.split('\x00')[0]
+
+
+def _read_id3v2(f: BinaryIO) -> tuple:
+    """
+    Читає потрібні текстові фрейми ID3v2
+
+    Returns:
+        Кортеж (словник тегів, зміщення аудіоданих)
+    """
+    header = _read_exact(f, 10)
+    if header[:3] != b'ID3':
+        return {}, 0
+
+    version, flags = header[3], header[5]
+    tag_size = _synchsafe(header[6:10])
+    audio_start = 10 + tag_size + (10 if flags & 0x10 else 0)
+    if version not in (2, 3, 4) or flags & 0x80:
+        # Несинхронізований тег - залишаємо mutagen
+        raise _UnsupportedError("Непідтримуваний ID3v2")
+
+    end = 10 + tag_size
+    if flags & 0x40:
+        ext = _read_exact(f, 4)
+        ext_size = _synchsafe(ext) if version == 4 else struct.unpack('>I', ext)[0] + 4
+        f.seek(ext_size - 4, 1)
+
+    tags = {}
+    header_size = 6 if version == 2 else 10
+    while f.tell() + header_size <= end:
+        frame_header = _read_exact(f, header_size)
+        if frame_header[0] == 0:
+            break  # Padding
+        if version == 2:
+            frame_id = frame_header[:3].decode('latin-1')
+            frame_size = int.from_bytes(frame_header[3:6], 'big')
+            frame_flags = 0
+        else:
+            frame_id = frame_header[:4].decode('latin-1')
+            frame_size = (_synchsafe(frame_header[4:8]) if version == 4
+                          else struct.unpack('>I', frame_header[4:8])[0])
+            frame_flags = frame_header[9]
+
+        key = ID3_FRAMES.get(frame_id)
+        if key is None or key in tags:
+            # APIC та інші непотрібні фрейми пропускаємо без читання
+            f.seek(frame_size, 1)
+            continue
+
+        if version == 4:
+            if frame_flags & 0x0E:
+                raise _UnsupportedError("Стиснений/шифрований фрейм")
+            data = _read_exact(f, frame_size)
+            if frame_flags & 0x01:
+                data = data[4:]
+        else:
+            if version == 3 and frame_flags & 0xE0:
+                raise _UnsupportedError("Стиснений/шифрований фрейм")
+            data = _read_exact(f, frame_size)
+        tags[key] = _decode_id3_text(data)
+
+    return tags, audio_start
+
+
+def _read_id3v1(f: BinaryIO) -> dict:
+    """Читає ID3v1 тег в кінці файлу"""
+    size = _file_size(f)
+    if size < 128:
+        return {}
+    f.seek(size - 128)
+    data = f.read(128)
+    if data[:3] != b'TAG':
+        return {}
+    tags = {}
+    for key, start in (('title', 3), ('artist', 33), ('album', 63)):
+        value = data[start:start + 30].split(b'\x00')[0].decode('latin-1').strip()
+        if value:
+            tags[key] = value
+    return tags
+
+
+def _parse_mpeg_header(header: int) -> Optional[tuple]:
+    """
+    Розбирає 4-байтовий заголовок MPEG-фрейму
+
+    Returns:
+        Кортеж (версія, шар, бітрейт кбіт/с, частота, канали, довжина фрейму) або None
+    """
+    if header >> 21 != 0x7FF:
+        return None
+    version = {0: 2.5, 2: 2, 3: 1}.get((header >> 19) & 0x3)
+    layer = {1: 3, 2: 2, 3: 1}.get((header >> 17) & 0x3)
+    bitrate_index = (header >> 12) & 0xF
+    sample_rate_index = (header >> 10) & 0x3
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = MPEG_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = MPEG_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header >> 9) & 0x1
+    mono = ((header >> 6) & 0x3) == 3
+    if layer == 1:
+        frame_length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 3 and version != 1:
+        frame_length = 72 * bitrate * 1000 // sample_rate + padding
+    else:
+        frame_length = 144 * bitrate * 1000 // sample_rate + padding
+    return version, layer, bitrate, sample_rate, mono, frame_length
+
+
+def _read_mpeg_duration(f: BinaryIO, audio_start: int, audio_end: int) -> int:
+    """Обчислює тривалість MP3 (мс) за Xing/VBRI заголовком або бітрейтом"""
+    f.seek(audio_start)
+    data = f.read(MPEG_SCAN_LIMIT)
+    if data[:4] == b'fLaC':
+        raise _UnsupportedError("FLAC з ID3-заголовком")
+
+    pos = data.find(b'\xff')
+    while 0 <= pos <= len(data) - 4:
+        parsed = _parse_mpeg_header(struct.unpack('>I', data[pos:pos + 4])[0])
+        if parsed is not None:
+            # Перевіряємо, що наступний фрейм теж валідний (захист від хибних збігів)
+            next_pos = pos + parsed[5]
+            if next_pos + 4 > len(data) or _parse_mpeg_header(
+                    struct.unpack('>I', data[next_pos:next_pos + 4])[0]) is not None:
+                break
+        pos = data.find(b'\xff', pos + 1)
+    else:
+        raise _UnsupportedError("MPEG-фрейм не знайдено")
+
+    version, layer, bitrate, sample_rate, mono, frame_length = parsed
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 3 and version != 1:
+        samples_per_frame = 576
+    else:
+        samples_per_frame = 1152
+
+    frame = data[pos:pos + frame_length]
+    if version == 1:
+        xing_offset = 21 if mono else 36
+    else:
+        xing_offset = 13 if mono else 21
+
+    frames = None
+    if frame[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        xing_flags = struct.unpack('>I', frame[xing_offset + 4:xing_offset + 8])[0]
+        if xing_flags & 0x1:
+            frames = struct.unpack('>I', frame[xing_offset + 8:xing_offset + 12])[0]
+    elif frame[36:40] == b'VBRI':
+        frames = struct.unpack('>I', frame[50:54])[0]
+
+    if frames:
+        return int(frames * samples_per_frame / sample_rate * 1000)
+
+    audio_size = audio_end - (audio_start + pos)
+    return int(audio_size * 8 / (bitrate * 1000) * 1000)
+
+
+def _read_mp3(f: BinaryIO) -> dict:
+    """Читає теги та тривалість MP3"""
+    tags, audio_start = _read_id3v2(f)
+    if not tags:
+        tags = _read_id3v1(f)
+
+    size = _file_size(f)
+    f.seek(max(0, size - 128))
+    audio_end = size - 128 if f.read(3) == b'TAG' else size
+
+    tags['duration'] = _read_mpeg_duration(f, audio_start, audio_end)
+    return tags
+
+
+# Vorbis comment (FLAC, Ogg Vorbis, Opus)
+
+def _read_vorbis_comment(reader) -> dict:
+    """
+    Читає Vorbis-коментар, пропускаючи великі значення (METADATA_BLOCK_PICTURE)
+
+    Args:
+        reader: Об'єкт з методами read(n) та skip(n)
+    """
+    vendor_length = struct.unpack('<I', reader.read(4))[0]
+    reader.skip(vendor_length)
+    count = struct.unpack('<I', reader.read(4))[0]
+
+    tags = {}
+    for _ in range(count):
+        length = struct.unpack('<I', reader.read(4))[0]
+        if length > MAX_COMMENT_SIZE:
+            reader.skip(length)
+            continue
+        comment = reader.read(length).decode('utf-8', errors='replace')
+        name, sep, value = comment.partition('=')
+        key = VORBIS_FIELDS.get(name.upper())
+        if sep and key and key not in tags:
+            tags[key] = value
+        if len(tags) == len(VORBIS_FIELDS):
+            break
+    return tags
+
+
+class _FileReader:
+    """Послідовне читання частини файлу (для Vorbis-коментаря FLAC)"""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+
+    def read(self, size: int) -> bytes:
+        return _read_exact(self._f, size)
+
+    def skip(self, size: int):
+        self._f.seek(size, 1)
+
+
+def _read_flac(f: BinaryIO) -> dict:
+    """Читає STREAMINFO та VORBIS_COMMENT блоки FLAC"""
+    f.seek(4)
+    tags = {}
+    have_streaminfo = have_comment = False
+    while not (have_streaminfo and have_comment):
+        block_header = _read_exact(f, 4)
+        is_last = block_header[0] & 0x80
+        block_type = block_header[0] & 0x7F
+        block_length = int.from_bytes(block_header[1:4], 'big')
+        block_end = f.tell() + block_length
+
+        if block_type == 0:
+            streaminfo = _read_exact(f, block_length)
+            packed = struct.unpack('>Q', streaminfo[10:18])[0]
+            sample_rate = packed >> 44
+            total_samples = packed & 0xFFFFFFFFF
+            if not sample_rate:
+                raise _UnsupportedError("Невалідний STREAMINFO")
+            tags['duration'] = int(total_samples / sample_rate * 1000)
+            have_streaminfo = True
+        elif block_type == 4:
+            comment_tags = _read_vorbis_comment(_FileReader(f))
+            for key, value in comment_tags.items():
+                tags.setdefault(key, value)
+            have_comment = True
+
+        # PICTURE, PADDING, SEEKTABLE тощо пропускаються без читання
+        f.seek(block_end)
+        if is_last:
+            break
+
+    if not have_streaminfo:
+        raise _UnsupportedError("STREAMINFO не знайдено")
+    return tags
+
+
+# Ogg (Vorbis, Opus)
+
+class _OggReader:
+    """Читання вмісту сторінок Ogg як суцільного потоку байтів"""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._remaining = 0
+
+    def _next_page(self):
+        header = _read_exact(self._f, 27)
+        if header[:4] != b'OggS':
+            raise _UnsupportedError("Невалідна сторінка Ogg")
+        segments = _read_exact(self._f, header[26])
+        self._remaining = sum(segments)
+
+    def read(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            if self._remaining == 0:
+                self._next_page()
+                continue
+            chunk = _read_exact(self._f, min(size, self._remaining))
+            self._remaining -= len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def skip(self, size: int):
+        while size > 0:
+            if self._remaining == 0:
+                self._next_page()
+                continue
+            step = min(size, self._remaining)
+            self._f.seek(step, 1)
+            self._remaining -= step
+            size -= step
+
+
+def _read_ogg_last_granule(f: BinaryIO, serial: bytes) -> int:
+    """Знаходить позицію гранули останньої сторінки потоку"""
+    size = _file_size(f)
+    f.seek(max(0, size - OGG_TAIL_SIZE))
+    data = f.read(OGG_TAIL_SIZE)
+    pos = data.rfind(b'OggS')
+    while pos >= 0:
+        if data[pos + 14:pos + 18] == serial:
+            return struct.unpack('<q', data[pos + 6:pos + 14])[0]
+        pos = data.rfind(b'OggS', 0, pos)
+    raise _UnsupportedError("Останню сторінку Ogg не знайдено")
+
+
+def _read_ogg(f: BinaryIO) -> dict:
+    """Читає заголовки Ogg Vorbis / Opus"""
+    first_page = _read_exact(f, 27)
+    serial = first_page[14:18]
+    f.seek(0)
+
+    reader = _OggReader(f)
+    reader._next_page()
+    ident = reader.read(min(reader._remaining, 64))
+    if ident[:7] == b'\x01vorbis':
+        sample_rate = struct.unpack('<I', ident[12:16])[0]
+        pre_skip = 0
+        comment_magic = b'\x03vorbis'
+    elif ident[:8] == b'OpusHead':
+        sample_rate = 48000
+        pre_skip = struct.unpack('<H', ident[10:12])[0]
+        comment_magic = b'OpusTags'
+    else:
+        raise _UnsupportedError("Непідтримуваний кодек Ogg")
+
+    # Пакет коментарів починається з нової сторінки
+    reader.skip(reader._remaining)
+    if reader.read(len(comment_magic)) != comment_magic:
+        raise _UnsupportedError("Заголовок коментарів Ogg не знайдено")
+    tags = _read_vorbis_comment(reader)
+
+    if not sample_rate:
+        raise _UnsupportedError("Невалідна частота дискретизації")
+    granule = _read_ogg_last_granule(f, serial)
+    tags['duration'] = max(0, int((granule - pre_skip) / sample_rate * 1000))
+    return tags
+
+
+# MP4 / M4A
+
+MP4_CONTAINERS = {b'moov', b'udta', b'meta', b'ilst'}
+
+
+def _iter_atoms(f: BinaryIO, start: int, end: int):
+    """Ітерує атоми в межах [start, end): повертає (тип, початок даних, кінець)"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, atom_type = struct.unpack('>I4s', _read_exact(f, 8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', _read_exact(f, 8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            raise _UnsupportedError("Невалідний атом MP4")
+        yield atom_type, pos + header, min(pos + size, end)
+        pos += size
+
+
+def _read_mp4_item(f: BinaryIO, start: int, end: int) -> Optional[str]:
+    """Читає текстове значення елемента ilst з атома data"""
+    for atom_type, data_start, data_end in _iter_atoms(f, start, end):
+        if atom_type == b'data':
+            f.seek(data_start)
+            payload = _read_exact(f, data_end - data_start)
+            if payload[1:4] != b'\x00\x00\x01':
+                return None  # Не UTF-8 текст
+            return payload[8:].decode('utf-8')
+    return None
+
+
+def _read_mp4(f: BinaryIO) -> dict:
+    """Читає moov/mvhd та moov/udta/meta/ilst атоми MP4"""
+    tags = {}
+    size = _file_size(f)
+
+    def walk(start: int, end: int):
+        for atom_type, data_start, data_end in _iter_atoms(f, start, end):
+            if atom_type == b'mvhd':
+                f.seek(data_start)
+                version = _read_exact(f, 1)[0]
+                if version == 1:
+                    f.seek(data_start + 20)
+                    timescale, duration = struct.unpack('>IQ', _read_exact(f, 12))
+                else:
+                    f.seek(data_start + 12)
+                    timescale, duration = struct.unpack('>II', _read_exact(f, 8))
+                if timescale:
+                    tags['duration'] = int(duration / timescale * 1000)
+            elif atom_type == b'meta':
+                # meta - "full box" з 4 байтами версії/прапорців (крім QuickTime-варіанту)
+                f.seek(data_start + 4)
+                offset = 0 if _read_exact(f, 4) == b'hdlr' else 4
+                walk(data_start + offset, data_end)
+            elif atom_type in MP4_CONTAINERS:
+                walk(data_start, data_end)
+            elif atom_type in MP4_FIELDS:
+                value = _read_mp4_item(f, data_start, data_end)
+                if value:
+                    tags[MP4_FIELDS[atom_type]] = value
+            # mdat, covr та інші атоми пропускаються без читання
+
+    walk(0, size)
+    if 'duration' not in tags:
+        raise _UnsupportedError("mvhd не знайдено")
+    return tags
@@ -0,0 +1,183 @@
+"""
+Випадковий порядок груп треків (альбомів, папок) зі збереженням порядку всередині групи
+"""
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+import os
+import random
+
+from .logger import get_logger
+from .metadata import DEFAULT_ALBUM, DEFAULT_ARTIST
+from .shuffle import ShuffleEngine
+
+logger = get_logger(__name__)
+
+
+def folder_key(file_path: str, info: Optional[dict] = None) -> Hashable:
+    """Ключ групи за папкою треку"""
+    return ('dir', os.path.dirname(file_path))
+
+
+def album_key(file_path: str, info: Optional[dict] = None) -> Hashable:
+    """Ключ групи за альбомом з тегів; без тегів - за папкою"""
+    album = (info or {}).get('album')
+    if not album or album == DEFAULT_ALBUM:
+        return folder_key(file_path)
+    artist = info.get('artist') or DEFAULT_ARTIST
+    return ('album', artist.casefold(), album.casefold())
+
+
+class GroupShuffle:
+    """
+    Shuffle цілих груп: порядок груп випадковий (ShuffleEngine), треки
+    групи відтворюються підряд у порядку плейлиста
+
+    Належність до груп ведеться інкрементально (add, regroup), тож вибір
+    наступної групи не обходить плейлист; сортується лише вибрана група.
+    Видалені треки відкидаються ліниво, коли до них доходить черга.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[str]],
+                 key_func: Callable[[str, Optional[dict]], Hashable],
+                 get_infos: Optional[Callable[[List[str]], Dict[str, dict]]],
+                 index_of: Callable[[str], int],
+                 contains: Optional[Callable[[str], bool]] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            source: Повертає всі треки (викликається при перебудові груп)
+            key_func: Ключ групи за шляхом та тегами (folder_key, album_key)
+            get_infos: Відомі теги кількох треків одним запитом, без читання
+                файлів (None - ключу групи теги не потрібні)
+            index_of: Позиція треку в плейлисті (порядок всередині групи)
+            contains: Перевіряє, чи трек ще існує (None - завжди так)
+            rng: Генератор випадкових чисел (для відтворюваності в тестах)
+        """
+        self._source = source
+        self._key_func = key_func
+        self._get_infos = get_infos
+        self._index_of = index_of
+        self._contains = contains or (lambda item: True)
+        self._groups = {}  # Ключ -> {шлях: None} (упорядкована множина)
+        self._keys = {}  # Шлях -> ключ
+        self._engine = ShuffleEngine(lambda: list(self._groups), lambda key: key in self._groups, rng)
+        self._pending = deque()  # Решта треків поточної групи
+        self._current = None  # Останній виданий трек
+        self._fresh = True  # Групи ще не побудовано з source
+
+    def invalidate(self):
+        """Перебудовує групи при наступному кроці (вміст джерела змінився повністю)"""
+        self._fresh = True
+
+    def add(self, file_path: str):
+        """Додає трек у його групу"""
+        self.add_many([file_path])
+
+    def add_many(self, file_paths: List[str]):
+        """Додає треки в їхні групи (теги - одним запитом)"""
+        if self._fresh:
+            return
+        self._put_many([path for path in file_paths if path not in self._keys])
+
+    def regroup(self, file_path: str, info: dict):
+        """Переносить трек в іншу групу, якщо змінились його теги, O(1)"""
+        if self._fresh or file_path not in self._keys:
+            return
+        key = self._key_func(file_path, info)
+        if key != self._keys[file_path]:
+            self._discard(file_path)
+            self._put(file_path, key)
+            # Трек належав групі, що зараз грає - він прозвучить зі своєю новою групою
+            if file_path in self._pending:
+                self._pending.remove(file_path)
+
+    def reset(self, current: Optional[str] = None):
+        """
+        Починає новий прохід з групи поточного треку
+
+        Args:
+            current: Трек, що відтворюється зараз (його група дограє до кінця)
+        """
+        if self._fresh:
+            self._build()
+        self._engine.reset()
+        self._pending.clear()
+        self._current = None
+        if current is not None:
+            self.set_current(current)
+
+    def set_current(self, file_path: str):
+        """Фіксує трек, вибраний поза порядком: далі грає решта його групи"""
+        if self._fresh or file_path == self._current:
+            return
+        key = self._keys.get(file_path)
+        if key is None:
+            return
+        self._engine.set_current(key)
+        index = self._index_of(file_path)
+        self._pending = deque(track for track in self._members(key) if self._index_of(track) > index)
+        self._current = file_path
+
+    def next(self) -> Optional[str]:
+        """
+        Повертає наступний трек: з поточної групи або першим з нової
+
+        Returns:
+            Шлях треку або None, якщо треків немає
+        """
+        if self._fresh:
+            self._build()
+        while True:
+            while self._pending:
+                track = self._pending.popleft()
+                if self._contains(track):
+                    self._current = track
+                    return track
+            key = self._engine.next()
+            if key is None:
+                return None
+            self._pending = deque(self._members(key))
+
+    def get_group_count(self) -> int:
+        """Повертає кількість груп"""
+        if self._fresh:
+            self._build()
+        return len(self._groups)
+
+    def _build(self):
+        """Розкладає всі треки джерела по групах, O(n)"""
+        self._groups, self._keys = {}, {}
+        self._fresh = False
+        self._put_many(list(dict.fromkeys(self._source())))
+        # Пул груп перебудовується, вже відтворені групи проходу зберігаються
+        self._engine.invalidate()
+        logger.debug(f"Групи shuffle побудовано: {len(self._keys)} треків, {len(self._groups)} груп")
+
+    def _members(self, key: Hashable) -> List[str]:
+        """Існуючі треки групи в порядку плейлиста (видалені прибираються)"""
+        group = self._groups.get(key, {})
+        stale = [track for track in group if not self._contains(track)]
+        for track in stale:
+            self._discard(track)
+        return sorted(self._groups.get(key, {}), key=self._index_of)
+
+    def _put_many(self, file_paths: List[str]):
+        """Розкладає нові треки по групах"""
+        infos = self._get_infos(file_paths) if self._get_infos and file_paths else {}
+        for file_path in file_paths:
+            self._put(file_path, self._key_func(file_path, infos.get(file_path)))
+
+    def _put(self, file_path: str, key: Hashable):
+        self._keys[file_path] = key
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {}
+            self._engine.add(key)
+        group[file_path] = None
+
+    def _discard(self, file_path: str):
+        key = self._keys.pop(file_path)
+        group = self._groups[key]
+        del group[file_path]
+        if not group:
+            del self._groups[key]
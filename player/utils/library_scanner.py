@@ -0,0 +1,414 @@
+"""
+Сканування папок з аудіофайлами
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+import os
+import pickle
+import time
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac', '.wma', '.mp4'}
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+SNAPSHOT_FILE = CACHE_DIR / "library_snapshots.pkl"
+# Папки, змінені менше ніж за 2 с до сканування, перечитуються наступного разу
+# (mtime на деяких ФС має точність до секунди)
+RACY_WINDOW_NS = 2 * 1000 ** 3
+
+
+def is_audio_file(file_path: str, extensions: Set[str] = AUDIO_EXTENSIONS) -> bool:
+    """
+    Перевіряє розширення файлу
+
+    Args:
+        file_path: Шлях до файлу
+        extensions: Набір розширень (у нижньому регістрі, з крапкою)
+
+    Returns:
+        True якщо розширення підходить
+    """
+    return os.path.splitext(file_path)[1].lower() in extensions
+
+
+def scan_audio_files(paths: Iterable[str], extensions: Set[str] = AUDIO_EXTENSIONS,
+                     follow_symlinks: bool = False) -> Iterator[str]:
+    """
+    Рекурсивно знаходить аудіофайли за один прохід по файловій системі
+
+    Файли всередині папки повертаються за іменем, до вкладених папок.
+
+    Args:
+        paths: Файли та/або папки
+        extensions: Набір розширень (у нижньому регістрі, з крапкою)
+        follow_symlinks: Заходити в символічні посилання на папки
+            (цикли відслідковуються за (st_dev, st_ino))
+
+    Yields:
+        Шляхи до аудіофайлів
+    """
+    visited = set()
+
+    for path in paths:
+        if os.path.isfile(path):
+            if is_audio_file(path, extensions):
+                yield path
+            continue
+        if not os.path.isdir(path):
+            logger.warning(f"Шлях не знайдено: {path}")
+            continue
+
+        stack = [path]
+        while stack:
+            directory = stack.pop()
+            if follow_symlinks:
+                try:
+                    stat = os.stat(directory)
+                except OSError as e:
+                    logger.warning(f"Не вдалося прочитати папку {directory}: {e}")
+                    continue
+                key = (stat.st_dev, stat.st_ino)
+                if key in visited:
+                    logger.debug(f"Пропущено цикл символічних посилань: {directory}")
+                    continue
+                visited.add(key)
+
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.warning(f"Не вдалося прочитати папку {directory}: {e}")
+                continue
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and is_audio_file(entry.name, extensions):
+                        yield entry.path
+                except OSError as e:
+                    logger.debug(f"Помилка читання {entry.path}: {e}")
+
+            # Стек: перевертаємо, щоб папки обходились в алфавітному порядку
+            stack.extend(reversed(subdirs))
+
+
+class DirSnapshot(NamedTuple):
+    """Знімок папки: mtime/inode та її вміст"""
+    mtime_ns: int
+    inode: int
+    files: Dict[str, Tuple[int, int]]  # {ім'я: (size, mtime_ns)}
+    subdirs: Tuple[str, ...]  # Повні шляхи вкладених папок
+
+
+class ScanDelta(NamedTuple):
+    """Результат (пере)сканування"""
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+    renamed: List[Tuple[str, str]]  # (старий шлях, новий шлях)
+    dirs_listed: int  # Папки, вміст яких перечитано
+    dirs_skipped: int  # Незмінні папки (використано знімок)
+
+    def apply_to(self, file_paths: List[str]) -> List[str]:
+        """
+        Застосовує видалення та перейменування до списку шляхів
+
+        Args:
+            file_paths: Список шляхів (наприклад, збережений плейлист)
+
+        Returns:
+            Новий список зі збереженим порядком
+        """
+        renamed = dict(self.renamed)
+        removed = set(self.removed)
+        return [renamed.get(path, path) for path in file_paths if path not in removed]
+
+
+def _pair_renames(added: Dict[str, Tuple[int, int]],
+                  removed: Dict[str, Tuple[int, int]]) -> List[Tuple[str, str]]:
+    """
+    Зіставляє видалені та додані файли з однаковими розміром і mtime як перейменування
+
+    Знайдені пари вилучаються з added та removed.
+    """
+    candidates: Dict[Tuple[int, int], List[str]] = {}
+    for path, signature in removed.items():
+        candidates.setdefault(signature, []).append(path)
+    if not candidates:
+        return []
+
+    renamed = []
+    for path, signature in list(added.items()):
+        old_paths = candidates.get(signature)
+        if not old_paths:
+            continue
+        # Перевага файлу з тим самим ім'ям (переміщення папки)
+        name = os.path.basename(path)
+        old_path = next((p for p in old_paths if os.path.basename(p) == name), old_paths[0])
+        old_paths.remove(old_path)
+        del added[path]
+        del removed[old_path]
+        renamed.append((old_path, path))
+    return renamed
+
+
+class LibraryScanner:
+    """Інкрементальний сканер бібліотеки на основі знімків mtime папок"""
+
+    def __init__(self, snapshot_file: Path = None, extensions: Set[str] = AUDIO_EXTENSIONS):
+        """
+        Ініціалізує сканер
+
+        Args:
+            snapshot_file: Файл зі знімками (за замовчуванням cache/library_snapshots.pkl)
+            extensions: Набір розширень аудіофайлів
+        """
+        self._snapshot_file = Path(snapshot_file) if snapshot_file else SNAPSHOT_FILE
+        self._extensions = extensions
+        self._roots: List[str] = []
+        self._dirs: Dict[str, DirSnapshot] = {}
+        self._load()
+
+    def _load(self):
+        """Завантажує знімки з диска"""
+        try:
+            if self._snapshot_file.exists():
+                with open(self._snapshot_file, 'rb') as f:
+                    data = pickle.load(f)
+                self._roots = data.get('roots', [])
+                self._dirs = {path: DirSnapshot(*snapshot) for path, snapshot in data.get('dirs', {}).items()}
+                logger.debug(f"Знімки бібліотеки завантажено: {len(self._dirs)} папок")
+        except Exception as e:
+            logger.error(f"Помилка завантаження знімків бібліотеки: {e}", exc_info=True)
+            self._roots, self._dirs = [], {}
+
+    def save(self):
+        """Зберігає знімки на диск"""
+        try:
+            self._snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'roots': self._roots,
+                'dirs': {path: tuple(snapshot) for path, snapshot in self._dirs.items()}
+            }
+            with open(self._snapshot_file, 'wb') as f:
+                pickle.dump(data, f)
+        except Exception as e:
+            logger.error(f"Помилка збереження знімків бібліотеки: {e}", exc_info=True)
+
+    def get_roots(self) -> List[str]:
+        """Повертає список відсканованих кореневих папок"""
+        return list(self._roots)
+
+    def is_known(self, root: str) -> bool:
+        """Перевіряє чи папку вже було проскановано"""
+        return os.path.normpath(root) in self._dirs
+
+    def forget(self, root: str):
+        """
+        Видаляє папку та її знімки
+
+        Args:
+            root: Коренева папка
+        """
+        root = os.path.normpath(root)
+        if root in self._roots:
+            self._roots.remove(root)
+        self._drop_tree(root, {})
+        self.save()
+
+    def scan(self, root: str) -> ScanDelta:
+        """
+        Сканує папку: перший раз - повністю, далі - лише змінені папки
+
+        Вміст папки перечитується тільки якщо змінився її mtime або inode;
+        для файлів у перечитаних папках зміни визначаються за розміром та mtime.
+        Вкладені папки незмінної папки все одно перевіряються (одним stat).
+
+        Args:
+            root: Коренева папка
+
+        Returns:
+            ScanDelta з доданими, видаленими, зміненими та перейменованими файлами
+        """
+        root = os.path.normpath(root)
+        if root not in self._roots:
+            self._roots.append(root)
+
+        delta = self._scan([root], descend_known=True)
+        logger.info(f"Сканування {root}: +{len(delta.added)} -{len(delta.removed)} "
+                    f"~{len(delta.changed)} >{len(delta.renamed)} "
+                    f"(перечитано папок: {delta.dirs_listed}, без змін: {delta.dirs_skipped})")
+        return delta
+
+    def rescan_directories(self, directories: Iterable[str]) -> ScanDelta:
+        """
+        Перечитує лише вказані папки (наприклад, за подіями файлової системи)
+
+        Відомі вкладені папки не обходяться, нові - скануються повністю.
+
+        Args:
+            directories: Папки, про зміну яких відомо
+
+        Returns:
+            ScanDelta для цих папок
+        """
+        known = [os.path.normpath(d) for d in directories]
+        return self._scan([d for d in known if d in self._dirs], descend_known=False)
+
+    def get_directories(self, root: str) -> List[str]:
+        """
+        Повертає всі відомі папки дерева зі знімків
+
+        Args:
+            root: Коренева папка
+
+        Returns:
+            Список шляхів папок
+        """
+        result = []
+        stack = [os.path.normpath(root)]
+        while stack:
+            directory = stack.pop()
+            snapshot = self._dirs.get(directory)
+            if snapshot is None:
+                continue
+            result.append(directory)
+            stack.extend(snapshot.subdirs)
+        return result
+
+    def _scan(self, directories: List[str], descend_known: bool) -> ScanDelta:
+        """
+        Обходить папки, оновлює знімки та формує ScanDelta
+
+        Args:
+            directories: Стартові папки
+            descend_known: Обходити вже відомі вкладені папки (False - лише нові)
+        """
+        added: Dict[str, Tuple[int, int]] = {}
+        removed: Dict[str, Tuple[int, int]] = {}
+        changed = []
+        dirs_listed = dirs_skipped = 0
+        scan_start_ns = time.time_ns()
+        visited = set()
+
+        for start in directories:
+            stack = [start]
+            while stack:
+                directory = stack.pop()
+                snapshot = self._dirs.get(directory)
+                try:
+                    stat = os.stat(directory)
+                except OSError:
+                    # Папку видалено
+                    self._drop_tree(directory, removed)
+                    continue
+                if (stat.st_dev, stat.st_ino) in visited:
+                    continue
+                visited.add((stat.st_dev, stat.st_ino))
+
+                forced = not descend_known and directory == start
+                if (not forced and snapshot is not None and snapshot.mtime_ns == stat.st_mtime_ns
+                        and snapshot.inode == stat.st_ino):
+                    dirs_skipped += 1
+                    stack.extend(reversed(snapshot.subdirs))
+                    continue
+
+                listing = self._list_directory(directory)
+                if listing is None:
+                    continue
+                files, subdirs = listing
+                dirs_listed += 1
+
+                old_files = snapshot.files if snapshot is not None else {}
+                for name, signature in files.items():
+                    old_signature = old_files.get(name)
+                    if old_signature is None:
+                        added[os.path.join(directory, name)] = signature
+                    elif old_signature != signature:
+                        changed.append(os.path.join(directory, name))
+                for name in old_files.keys() - files.keys():
+                    removed[os.path.join(directory, name)] = old_files[name]
+                if snapshot is not None:
+                    for subdir in set(snapshot.subdirs) - set(subdirs):
+                        self._drop_tree(subdir, removed)
+
+                # Щойно змінені папки не довіряємо знімку (mtime з низькою точністю)
+                mtime_ns = stat.st_mtime_ns if scan_start_ns - stat.st_mtime_ns > RACY_WINDOW_NS else -1
+                self._dirs[directory] = DirSnapshot(mtime_ns, stat.st_ino, files, subdirs)
+                stack.extend(d for d in reversed(subdirs) if descend_known or d not in self._dirs)
+
+        renamed = _pair_renames(added, removed)
+        self.save()
+        return ScanDelta(list(added), list(removed), changed, renamed, dirs_listed, dirs_skipped)
+
+    def get_files(self, root: str) -> List[str]:
+        """
+        Повертає всі аудіофайли папки зі знімків (без звернення до диска)
+
+        Args:
+            root: Коренева папка (має бути проскановано через scan)
+
+        Returns:
+            Список шляхів у порядку обходу
+        """
+        result = []
+        stack = [os.path.normpath(root)]
+        while stack:
+            directory = stack.pop()
+            snapshot = self._dirs.get(directory)
+            if snapshot is None:
+                continue
+            result.extend(os.path.join(directory, name) for name in sorted(snapshot.files))
+            stack.extend(reversed(snapshot.subdirs))
+        return result
+
+    def get_total_size(self, root: str) -> int:
+        """
+        Повертає загальний розмір аудіофайлів папки зі знімків (байти)
+
+        Args:
+            root: Коренева папка (має бути проскановано через scan)
+        """
+        total = 0
+        for directory in self.get_directories(root):
+            snapshot = self._dirs.get(directory)
+            if snapshot is not None:
+                total += sum(size for size, _ in snapshot.files.values())
+        return total
+
+    def _list_directory(self, directory: str) -> Optional[Tuple[Dict[str, Tuple[int, int]], Tuple[str, ...]]]:
+        """Читає вміст папки: аудіофайли з підписами та вкладені папки"""
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and is_audio_file(entry.name, self._extensions):
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError as e:
+                        logger.debug(f"Помилка читання {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Не вдалося прочитати папку {directory}: {e}")
+            return None
+        return files, tuple(sorted(subdirs))
+
+    def _drop_tree(self, directory: str, removed: Dict[str, Tuple[int, int]]):
+        """Видаляє знімки папки та вкладених папок, додаючи їх файли до removed"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            snapshot = self._dirs.pop(current, None)
+            if snapshot is None:
+                continue
+            for name, signature in snapshot.files.items():
+                removed[os.path.join(current, name)] = signature
+            stack.extend(snapshot.subdirs)
@@ -0,0 +1,133 @@
+"""
+Відстеження змін у папках бібліотеки (QFileSystemWatcher)
+"""
+from typing import List, Set
+import os
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from .logger import get_logger
+from .library_scanner import LibraryScanner, ScanDelta
+
+logger = get_logger(__name__)
+
+DEBOUNCE_MS = 500  # Копіювання альбому дає десятки подій - обробляємо їх пакетом
+
+
+class LibraryWatcher(QObject):
+    """Стежить за папками бібліотеки та повідомляє про додані, видалені та переміщені файли"""
+
+    # ScanDelta з доданими, видаленими, зміненими та перейменованими файлами
+    library_changed = pyqtSignal(object)
+
+    def __init__(self, scanner: LibraryScanner, debounce_ms: int = DEBOUNCE_MS, parent: QObject = None):
+        """
+        Ініціалізує спостерігача
+
+        Args:
+            scanner: Інкрементальний сканер зі знімками папок
+            debounce_ms: Затримка перед обробкою пакета подій (мс)
+            parent: Батьківський об'єкт
+        """
+        super().__init__(parent)
+        self._scanner = scanner
+        self._folders: List[str] = []
+        self._pending: Set[str] = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.process_pending)
+
+    def watch_all(self) -> List[ScanDelta]:
+        """
+        Ставить під нагляд усі папки, відомі сканеру (при запуску програми)
+
+        Returns:
+            Список ScanDelta для кожної папки
+        """
+        return [self.watch(folder) for folder in self._scanner.get_roots()]
+
+    def watch(self, folder: str) -> ScanDelta:
+        """
+        Додає папку під нагляд, звіряючи її зі знімком (зміни поки програма була закрита)
+
+        Args:
+            folder: Коренева папка
+
+        Returns:
+            ScanDelta зі змінами з моменту попереднього сканування
+        """
+        folder = os.path.normpath(folder)
+        delta = self._scanner.scan(folder)
+        if folder not in self._folders:
+            self._folders.append(folder)
+        self._sync_watches()
+        return delta
+
+    def unwatch(self, folder: str):
+        """
+        Припиняє нагляд за папкою
+
+        Args:
+            folder: Коренева папка
+        """
+        folder = os.path.normpath(folder)
+        if folder in self._folders:
+            self._folders.remove(folder)
+            self._sync_watches()
+
+    def get_folders(self) -> List[str]:
+        """Повертає список папок під наглядом"""
+        return list(self._folders)
+
+    def stop(self):
+        """Зупиняє нагляд (події, що ще не оброблено, відкидаються)"""
+        self._timer.stop()
+        self._pending.clear()
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+
+    def _on_directory_changed(self, directory: str):
+        """Обробник зміни папки: відкладає пересканування"""
+        self._pending.add(directory)
+        self._timer.start()
+
+    def process_pending(self):
+        """Перечитує змінені папки та надсилає сигнал зі змінами"""
+        if not self._pending:
+            return
+        directories = sorted(self._pending)
+        self._pending.clear()
+
+        try:
+            delta = self._scanner.rescan_directories(directories)
+            self._sync_watches()
+        except Exception as e:
+            logger.error(f"Помилка обробки змін у бібліотеці: {e}", exc_info=True)
+            return
+
+        if delta.added or delta.removed or delta.changed or delta.renamed:
+            self.library_changed.emit(delta)
+        logger.debug(f"Зміни в бібліотеці: +{len(delta.added)} -{len(delta.removed)} "
+                     f"~{len(delta.changed)} >{len(delta.renamed)}")
+
+    def _sync_watches(self):
+        """Узгоджує список папок QFileSystemWatcher зі знімками сканера"""
+        wanted = set()
+        for folder in self._folders:
+            wanted.update(self._scanner.get_directories(folder))
+        current = set(self._watcher.directories())
+
+        stale = current - wanted
+        if stale:
+            self._watcher.removePaths(list(stale))
+        new = wanted - current
+        if new:
+            failed = self._watcher.addPaths(sorted(new))
+            if failed:
+                logger.warning(f"Не вдалося стежити за {len(failed)} папками (ліміт inotify?)")
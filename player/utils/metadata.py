@@ -0,0 +1,211 @@
+"""
+Утиліти для читання метаданих аудіофайлів
+"""
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from mutagen import File as MutagenFile
+from mutagen.id3 import ID3NoHeaderError
+
+from .logger import get_logger
+from .fast_tags import read_fast_tags
+
+logger = get_logger(__name__)
+
+DEFAULT_ARTIST = 'Невідомий виконавець'
+DEFAULT_ALBUM = 'Невідомий альбом'
+
+
+def default_track_tags(file_path: str) -> dict:
+    """
+    Повертає метадані за замовчуванням (без читання файлу)
+
+    Args:
+        file_path: Шлях до аудіофайлу
+
+    Returns:
+        Словник з метаданими
+    """
+    path = Path(file_path)
+    return {
+        'title': path.stem,
+        'artist': DEFAULT_ARTIST,
+        'album': DEFAULT_ALBUM,
+        'duration': 0,
+        'format': path.suffix[1:].upper(),
+        'file_path': file_path
+    }
+
+
+def read_track_tags(file_path: str, fast: bool = True) -> dict:
+    """
+    Читає теги та тривалість треку (без обкладинки)
+
+    Args:
+        file_path: Шлях до аудіофайлу
+        fast: Спершу читати лише заголовки (fast_tags), mutagen - тільки якщо потрібно
+
+    Returns:
+        Словник з метаданими
+    """
+    info = default_track_tags(file_path)
+
+    if fast:
+        tags = read_fast_tags(file_path)
+        if tags is not None:
+            info.update({key: value for key, value in tags.items() if value not in ('', None)})
+            return info
+
+    try:
+        audio_file = MutagenFile(file_path)
+        if audio_file is not None:
+            # Отримуємо тривалість
+            if hasattr(audio_file, 'info') and hasattr(audio_file.info, 'length'):
+                info['duration'] = int(audio_file.info.length * 1000)  # Конвертуємо в мс
+
+            # Отримуємо метадані
+            if 'TIT2' in audio_file or 'TITLE' in audio_file:
+                title = audio_file.get('TIT2', audio_file.get('TITLE', ['']))
+                if title:
+                    info['title'] = str(title[0])
+
+            if 'TPE1' in audio_file or 'ARTIST' in audio_file:
+                artist = audio_file.get('TPE1', audio_file.get('ARTIST', ['']))
+                if artist:
+                    info['artist'] = str(artist[0])
+
+            if 'TALB' in audio_file or 'ALBUM' in audio_file:
+                album = audio_file.get('TALB', audio_file.get('ALBUM', ['']))
+                if album:
+                    info['album'] = str(album[0])
+
+            if 'TCON' in audio_file or 'GENRE' in audio_file:
+                genre = audio_file.get('TCON', audio_file.get('GENRE', ['']))
+                if genre:
+                    info['genre'] = str(genre[0])
+    except (ID3NoHeaderError, Exception) as e:
+        # Якщо не вдалося прочитати метадані, використовуємо значення за замовчуванням
+        logger.debug(f"Помилка читання метаданих {file_path}: {e}")
+
+    return info
+
+
+def read_track_tags_batch(entries: List[Tuple[str, Optional[Tuple[int, int]]]]) -> list:
+    """
+    Читає теги для частини треків (виконується в окремому процесі)
+
+    Файли, підпис яких збігається з відомим з індексу, не перечитуються.
+
+    Args:
+        entries: Список кортежів (file_path, відомий підпис (mtime_ns, size) або None)
+
+    Returns:
+        Список кортежів (file_path, підпис або None, теги або None якщо запис актуальний)
+    """
+    from .metadata_index import get_file_signature
+
+    results = []
+    for file_path, known_signature in entries:
+        signature = get_file_signature(file_path)
+        if signature is None:
+            results.append((file_path, None, default_track_tags(file_path)))
+        elif signature == known_signature:
+            results.append((file_path, signature, None))
+        else:
+            results.append((file_path, signature, read_track_tags(file_path)))
+    return results
+
+
+def read_track_tags_many(index, file_paths: List[str], chunk_size: int = 256,
+                         max_workers: Optional[int] = None) -> Iterator[dict]:
+    """
+    Пакетно читає теги треків через індекс, розподіляючи читання файлів між процесами
+
+    Актуальні записи беруться з індексу, решта читаються пулом процесів
+    частинами по chunk_size і одразу зберігаються в індекс. Результати
+    повертаються по мірі готовності (порядок не гарантується).
+
+    Args:
+        index: MetadataIndex
+        file_paths: Список шляхів до аудіофайлів
+        chunk_size: Кількість файлів в одному завданні процесу
+        max_workers: Кількість процесів (None - за кількістю ядер)
+
+    Yields:
+        Словники з метаданими
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    import multiprocessing
+
+    file_paths = list(dict.fromkeys(file_paths))
+    known = index.get_many(file_paths)
+    entries = [(path, known[path][:2] if path in known else None) for path in file_paths]
+    chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+    def handle_results(results):
+        to_store = []
+        for file_path, signature, info in results:
+            if info is None:
+                # Запис в індексі актуальний
+                info = known[file_path][2]
+            elif signature is not None:
+                to_store.append((file_path, signature[0], signature[1], info))
+            yield info
+        index.put_many(to_store)
+
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            yield from handle_results(read_track_tags_batch(chunk))
+        return
+
+    processed = set()
+    try:
+        # spawn - безпечно для процесу з активними потоками Qt та сумісно з Windows
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = {executor.submit(read_track_tags_batch, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                results = future.result()
+                processed.add(futures[future])
+                yield from handle_results(results)
+    except Exception as e:
+        logger.error(f"Помилка пакетного читання метаданих: {e}", exc_info=True)
+        # Дочитуємо решту в поточному процесі
+        for i, chunk in enumerate(chunks):
+            if i not in processed:
+                yield from handle_results(read_track_tags_batch(chunk))
+
+
+class TrackInfo(dict):
+    """Словник метаданих треку з лінивим завантаженням обкладинки"""
+
+    def __init__(self, tags: dict, artwork_loader=None):
+        """
+        Args:
+            tags: Словник з тегами треку
+            artwork_loader: Функція без аргументів, що повертає обкладинку
+        """
+        super().__init__(tags)
+        super().__setitem__('artwork', None)
+        self._artwork_loader = artwork_loader
+
+    def _resolve_artwork(self):
+        """Завантажує обкладинку при першому зверненні"""
+        if self._artwork_loader is not None:
+            loader = self._artwork_loader
+            self._artwork_loader = None
+            super().__setitem__('artwork', loader())
+
+    def __getitem__(self, key):
+        if key == 'artwork':
+            self._resolve_artwork()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == 'artwork':
+            self._resolve_artwork()
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        if key == 'artwork':
+            self._artwork_loader = None
+        super().__setitem__(key, value)
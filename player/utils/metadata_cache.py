@@ -0,0 +1,140 @@
+"""
+Обмежений LRU-кеш метаданих треків у пам'яті
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import sys
+import threading
+import time
+
+from .logger import get_logger
+from .metadata_index import get_file_signature
+
+logger = get_logger(__name__)
+
+
+def _estimate_size(info: dict) -> int:
+    """Оцінює розмір запису в пам'яті (байти)"""
+    size = sys.getsizeof(info)
+    for key, value in info.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+class TrackTagsCache:
+    """LRU-кеш тегів з перевіркою актуальності за mtime та лічильниками"""
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 8 * 1024 * 1024,
+                 revalidate_interval: float = 30.0):
+        """
+        Ініціалізує кеш
+
+        Args:
+            max_entries: Максимальна кількість записів
+            max_bytes: Максимальний орієнтовний розмір кешу в байтах
+            revalidate_interval: Як часто (секунди) перевіряти mtime файлу при влучанні
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._revalidate_interval = revalidate_interval
+        # {file_path: (signature, info, size, checked_at)}
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, file_path: str) -> Optional[dict]:
+        """
+        Повертає теги з кешу
+
+        Запис перевіряється за mtime/розміром файлу не частіше ніж раз на
+        revalidate_interval, тож повторні звернення не торкаються диска.
+
+        Args:
+            file_path: Шлях до аудіофайлу
+
+        Returns:
+            Словник з метаданими або None (промах)
+        """
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None:
+                self._misses += 1
+                return None
+            signature, info, size, checked_at = entry
+
+        now = time.monotonic()
+        if now - checked_at >= self._revalidate_interval:
+            current_signature = get_file_signature(file_path)
+            with self._lock:
+                if current_signature != signature:
+                    self._remove_entry(file_path)
+                    self._misses += 1
+                    return None
+                if file_path in self._entries:
+                    self._entries[file_path] = (signature, info, size, now)
+
+        with self._lock:
+            if file_path in self._entries:
+                self._entries.move_to_end(file_path)
+            self._hits += 1
+        return info
+
+    def put(self, file_path: str, signature: Optional[Tuple[int, int]], info: dict):
+        """
+        Додає теги в кеш
+
+        Args:
+            file_path: Шлях до аудіофайлу
+            signature: Підпис файлу (mtime_ns, size) на момент читання
+            info: Словник з метаданими
+        """
+        size = _estimate_size(info)
+        with self._lock:
+            self._remove_entry(file_path)
+            self._entries[file_path] = (signature, info, size, time.monotonic())
+            self._bytes += size
+            while self._entries and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove_entry(oldest)
+                self._evictions += 1
+
+    def invalidate(self, file_path: str):
+        """
+        Видаляє запис з кешу
+
+        Args:
+            file_path: Шлях до аудіофайлу
+        """
+        with self._lock:
+            self._remove_entry(file_path)
+
+    def clear(self):
+        """Очищає кеш (лічильники зберігаються)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """
+        Повертає статистику кешу
+
+        Returns:
+            Словник з hits, misses, evictions, entries, bytes
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def _remove_entry(self, file_path: str):
+        """Видаляє запис (викликається під self._lock)"""
+        entry = self._entries.pop(file_path, None)
+        if entry is not None:
+            self._bytes -= entry[2]
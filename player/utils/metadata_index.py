@@ -0,0 +1,428 @@
+"""
+Персистентний індекс метаданих треків (SQLite)
+"""
+from pathlib import Path
+from typing import Optional, Iterable, Tuple, List, Dict
+import os
+import sqlite3
+import threading
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+INDEX_FILE = CACHE_DIR / "metadata_index.db"
+SCHEMA_VERSION = 2
+QUERY_CHUNK_SIZE = 500  # Не більше ніж ліміт параметрів SQLite (999)
+
+TAG_FIELDS = ('title', 'artist', 'album', 'duration', 'format', 'genre')
+
+# Агрегати для перегляду бібліотеки (виконавці, альбоми, жанри) підтримуються
+# тригерами при кожній зміні tracks, тож їх не треба перераховувати при читанні
+_FACET_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS artists (
+        artist TEXT PRIMARY KEY,
+        track_count INTEGER NOT NULL,
+        total_duration INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS albums (
+        artist TEXT NOT NULL,
+        album TEXT NOT NULL,
+        track_count INTEGER NOT NULL,
+        total_duration INTEGER NOT NULL,
+        PRIMARY KEY (artist, album)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS genres (
+        genre TEXT PRIMARY KEY,
+        track_count INTEGER NOT NULL,
+        total_duration INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS tracks_artist_album ON tracks (artist, album)",
+    "CREATE INDEX IF NOT EXISTS tracks_genre ON tracks (genre)",
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_facets_insert AFTER INSERT ON tracks BEGIN
+        INSERT INTO artists VALUES (COALESCE(NEW.artist, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (artist) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+        INSERT INTO albums VALUES (COALESCE(NEW.artist, ''), COALESCE(NEW.album, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (artist, album) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+        INSERT INTO genres VALUES (COALESCE(NEW.genre, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (genre) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_facets_delete AFTER DELETE ON tracks BEGIN
+        UPDATE artists SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE artist = COALESCE(OLD.artist, '');
+        DELETE FROM artists WHERE artist = COALESCE(OLD.artist, '') AND track_count <= 0;
+        UPDATE albums SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE artist = COALESCE(OLD.artist, '') AND album = COALESCE(OLD.album, '');
+        DELETE FROM albums WHERE artist = COALESCE(OLD.artist, '') AND album = COALESCE(OLD.album, '')
+            AND track_count <= 0;
+        UPDATE genres SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE genre = COALESCE(OLD.genre, '');
+        DELETE FROM genres WHERE genre = COALESCE(OLD.genre, '') AND track_count <= 0;
+    END
+    """,
+    # Оновлення = видалення старих значень + додавання нових
+    """
+    CREATE TRIGGER IF NOT EXISTS tracks_facets_update AFTER UPDATE OF artist, album, genre, duration ON tracks BEGIN
+        UPDATE artists SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE artist = COALESCE(OLD.artist, '');
+        DELETE FROM artists WHERE artist = COALESCE(OLD.artist, '') AND track_count <= 0;
+        UPDATE albums SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE artist = COALESCE(OLD.artist, '') AND album = COALESCE(OLD.album, '');
+        DELETE FROM albums WHERE artist = COALESCE(OLD.artist, '') AND album = COALESCE(OLD.album, '')
+            AND track_count <= 0;
+        UPDATE genres SET track_count = track_count - 1,
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+            WHERE genre = COALESCE(OLD.genre, '');
+        DELETE FROM genres WHERE genre = COALESCE(OLD.genre, '') AND track_count <= 0;
+        INSERT INTO artists VALUES (COALESCE(NEW.artist, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (artist) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+        INSERT INTO albums VALUES (COALESCE(NEW.artist, ''), COALESCE(NEW.album, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (artist, album) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+        INSERT INTO genres VALUES (COALESCE(NEW.genre, ''), 1, COALESCE(NEW.duration, 0))
+            ON CONFLICT (genre) DO UPDATE SET track_count = track_count + 1,
+                total_duration = total_duration + excluded.total_duration;
+    END
+    """,
+)
+
+
+def get_file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Повертає підпис файлу для перевірки актуальності індексу
+
+    Args:
+        file_path: Шлях до файлу
+
+    Returns:
+        Кортеж (mtime_ns, size) або None якщо файл недоступний
+    """
+    try:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+class MetadataIndex:
+    """Індекс метаданих на диску з ключем шлях + mtime + розмір"""
+
+    def __init__(self, db_path: Path = None):
+        """
+        Ініціалізує індекс
+
+        Args:
+            db_path: Шлях до файлу бази (за замовчуванням cache/metadata_index.db)
+        """
+        self._db_path = Path(db_path) if db_path else INDEX_FILE
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open()
+
+    def _open(self):
+        """Відкриває базу та створює схему"""
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Індекс використовується також з фонових потоків (доступ під self._lock)
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Індекс - це кеш, тому при зміні схеми просто перебудовуємо його
+                for table in ('tracks', 'artists', 'albums', 'genres'):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tracks (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    title TEXT,
+                    artist TEXT,
+                    album TEXT,
+                    duration INTEGER,
+                    format TEXT,
+                    genre TEXT
+                )
+            """)
+            for statement in _FACET_SCHEMA:
+                self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.commit()
+            logger.debug(f"Індекс метаданих відкрито: {self._db_path}")
+        except Exception as e:
+            logger.error(f"Помилка відкриття індексу метаданих: {e}", exc_info=True)
+            self._conn = None
+
+    def get(self, file_path: str, mtime_ns: int, size: int) -> Optional[dict]:
+        """
+        Повертає метадані з індексу, якщо запис актуальний
+
+        Args:
+            file_path: Шлях до аудіофайлу
+            mtime_ns: Час модифікації файлу (нс)
+            size: Розмір файлу (байти)
+
+        Returns:
+            Словник з метаданими або None якщо запису немає чи він застарів
+        """
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, title, artist, album, duration, format, genre "
+                    "FROM tracks WHERE path = ?",
+                    (file_path,)
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"Помилка читання індексу метаданих: {e}", exc_info=True)
+            return None
+
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+
+        info = dict(zip(TAG_FIELDS, row[2:]))
+        info['file_path'] = file_path
+        return info
+
+    def get_many(self, file_paths: List[str]) -> Dict[str, Tuple[int, int, dict]]:
+        """
+        Повертає записи індексу для кількох треків (без перевірки актуальності)
+
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+
+        Returns:
+            Словник {file_path: (mtime_ns, size, info)} лише для наявних записів
+        """
+        result = {}
+        if self._conn is None:
+            return result
+        try:
+            with self._lock:
+                for start in range(0, len(file_paths), QUERY_CHUNK_SIZE):
+                    chunk = file_paths[start:start + QUERY_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = self._conn.execute(
+                        "SELECT path, mtime_ns, size, title, artist, album, duration, format, genre "
+                        f"FROM tracks WHERE path IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for row in rows:
+                        info = dict(zip(TAG_FIELDS, row[3:]))
+                        info['file_path'] = row[0]
+                        result[row[0]] = (row[1], row[2], info)
+        except Exception as e:
+            logger.error(f"Помилка читання індексу метаданих: {e}", exc_info=True)
+        return result
+
+    def put(self, file_path: str, mtime_ns: int, size: int, info: dict):
+        """
+        Зберігає метадані треку в індекс
+
+        Args:
+            file_path: Шлях до аудіофайлу
+            mtime_ns: Час модифікації файлу (нс)
+            size: Розмір файлу (байти)
+            info: Словник з метаданими
+        """
+        self.put_many([(file_path, mtime_ns, size, info)])
+
+    def put_many(self, entries: Iterable[Tuple[str, int, int, dict]]):
+        """
+        Зберігає метадані кількох треків однією транзакцією
+
+        Args:
+            entries: Ітерабельне з кортежів (file_path, mtime_ns, size, info)
+        """
+        if self._conn is None:
+            return
+        rows = [
+            (path, mtime_ns, size) + tuple(info.get(field) for field in TAG_FIELDS)
+            for path, mtime_ns, size, info in entries
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                # UPSERT замість INSERT OR REPLACE: REPLACE не викликає тригер
+                # видалення, і агрегати порахували б старий запис двічі
+                self._conn.executemany(
+                    "INSERT INTO tracks "
+                    "(path, mtime_ns, size, title, artist, album, duration, format, genre) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns, "
+                    "size = excluded.size, title = excluded.title, artist = excluded.artist, "
+                    "album = excluded.album, duration = excluded.duration, "
+                    "format = excluded.format, genre = excluded.genre",
+                    rows
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.error(f"Помилка запису в індекс метаданих: {e}", exc_info=True)
+
+    def remove(self, file_path: str):
+        """
+        Видаляє запис з індексу
+
+        Args:
+            file_path: Шлях до аудіофайлу
+        """
+        self.remove_many([file_path])
+
+    def remove_many(self, file_paths: Iterable[str]):
+        """
+        Видаляє кілька записів однією транзакцією
+
+        Args:
+            file_paths: Шляхи до аудіофайлів
+        """
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany("DELETE FROM tracks WHERE path = ?",
+                                       ((path,) for path in file_paths))
+                self._conn.commit()
+        except Exception as e:
+            logger.error(f"Помилка видалення з індексу метаданих: {e}", exc_info=True)
+
+    def rename(self, old_path: str, new_path: str):
+        """
+        Переносить запис на новий шлях (файл переміщено без змін)
+
+        Args:
+            old_path: Старий шлях
+            new_path: Новий шлях
+        """
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM tracks WHERE path = ?", (new_path,))
+                self._conn.execute("UPDATE tracks SET path = ? WHERE path = ?", (new_path, old_path))
+                self._conn.commit()
+        except Exception as e:
+            logger.error(f"Помилка перейменування в індексі метаданих: {e}", exc_info=True)
+
+    def get_count(self) -> int:
+        """Повертає кількість записів в індексі"""
+        if self._conn is None:
+            return 0
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Помилка читання індексу метаданих: {e}", exc_info=True)
+            return 0
+
+    def get_artists(self) -> List[Tuple[str, int, int]]:
+        """
+        Повертає виконавців з готовими агрегатами
+
+        Returns:
+            Список кортежів (виконавець, кількість треків, загальна тривалість мс)
+        """
+        return self._query_facet(
+            "SELECT artist, track_count, total_duration FROM artists ORDER BY artist COLLATE NOCASE")
+
+    def get_albums(self, artist: str) -> List[Tuple[str, int, int]]:
+        """
+        Повертає альбоми виконавця з готовими агрегатами
+
+        Args:
+            artist: Виконавець
+
+        Returns:
+            Список кортежів (альбом, кількість треків, загальна тривалість мс)
+        """
+        return self._query_facet(
+            "SELECT album, track_count, total_duration FROM albums WHERE artist = ? "
+            "ORDER BY album COLLATE NOCASE",
+            (artist,))
+
+    def get_genres(self) -> List[Tuple[str, int, int]]:
+        """
+        Повертає жанри з готовими агрегатами
+
+        Returns:
+            Список кортежів (жанр, кількість треків, загальна тривалість мс)
+        """
+        return self._query_facet(
+            "SELECT genre, track_count, total_duration FROM genres ORDER BY genre COLLATE NOCASE")
+
+    def get_facet_tracks(self, artist: Optional[str] = None, album: Optional[str] = None,
+                         genre: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        Повертає треки вибраної групи (за індексами tracks_artist_album / tracks_genre)
+
+        Args:
+            artist: Виконавець (None - будь-який)
+            album: Альбом (None - будь-який)
+            genre: Жанр (None - будь-який)
+
+        Returns:
+            Список кортежів (шлях, назва, тривалість мс), впорядкований за альбомом та шляхом
+        """
+        conditions = []
+        params = []
+        for column, value in (('artist', artist), ('album', album), ('genre', genre)):
+            if value is not None:
+                conditions.append(f"COALESCE({column}, '') = ?" if not value else f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return self._query_facet(
+            f"SELECT path, title, COALESCE(duration, 0) FROM tracks {where}"
+            "ORDER BY artist COLLATE NOCASE, album COLLATE NOCASE, path",
+            params)
+
+    def _query_facet(self, sql: str, params: Iterable = ()) -> list:
+        """Виконує запит перегляду бібліотеки"""
+        if self._conn is None:
+            return []
+        try:
+            with self._lock:
+                return self._conn.execute(sql, tuple(params)).fetchall()
+        except Exception as e:
+            logger.error(f"Помилка читання індексу метаданих: {e}", exc_info=True)
+            return []
+
+    def clear(self):
+        """Очищає індекс"""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM tracks")
+                self._conn.commit()
+            logger.info("Індекс метаданих очищено")
+        except Exception as e:
+            logger.error(f"Помилка очищення індексу метаданих: {e}", exc_info=True)
+
+    def close(self):
+        """Закриває з'єднання з базою"""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,86 @@
+"""
+Фонове попереднє читання метаданих треків
+"""
+from typing import Callable, List
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64  # Кількість треків в одному завданні пулу
+
+
+class _PrefetchTask(QRunnable):
+    """Завдання пулу: читає теги для частини треків"""
+
+    def __init__(self, prefetcher: 'MetadataPrefetcher', file_paths: List[str], generation: int):
+        super().__init__()
+        self._prefetcher = prefetcher
+        self._file_paths = file_paths
+        self._generation = generation
+
+    def run(self):
+        for file_path in self._file_paths:
+            # Завдання застаріло (плейлист очищено або prefetch скасовано)
+            if self._prefetcher._generation != self._generation:
+                return
+            try:
+                info = self._prefetcher._loader(file_path)
+            except Exception as e:
+                logger.debug(f"Помилка фонового читання метаданих {file_path}: {e}")
+                continue
+            self._prefetcher.track_tags_ready.emit(file_path, info)
+
+
+class MetadataPrefetcher(QObject):
+    """Пул потоків для фонового читання тегів нових треків"""
+
+    # Сигнал надходить у потоці отримувача (queued connection для UI)
+    track_tags_ready = pyqtSignal(str, dict)  # Шлях, теги
+
+    def __init__(self, loader: Callable[[str], dict], max_threads: int = 2):
+        """
+        Ініціалізує пул
+
+        Args:
+            loader: Функція, що повертає теги треку за шляхом
+            max_threads: Максимальна кількість робочих потоків
+        """
+        super().__init__()
+        self._loader = loader
+        self._generation = 0
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
+
+    def prefetch(self, file_paths: List[str]):
+        """
+        Ставить треки в чергу фонового читання та одразу повертає керування
+
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        if not file_paths:
+            return
+        for start in range(0, len(file_paths), CHUNK_SIZE):
+            chunk = list(file_paths[start:start + CHUNK_SIZE])
+            self._pool.start(_PrefetchTask(self, chunk, self._generation))
+        logger.debug(f"Фонове читання метаданих заплановано: {len(file_paths)} треків")
+
+    def cancel(self):
+        """Скасовує всі заплановані завдання"""
+        self._generation += 1
+        self._pool.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Чекає завершення активних завдань
+
+        Args:
+            msecs: Таймаут в мілісекундах (-1 - без обмеження)
+
+        Returns:
+            True якщо всі завдання завершено
+        """
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,108 @@
+"""
+Історія переходів між треками для кроків назад та вперед
+"""
+from collections import deque
+from typing import Callable, Hashable, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SIZE = 500  # Максимальна кількість записів (найстаріші відкидаються)
+
+
+class NavigationHistory:
+    """
+    Обмежений кільцевий буфер відтворених треків з курсором
+
+    Крок назад чи вперед лише зсуває курсор, тож не залежить від режиму,
+    яким трек було вибрано (послідовно, shuffle, черга чи користувачем).
+    Треки, яких уже немає, пропускаються (перевіряє функція contains).
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SIZE,
+                 contains: Optional[Callable[[Hashable], bool]] = None):
+        """
+        Args:
+            max_size: Максимальна кількість записів
+            contains: Перевіряє, чи трек ще існує (None - завжди так)
+        """
+        self._entries = deque(maxlen=max_size)
+        self._cursor = -1  # Позиція поточного треку в _entries
+        self._contains = contains or (lambda item: True)
+
+    def push(self, item: Hashable):
+        """
+        Записує трек, що почав відтворюватись
+
+        Якщо трек збігається з наступним записом (після кроку назад),
+        курсор просто зсувається; інакше записи попереду відкидаються.
+        """
+        if self._cursor >= 0 and self._entries[self._cursor] == item:
+            return
+        if self._cursor + 1 < len(self._entries) and self._entries[self._cursor + 1] == item:
+            self._cursor += 1
+            return
+        while len(self._entries) > self._cursor + 1:
+            self._entries.pop()
+        self._entries.append(item)
+        self._cursor = len(self._entries) - 1
+
+    def push_back(self, item: Hashable):
+        """
+        Записує трек перед поточним і робить його поточним
+
+        Для кроку назад за порядком плейлиста, коли історія вичерпана:
+        поточний трек лишається попереду, тож наступний крок назад
+        продовжує рух назад, а не повертає до нього.
+        """
+        if self._cursor < 0:
+            self.push(item)
+            return
+        if len(self._entries) == self._entries.maxlen:
+            # Відкидається найстаріший запис, а якщо поточний і є найстарішим - останній
+            if self._cursor > 0:
+                self._entries.popleft()
+                self._cursor -= 1
+            else:
+                self._entries.pop()
+        self._entries.insert(self._cursor, item)
+
+    def back(self) -> Optional[Hashable]:
+        """
+        Крок назад
+
+        Returns:
+            Попередній існуючий трек або None (курсор не змінюється)
+        """
+        return self._step(-1)
+
+    def forward(self) -> Optional[Hashable]:
+        """
+        Крок вперед (лише після кроків назад)
+
+        Returns:
+            Наступний існуючий трек або None (курсор не змінюється)
+        """
+        return self._step(1)
+
+    def current(self) -> Optional[Hashable]:
+        """Повертає поточний трек або None"""
+        return self._entries[self._cursor] if self._cursor >= 0 else None
+
+    def clear(self):
+        """Очищає історію"""
+        self._entries.clear()
+        self._cursor = -1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _step(self, direction: int) -> Optional[Hashable]:
+        cursor = self._cursor + direction
+        while 0 <= cursor < len(self._entries):
+            if self._contains(self._entries[cursor]):
+                self._cursor = cursor
+                return self._entries[cursor]
+            cursor += direction
+        return None
@@ -44,12 +44,13 @@ def save_m3u_playlist(file_path: str, tracks: List[str]) -> bool:
         return False
 
 
-def load_m3u_playlist(file_path: str) -> List[str]:
+def load_m3u_playlist(file_path: str, validate: bool = True) -> List[str]:
     """
     Завантажує плейлист з M3U файлу
     
     Args:
         file_path: Шлях до M3U файлу
+        validate: Відкидати відсутні файли (False - без звернень до диска)
         
     Returns:
         Список шляхів до треків
@@ -87,7 +88,7 @@ def load_m3u_playlist(file_path: str) -> List[str]:
                             track_path = track_line
                         
                         # Перевіряємо чи файл існує
-                        if Path(track_path).exists():
+                        if not validate or Path(track_path).exists():
                             tracks.append(track_path)
                         else:
                             logger.warning(f"Файл не знайдено: {track_path}")
@@ -133,12 +134,13 @@ def save_json_playlist(file_path: str, tracks: List[str], metadata: dict = None)
         return False
 
 
-def load_json_playlist(file_path: str) -> tuple[List[str], dict]:
+def load_json_playlist(file_path: str, validate: bool = True) -> tuple[List[str], dict]:
     """
     Завантажує плейлист з JSON файлу
     
     Args:
         file_path: Шлях до JSON файлу
+        validate: Відкидати відсутні файли (False - без звернень до диска)
         
     Returns:
         Кортеж (список треків, метадані)
@@ -153,7 +155,7 @@ def load_json_playlist(file_path: str) -> tuple[List[str], dict]:
         metadata = data.get('metadata', {})
         
         # Фільтруємо тільки існуючі файли
-        valid_tracks = [t for t in tracks if Path(t).exists()]
+        valid_tracks = [t for t in tracks if not validate or Path(t).exists()]
         if len(valid_tracks) < len(tracks):
             logger.warning(f"Деякі файли з плейлисту не знайдено: {len(tracks) - len(valid_tracks)}")
         
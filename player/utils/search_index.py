@@ -0,0 +1,356 @@
+"""
+Інвертований індекс для пошуку треків (токени + триграми)
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import re
+import threading
+import unicodedata
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Транслітерація кирилиці (українська національна + російські літери)
+_TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie',
+    'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l',
+    'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ь': '',
+    'ю': 'iu', 'я': 'ia', 'ё': 'e', 'ы': 'y', 'э': 'e', 'ъ': '',
+})
+
+# Оцінки збігу слова запиту з токеном
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.9
+SCORE_SUBSTRING = 0.8
+SCORE_TYPO = (0.6, 0.4)  # 1 та 2 помилки
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Розбиває текст на нормалізовані токени
+
+    Args:
+        text: Довільний текст
+
+    Returns:
+        Список токенів у нижньому регістрі
+    """
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+
+def normalize(token: str) -> str:
+    """
+    Нормалізує токен для пошуку: нижній регістр, транслітерація, без діакритики
+
+    Args:
+        token: Токен (результат tokenize)
+
+    Returns:
+        Ключ для індексу, наприклад "Ельзи" -> "elzy", "Beyoncé" -> "beyonce"
+    """
+    token = token.casefold().translate(_TRANSLIT)
+    if token.isascii():
+        return token
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', token) if not unicodedata.combining(ch))
+
+
+def _index_tokens(text: str) -> List[str]:
+    """Повертає нормалізовані токени тексту"""
+    return [key for key in map(normalize, tokenize(text)) if key]
+
+
+def _max_typos(term: str) -> int:
+    """Допустима кількість помилок для слова запиту"""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Відстань Дамерау-Левенштейна (з перестановками сусідніх літер) з раннім виходом
+
+    Returns:
+        Відстань або max_distance + 1, якщо її перевищено
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _trigrams(token: str) -> Set[str]:
+    """Повертає множину триграм токена"""
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """
+    Інвертований індекс: токен -> документи, триграма -> токени словника
+
+    Триграми будуються по словнику (а не по документах), тож пам'ять
+    залежить від кількості різних слів, а не від розміру бібліотеки.
+    Запит з кількох слів повертає документи, що містять усі слова як
+    підрядки токенів; слова з 1-2 символів шукаються як префікси.
+    Токени зберігаються нормалізованими (див. normalize), тож запит
+    кирилицею чи латиницею, з діакритикою чи без дає той самий результат.
+
+    Методи потокобезпечні: пошук може виконуватись у фоновому потоці.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        """Скидає вміст індексу"""
+        self._ids: Dict[str, int] = {}  # {ключ: id документа}
+        self._keys: Dict[int, str] = {}  # {id документа: ключ}
+        self._fields: Dict[int, Tuple[str, ...]] = {}  # Поля документа (для оновлення/видалення)
+        self._postings: Dict[str, Set[int]] = {}  # {токен: {id документа}}
+        self._trigram_tokens: Dict[str, Set[str]] = {}  # {триграма: {токен}}
+        self._vocabulary: List[str] = []  # Відсортований словник для пошуку за префіксом
+        self._vocabulary_stale = False  # Словник пересортовується лише при потребі
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._ids
+
+    def add(self, key: str, fields: Iterable[str]):
+        """
+        Додає або оновлює документ
+
+        Args:
+            key: Ключ документа (шлях до треку)
+            fields: Текстові поля (назва, виконавець, альбом, ім'я файлу)
+        """
+        fields = tuple(field or '' for field in fields)
+        with self._lock:
+            doc_id = self._ids.get(key)
+            if doc_id is not None:
+                if self._fields[doc_id] == fields:
+                    return
+                self._unindex(doc_id)
+            else:
+                doc_id = self._next_id
+                self._next_id += 1
+                self._ids[key] = doc_id
+                self._keys[doc_id] = key
+
+            self._fields[doc_id] = fields
+            for token in self._tokens(fields):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    self._add_token(token)
+                postings.add(doc_id)
+
+    def remove(self, key: str):
+        """
+        Видаляє документ
+
+        Args:
+            key: Ключ документа
+        """
+        with self._lock:
+            doc_id = self._ids.pop(key, None)
+            if doc_id is None:
+                return
+            self._unindex(doc_id)
+            del self._keys[doc_id]
+            del self._fields[doc_id]
+
+    def clear(self):
+        """Очищає індекс"""
+        with self._lock:
+            self._reset()
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Шукає документи, що містять усі слова запиту
+
+        Args:
+            query: Рядок запиту
+            limit: Максимальна кількість результатів
+
+        Returns:
+            Ключі знайдених документів (у порядку додавання)
+        """
+        terms = sorted(set(_index_tokens(query)), key=len, reverse=True)
+        if not terms:
+            return []
+
+        with self._lock:
+            result: Optional[Set[int]] = None
+            # Довші слова більш вибіркові - починаємо з них
+            for term in terms:
+                docs = self._match_term(term)
+                result = docs if result is None else result & docs
+                if not result:
+                    return []
+
+            doc_ids = sorted(result)
+            if limit is not None:
+                doc_ids = doc_ids[:limit]
+            return [self._keys[doc_id] for doc_id in doc_ids]
+
+    def rank(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Шукає з урахуванням помилок та сортує за релевантністю
+
+        Кожне слово запиту має збігтися з якимось токеном документа: точно,
+        як префікс, як підрядок або з 1-2 помилками (залежно від довжини
+        слова). Оцінка документа - сума найкращих оцінок по словах.
+
+        Args:
+            query: Рядок запиту, наприклад "beatls abey"
+            limit: Максимальна кількість результатів
+
+        Returns:
+            Ключі документів від найрелевантніших (при рівності - у порядку додавання)
+        """
+        terms = sorted(set(_index_tokens(query)), key=len, reverse=True)
+        if not terms:
+            return []
+
+        with self._lock:
+            scores: Optional[Dict[int, float]] = None
+            for term in terms:
+                term_scores: Dict[int, float] = {}
+                for token, score in self._score_tokens(term).items():
+                    for doc_id in self._postings[token]:
+                        if score > term_scores.get(doc_id, 0.0):
+                            term_scores[doc_id] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc_id: score + term_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in term_scores}
+                if not scores:
+                    return []
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            if limit is not None:
+                ranked = ranked[:limit]
+            return [self._keys[doc_id] for doc_id, _ in ranked]
+
+    def _score_tokens(self, term: str) -> Dict[str, float]:
+        """Повертає токени словника, що відповідають слову запиту, з оцінками"""
+        scores = {}
+        for token in self._match_tokens(term):
+            if token == term:
+                scores[token] = SCORE_EXACT
+            elif token.startswith(term):
+                scores[token] = SCORE_PREFIX
+            else:
+                scores[token] = SCORE_SUBSTRING
+
+        max_typos = _max_typos(term)
+        if max_typos:
+            for token in self._typo_candidates(term, max_typos):
+                if token in scores:
+                    continue
+                distance = _edit_distance(term, token, max_typos)
+                if distance <= max_typos:
+                    scores[token] = SCORE_TYPO[distance - 1]
+        return scores
+
+    def _typo_candidates(self, term: str, max_typos: int) -> Iterable[str]:
+        """Відбирає токени близької довжини зі спільними триграмами"""
+        trigrams = _trigrams(term)
+        # Кожна помилка псує не більше трьох триграм
+        min_shared = max(1, len(trigrams) - 3 * max_typos)
+        shared: Dict[str, int] = {}
+        for trigram in trigrams:
+            for token in self._trigram_tokens.get(trigram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        return [token for token, count in shared.items()
+                if count >= min_shared and abs(len(token) - len(term)) <= max_typos]
+
+    def _match_term(self, term: str) -> Set[int]:
+        """Повертає документи з токенами, що містять term"""
+        docs: Set[int] = set()
+        for token in self._match_tokens(term):
+            docs |= self._postings[token]
+        return docs
+
+    def _match_tokens(self, term: str) -> Iterable[str]:
+        """Повертає токени словника, що відповідають слову запиту"""
+        if len(term) < 3:
+            # Короткі слова - префіксний пошук по відсортованому словнику
+            if self._vocabulary_stale:
+                self._vocabulary = sorted(self._postings)
+                self._vocabulary_stale = False
+            start = bisect_left(self._vocabulary, term)
+            for token in self._vocabulary[start:]:
+                if not token.startswith(term):
+                    break
+                yield token
+            return
+
+        candidates: Optional[Set[str]] = None
+        for trigram in sorted(_trigrams(term), key=lambda t: len(self._trigram_tokens.get(t, ()))):
+            tokens = self._trigram_tokens.get(trigram)
+            if not tokens:
+                return
+            candidates = set(tokens) if candidates is None else candidates & tokens
+            if not candidates:
+                return
+        # Триграми лише відсіюють кандидатів - перевіряємо підрядок
+        yield from (token for token in candidates if term in token)
+
+    @staticmethod
+    def _tokens(fields: Tuple[str, ...]) -> Set[str]:
+        """Повертає множину токенів документа"""
+        tokens = set()
+        for field in fields:
+            tokens.update(_index_tokens(field))
+        return tokens
+
+    def _unindex(self, doc_id: int):
+        """Видаляє документ з постингів"""
+        for token in self._tokens(self._fields[doc_id]):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                self._remove_token(token)
+
+    def _add_token(self, token: str):
+        """Додає новий токен у словник та триграмні постинги"""
+        self._vocabulary_stale = True
+        for trigram in _trigrams(token):
+            self._trigram_tokens.setdefault(trigram, set()).add(token)
+
+    def _remove_token(self, token: str):
+        """Видаляє токен зі словника та триграмних постингів"""
+        self._vocabulary_stale = True
+        for trigram in _trigrams(token):
+            tokens = self._trigram_tokens.get(trigram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigram_tokens[trigram]
@@ -0,0 +1,108 @@
+"""
+Фонове виконання пошукових запитів із затримкою та скасуванням
+"""
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .logger import get_logger
+from .search_index import SearchIndex
+
+logger = get_logger(__name__)
+
+DEBOUNCE_MS = 150  # Запит виконується після паузи у введенні
+
+
+class _SearchTask(QRunnable):
+    """Завдання пулу: виконує один запит"""
+
+    def __init__(self, runner: 'SearchRunner', query: str, generation: int):
+        super().__init__()
+        self._runner = runner
+        self._query = query
+        self._generation = generation
+
+    def run(self):
+        # Запит застарів ще до початку (користувач продовжив вводити)
+        if self._runner._generation != self._generation:
+            return
+        try:
+            keys = self._runner._index.rank(self._query, self._runner._limit)
+        except Exception as e:
+            logger.error(f"Помилка виконання пошукового запиту: {e}", exc_info=True)
+            return
+        self._runner._task_finished.emit(self._generation, self._query, keys)
+
+
+class SearchRunner(QObject):
+    """Виконує запити до SearchIndex у фоновому потоці, відкидаючи застарілі"""
+
+    results_ready = pyqtSignal(str, list)  # Запит, ключі за релевантністю
+    _task_finished = pyqtSignal(int, str, list)  # Внутрішній: з робочого потоку
+
+    def __init__(self, index: SearchIndex, debounce_ms: int = DEBOUNCE_MS,
+                 limit: Optional[int] = None, parent: QObject = None):
+        """
+        Ініціалізує виконавця запитів
+
+        Args:
+            index: Пошуковий індекс
+            debounce_ms: Затримка перед запуском запиту (мс)
+            limit: Максимальна кількість результатів
+            parent: Батьківський об'єкт
+        """
+        super().__init__(parent)
+        self._index = index
+        self._limit = limit
+        self._generation = 0
+        self._query = ''
+
+        # Один потік: новий запит однаково робить попередній непотрібним
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._start)
+
+        self._task_finished.connect(self._on_task_finished)
+
+    def submit(self, query: str):
+        """
+        Планує запит; попередній незавершений запит скасовується
+
+        Args:
+            query: Рядок пошуку
+        """
+        self._generation += 1
+        self._query = query
+        self._timer.start()
+
+    def cancel(self):
+        """Скасовує запланований запит та ігнорує результат поточного"""
+        self._generation += 1
+        self._timer.stop()
+        self._pool.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Чекає завершення поточного запиту
+
+        Args:
+            msecs: Таймаут в мілісекундах (-1 - без обмеження)
+
+        Returns:
+            True якщо запитів не залишилось
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _start(self):
+        """Запускає відкладений запит"""
+        self._pool.clear()
+        self._pool.start(_SearchTask(self, self._query, self._generation))
+
+    def _on_task_finished(self, generation: int, query: str, keys: list):
+        """Передає результат, якщо за час виконання не надійшов новий запит"""
+        if generation == self._generation:
+            self.results_ready.emit(query, keys)
@@ -0,0 +1,135 @@
+"""
+Випадковий порядок відтворення: лінива перестановка Фішера-Єйтса
+"""
+from typing import Callable, Hashable, Iterable, List, Optional
+import random
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ShuffleEngine:
+    """
+    Випадковий порядок без повторів у межах одного проходу
+
+    Перестановка будується по одному елементу: кожен крок next() витягує
+    випадковий елемент із пулу невідтворених (обмін з останнім та pop),
+    тож крок коштує O(1) незалежно від розміру плейлиста. Пул заповнюється
+    один раз на прохід. Видалені елементи відкидаються ліниво - при
+    витягуванні їх перевіряє функція contains. Кроки назад і вперед
+    веде NavigationHistory, рушій знає лише поточний елемент.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Hashable]],
+                 contains: Optional[Callable[[Hashable], bool]] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            source: Повертає всі елементи (викликається на початку проходу)
+            contains: Перевіряє, чи елемент ще існує (None - завжди так)
+            rng: Генератор випадкових чисел (для відтворюваності в тестах)
+        """
+        self._source = source
+        self._contains = contains or (lambda item: True)
+        self._rng = rng or random.Random()
+        self._current = None
+        self._played = set()  # Відтворені у цьому проході
+        self._remaining: List[Hashable] = []  # Пул невідтворених
+        self._positions = {}  # Елемент пулу -> індекс у _remaining
+        self._fresh = True  # Пул ще не заповнено з source
+
+    def reset(self, current: Optional[Hashable] = None):
+        """
+        Починає новий прохід
+
+        Args:
+            current: Елемент, що відтворюється зараз (не повториться в проході)
+        """
+        self._current = current
+        self._played = {current} if current is not None else set()
+        self.invalidate()
+
+    def invalidate(self):
+        """Перебудовує пул при наступному кроці (вміст джерела змінився повністю)"""
+        self._remaining = []
+        self._positions = {}
+        self._fresh = True
+
+    def add(self, item: Hashable):
+        """Додає новий елемент у пул поточного проходу, O(1)"""
+        if self._fresh or item in self._positions or item in self._played:
+            return
+        self._positions[item] = len(self._remaining)
+        self._remaining.append(item)
+
+    def add_many(self, items: Iterable[Hashable]):
+        """Додає кілька нових елементів у пул"""
+        for item in items:
+            self.add(item)
+
+    def current(self) -> Optional[Hashable]:
+        """Повертає поточний елемент або None"""
+        return self._current
+
+    def set_current(self, item: Hashable):
+        """Фіксує елемент, вибраний поза порядком (користувачем чи кроком назад), O(1)"""
+        self._take(item)
+        self._played.add(item)
+        self._current = item
+
+    def next(self) -> Optional[Hashable]:
+        """
+        Повертає наступний елемент перестановки, O(1)
+
+        Коли пул вичерпано, починає новий прохід.
+
+        Returns:
+            Елемент або None, якщо джерело порожнє
+        """
+        item = self._draw()
+        if item is None and not self._fresh:
+            # Прохід завершено - поточний елемент відкриває наступний
+            logger.debug(f"Shuffle: прохід завершено ({len(self._played)} елементів)")
+            current = self._current
+            self.reset(current if current is not None and self._contains(current) else None)
+            item = self._draw()
+            if item is None:
+                # Єдиний елемент повторюється
+                return self._current
+
+        if item is not None:
+            self._played.add(item)
+            self._current = item
+        return item
+
+    def get_remaining_count(self) -> int:
+        """Повертає оцінку кількості невідтворених елементів (з видаленими)"""
+        return len(self._remaining)
+
+    def _fill(self):
+        """Заповнює пул усіма невідтвореними елементами джерела"""
+        self._remaining = [item for item in self._source() if item not in self._played]
+        self._positions = {item: i for i, item in enumerate(self._remaining)}
+        self._fresh = False
+
+    def _draw(self) -> Optional[Hashable]:
+        """Витягує випадковий існуючий елемент із пулу"""
+        if self._fresh:
+            self._fill()
+        while self._remaining:
+            item = self._remaining[self._rng.randrange(len(self._remaining))]
+            self._take(item)
+            if self._contains(item):
+                return item
+        return None
+
+    def _take(self, item: Hashable):
+        """Видаляє елемент із пулу обміном з останнім, O(1)"""
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last = self._remaining.pop()
+        if position < len(self._remaining):
+            self._remaining[position] = last
+            self._positions[last] = position
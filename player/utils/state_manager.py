@@ -13,7 +13,7 @@ STATE_FILE = Path(__file__).parent.parent.parent / "state.json"
 
 
 def save_state(playlist: list, current_index: int, volume: int, position: int = 0, 
-               repeat: int = 0, shuffle: bool = False) -> bool:
+               repeat: int = 0, shuffle: bool = False, **extra) -> bool:
     """
     Зберігає стан програвача
     
@@ -24,6 +24,7 @@ def save_state(playlist: list, current_index: int, volume: int, position: int =
         position: Позиція відтворення (мс)
         repeat: Режим повторення
         shuffle: Режим випадкового відтворення
+        **extra: Додаткові поля (геометрія вікна, останні плейлисти, папки бібліотеки)
         
     Returns:
         True якщо успішно збережено
@@ -37,6 +38,7 @@ def save_state(playlist: list, current_index: int, volume: int, position: int =
             'repeat': repeat,
             'shuffle': shuffle
         }
+        state.update(extra)
         
         with open(STATE_FILE, 'w', encoding='utf-8') as f:
             json.dump(state, f, indent=2, ensure_ascii=False)
@@ -48,10 +50,14 @@ def save_state(playlist: list, current_index: int, volume: int, position: int =
         return False
 
 
-def load_state() -> Optional[Dict[str, Any]]:
+def load_state(validate: bool = True) -> Optional[Dict[str, Any]]:
     """
     Завантажує стан програвача
     
+    Args:
+        validate: Відкидати відсутні файли; False - плейлист повертається без
+            звернень до диска (перевірка - у фоні, див. TrackValidator)
+    
     Returns:
         Словник зі станом або None якщо не вдалося завантажити
     """
@@ -69,9 +75,11 @@ def load_state() -> Optional[Dict[str, Any]]:
             return None
         
         # Фільтруємо тільки існуючі файли
-        valid_tracks = [t for t in state['playlist'] if Path(t).exists()]
-        if len(valid_tracks) < len(state['playlist']):
-            logger.warning(f"Деякі файли зі стану не знайдено: {len(state['playlist']) - len(valid_tracks)}")
+        valid_tracks = state['playlist']
+        if validate:
+            valid_tracks = [t for t in valid_tracks if Path(t).exists()]
+            if len(valid_tracks) < len(state['playlist']):
+                logger.warning(f"Деякі файли зі стану не знайдено: {len(state['playlist']) - len(valid_tracks)}")
         
         state['playlist'] = valid_tracks
         
@@ -0,0 +1,426 @@
+"""
+Сховища шляхів треків для плейлиста: звичайне та компактне
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_EMPTY = -1  # Вільний слот хеш-таблиці
+_DELETED = -2  # Слот видаленого запису (пошук іде далі)
+_COMPACT_GARBAGE_BYTES = 64 * 1024  # Мінімум "сміття" в буфері імен для ущільнення
+_HASH_MASK = 0xFFFFFFFF  # У записах зберігаються молодші 32 біти hash(шлях)
+
+
+def _split_path(path: str):
+    """Ділить шлях на префікс папки (з роздільником) та ім'я файлу"""
+    cut = max(path.rfind('/'), path.rfind('\\')) + 1
+    return path[:cut], path[cut:]
+
+
+def _move_order(start: int, stop: int, dest: int) -> Tuple[int, int, List[int]]:
+    """
+    Описує перенесення записів [start, stop) перед позицію dest
+
+    Returns:
+        Кортеж (lo, hi, order): змінюються лише позиції [lo, hi),
+        order[i] - стара позиція запису, що стане на lo + i
+    """
+    if dest < start:
+        return dest, stop, [*range(start, stop), *range(dest, start)]
+    return start, dest, [*range(stop, dest), *range(start, stop)]
+
+
+def _table_size(count: int) -> int:
+    """Розмір хеш-таблиці (степінь двійки) для count записів із заповненням до 50%"""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+class TrackList:
+    """
+    Впорядкований список унікальних шляхів зі словником позицій
+
+    Перевірка наявності та пошук позиції - O(1); видалення з середини
+    оновлює позиції наступних записів.
+    """
+
+    __slots__ = ('_paths', '_positions')
+
+    ENTRY_BYTES = 200  # Приблизна пам'ять на запис (рядок, елемент списку та словника)
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._paths: List[str] = []
+        self._positions: Dict[str, int] = {}  # {шлях: індекс}
+        self.assign(paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __getitem__(self, index: int) -> str:
+        return self._paths[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._positions
+
+    def index_of(self, path: str) -> int:
+        """Повертає позицію шляху або -1"""
+        return self._positions.get(path, -1)
+
+    def append(self, path: str):
+        """Додає шлях у кінець (шлях має бути відсутнім)"""
+        self._positions[path] = len(self._paths)
+        self._paths.append(path)
+
+    def pop(self, index: int) -> str:
+        """Видаляє та повертає шлях за індексом"""
+        path = self._paths.pop(index)
+        del self._positions[path]
+        self._reindex(index if index >= 0 else len(self._paths))
+        return path
+
+    def replace(self, index: int, path: str):
+        """Замінює шлях за індексом (новий шлях має бути відсутнім)"""
+        del self._positions[self._paths[index]]
+        self._paths[index] = path
+        self._positions[path] = index
+
+    def move(self, start: int, stop: int, dest: int):
+        """Переносить записи [start, stop) перед позицію dest (dest поза [start, stop])"""
+        lo, hi, order = _move_order(start, stop, dest)
+        paths = self._paths
+        paths[lo:hi] = [paths[index] for index in order]
+        self._reindex(lo, hi)
+
+    def permute(self, order: Sequence[int]):
+        """Переставляє записи: новий i-й запис - старий order[i]"""
+        paths = self._paths
+        self.assign([paths[index] for index in order])
+
+    def assign(self, paths: Iterable[str]):
+        """Замінює весь вміст"""
+        self._paths = list(paths)
+        self._positions = {path: index for index, path in enumerate(self._paths)}
+
+    def clear(self):
+        """Очищає список"""
+        self._paths.clear()
+        self._positions.clear()
+
+    def to_list(self) -> List[str]:
+        """Повертає копію у вигляді списку рядків"""
+        return self._paths.copy()
+
+    def _reindex(self, start: int, stop: int = None):
+        """Оновлює позиції записів [start, stop)"""
+        positions = self._positions
+        paths = self._paths
+        for index in range(start, len(paths) if stop is None else stop):
+            positions[paths[index]] = index
+
+
+class CompactTrackList:
+    """
+    Компактний список унікальних шляхів для дуже великих плейлистів
+
+    Префікси папок зберігаються один раз (інтернуються), запис - це
+    номер папки та ім'я файлу в спільному байтовому буфері, а позиції
+    шукаються через хеш-таблицю з відкритою адресацією в масиві. Рядки
+    шляхів створюються лише при зверненні, тож на запис припадає
+    близько 50 байт замість ~200 у TrackList. Інтерфейс - як у TrackList.
+    """
+
+    __slots__ = ('_dirs', '_dir_ids', '_entry_dir', '_entry_start', '_entry_size', '_entry_hash',
+                 '_names', '_garbage', '_table', '_filled')
+
+    ENTRY_BYTES = 56  # Приблизна пам'ять на запис
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self.assign(paths)
+
+    def _reset(self):
+        """Скидає вміст"""
+        self._dirs: List[str] = []  # Префікси папок
+        self._dir_ids: Dict[str, int] = {}  # {префікс: номер}
+        self._entry_dir = array('I')  # Номер папки запису
+        self._entry_start = array('I')  # Зсув імені в буфері
+        self._entry_size = array('I')  # Довжина імені (байти)
+        self._entry_hash = array('I')  # hash(шлях) - для пошуку без створення рядків
+        self._names = bytearray()  # Імена файлів (UTF-8)
+        self._garbage = 0  # Байти імен видалених записів
+        self._table = array('i', [_EMPTY]) * _table_size(0)
+        self._filled = 0  # Зайняті слоти, включно з видаленими
+
+    def __len__(self) -> int:
+        return len(self._entry_dir)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self._entry_dir)
+        if not 0 <= index < len(self._entry_dir):
+            raise IndexError("CompactTrackList index out of range")
+        start = self._entry_start[index]
+        name = self._names[start:start + self._entry_size[index]].decode('utf-8', 'surrogatepass')
+        return self._dirs[self._entry_dir[index]] + name
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._entry_dir)):
+            yield self[index]
+
+    def __contains__(self, path: str) -> bool:
+        return self._find_slot(path) >= 0
+
+    def index_of(self, path: str) -> int:
+        """Повертає позицію шляху або -1"""
+        slot = self._find_slot(path)
+        return self._table[slot] if slot >= 0 else -1
+
+    def append(self, path: str):
+        """Додає шлях у кінець (шлях має бути відсутнім)"""
+        self._append_entry(path)
+        self._index_entry(len(self._entry_dir) - 1)
+
+    def pop(self, index: int) -> str:
+        """Видаляє та повертає шлях за індексом"""
+        count = len(self._entry_dir)
+        if index < 0:
+            index += count
+        path = self[index]
+        self._table[self._slot_of(index)] = _DELETED
+        self._garbage += self._entry_size[index]
+        for entries in (self._entry_dir, self._entry_start, self._entry_size, self._entry_hash):
+            del entries[index]
+
+        # Записи після видаленого зсуваються на одну позицію
+        table = self._table
+        for position in range(index, count - 1):
+            table[self._slot_of(position + 1, position)] = position
+        self._compact_names()
+        return path
+
+    def replace(self, index: int, path: str):
+        """Замінює шлях за індексом (новий шлях має бути відсутнім)"""
+        if index < 0:
+            index += len(self._entry_dir)
+        self._table[self._slot_of(index)] = _DELETED
+        self._garbage += self._entry_size[index]
+
+        prefix, data, path_hash = self._encode(path)
+        self._entry_dir[index] = self._dir_id(prefix)
+        self._entry_start[index] = len(self._names)
+        self._entry_size[index] = len(data)
+        self._entry_hash[index] = path_hash
+        self._names += data
+        self._index_entry(index)
+        self._compact_names()
+
+    def move(self, start: int, stop: int, dest: int):
+        """Переносить записи [start, stop) перед позицію dest (dest поза [start, stop])"""
+        lo, hi, order = _move_order(start, stop, dest)
+        # Слоти шукаються до зсуву масивів - поки хеші на старих позиціях
+        slots = [self._slot_of(index) for index in order]
+        for entries in (self._entry_dir, self._entry_start, self._entry_size, self._entry_hash):
+            entries[lo:hi] = array('I', [entries[index] for index in order])
+        table = self._table
+        for position, slot in enumerate(slots, lo):
+            table[slot] = position
+
+    def permute(self, order: Sequence[int]):
+        """Переставляє записи: новий i-й запис - старий order[i]"""
+        for entries in (self._entry_dir, self._entry_start, self._entry_size, self._entry_hash):
+            entries[:] = array('I', [entries[index] for index in order])
+        self._rehash()
+
+    def assign(self, paths: Iterable[str]):
+        """Замінює весь вміст"""
+        self._reset()
+        # Те саме, що _append_entry, але без викликів методів на кожен шлях
+        dirs = self._dirs
+        dir_ids = self._dir_ids
+        append_dir = self._entry_dir.append
+        append_start = self._entry_start.append
+        append_size = self._entry_size.append
+        append_hash = self._entry_hash.append
+        names = self._names
+        for path in paths:
+            cut = max(path.rfind('/'), path.rfind('\\')) + 1
+            prefix = path[:cut]
+            dir_id = dir_ids.get(prefix)
+            if dir_id is None:
+                dir_id = dir_ids[prefix] = len(dirs)
+                dirs.append(prefix)
+            data = path[cut:].encode('utf-8', 'surrogatepass')
+            append_dir(dir_id)
+            append_start(len(names))
+            append_size(len(data))
+            append_hash(hash(path) & _HASH_MASK)
+            names += data
+        self._rehash()
+
+    def clear(self):
+        """Очищає список"""
+        self._reset()
+
+    def to_list(self) -> List[str]:
+        """Повертає копію у вигляді списку рядків"""
+        return list(self)
+
+    @staticmethod
+    def _encode(path: str):
+        """Повертає (префікс папки, ім'я в UTF-8, хеш шляху)"""
+        prefix, name = _split_path(path)
+        return prefix, name.encode('utf-8', 'surrogatepass'), hash(path) & _HASH_MASK
+
+    def _dir_id(self, prefix: str) -> int:
+        """Повертає номер префікса папки, додаючи його при потребі"""
+        dir_id = self._dir_ids.get(prefix)
+        if dir_id is None:
+            dir_id = self._dir_ids[prefix] = len(self._dirs)
+            self._dirs.append(prefix)
+        return dir_id
+
+    def _append_entry(self, path: str):
+        """Додає запис у масиви (без хеш-таблиці)"""
+        prefix, data, path_hash = self._encode(path)
+        self._entry_dir.append(self._dir_id(prefix))
+        self._entry_start.append(len(self._names))
+        self._entry_size.append(len(data))
+        self._entry_hash.append(path_hash)
+        self._names += data
+
+    def _find_slot(self, path: str) -> int:
+        """Повертає слот таблиці зі шляхом або -1"""
+        table = self._table
+        entry_hash = self._entry_hash
+        path_hash = hash(path) & _HASH_MASK
+        mask = len(table) - 1
+        slot = path_hash & mask
+        while True:
+            index = table[slot]
+            if index == _EMPTY:
+                return -1
+            if index >= 0 and entry_hash[index] == path_hash and self[index] == path:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _slot_of(self, index: int, hash_index: int = None) -> int:
+        """
+        Повертає слот, що зберігає index
+
+        Args:
+            index: Значення в таблиці
+            hash_index: Позиція запису в масивах (якщо масиви вже зсунуто)
+        """
+        table = self._table
+        mask = len(table) - 1
+        slot = self._entry_hash[index if hash_index is None else hash_index] & mask
+        while table[slot] != index:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _insert_slot(self, path_hash: int, index: int):
+        """Записує index у перший вільний або видалений слот"""
+        table = self._table
+        mask = len(table) - 1
+        slot = path_hash & mask
+        while table[slot] >= 0:
+            slot = (slot + 1) & mask
+        if table[slot] == _EMPTY:
+            self._filled += 1
+        table[slot] = index
+
+    def _index_entry(self, index: int):
+        """Додає запис у хеш-таблицю, розширюючи її при заповненні понад 50%"""
+        if (self._filled + 1) * 2 > len(self._table):
+            self._rehash()
+        else:
+            self._insert_slot(self._entry_hash[index], index)
+
+    def _rehash(self):
+        """Перебудовує хеш-таблицю (без видалених слотів) з масиву хешів"""
+        count = len(self._entry_dir)
+        table = self._table = array('i', [_EMPTY]) * _table_size(count)
+        mask = len(table) - 1
+        for index, path_hash in enumerate(self._entry_hash):
+            slot = path_hash & mask
+            while table[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            table[slot] = index
+        self._filled = count
+
+    def _compact_names(self):
+        """Ущільнює буфер імен, якщо більша частина - імена видалених записів"""
+        if self._garbage < _COMPACT_GARBAGE_BYTES or self._garbage * 2 < len(self._names):
+            return
+        names = bytearray()
+        for index, start in enumerate(self._entry_start):
+            self._entry_start[index] = len(names)
+            names += self._names[start:start + self._entry_size[index]]
+        self._names = names
+        self._garbage = 0
+
+
+class TrackView(Sequence):
+    """
+    Представлення шляхів лише для читання, без копіювання
+
+    Підтримує len, індекси, зрізи (нове представлення над діапазоном
+    індексів), ітерацію та перевірку наявності за O(1). Представлення
+    живе: зміни плейлисту одразу видно через нього, тож зріз після
+    видалення треків може вказувати за межі списку (IndexError).
+    """
+
+    __slots__ = ('_get_store', '_range')
+
+    def __init__(self, get_store: Callable[[], Union[TrackList, CompactTrackList]],
+                 indices: Optional[range] = None):
+        """
+        Args:
+            get_store: Повертає поточне сховище (плейлист може замінити його компактним)
+            indices: Діапазон індексів; None - усе сховище
+        """
+        self._get_store = get_store
+        self._range = indices
+
+    def _indices(self) -> range:
+        """Діапазон індексів представлення на поточний момент"""
+        return range(len(self._get_store())) if self._range is None else self._range
+
+    def __len__(self) -> int:
+        return len(self._indices())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TrackView(self._get_store, self._indices()[index])
+        return self._get_store()[self._indices()[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        store = self._get_store()
+        if self._range is None:
+            return iter(store)
+        return (store[index] for index in self._range)
+
+    def __contains__(self, path: str) -> bool:
+        return self._get_store().index_of(path) in self._indices()
+
+    def index(self, path: str) -> int:
+        """Повертає позицію шляху в представленні (ValueError, якщо його немає)"""
+        try:
+            return self._indices().index(self._get_store().index_of(path))
+        except ValueError:
+            raise ValueError(f"{path!r} is not in view") from None
+
+    def count(self, path: str) -> int:
+        """Шляхи унікальні: 1 або 0"""
+        return int(path in self)
+
+    def __repr__(self) -> str:
+        return f"TrackView({len(self)} tracks)"
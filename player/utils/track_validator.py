@@ -0,0 +1,105 @@
+"""
+Фонова перевірка наявності треків (одне читання папки на всі її треки)
+"""
+from collections import defaultdict
+from typing import List, Tuple
+import os
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DIRS_PER_TASK = 32  # Папок в одному завданні пулу - результати надходять частинами
+
+
+class _ValidateTask(QRunnable):
+    """Завдання пулу: перевіряє треки кількох папок"""
+
+    def __init__(self, validator: 'TrackValidator', groups: List[Tuple[str, List[str]]], generation: int):
+        super().__init__()
+        self._validator = validator
+        self._groups = groups
+        self._generation = generation
+
+    def run(self):
+        missing = []
+        for directory, file_paths in self._groups:
+            # Перевірку скасовано (плейлист очищено або програма закривається)
+            if self._validator._generation != self._generation:
+                return
+            try:
+                with os.scandir(directory or os.curdir) as it:
+                    names = {os.path.normcase(entry.name) for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                names = set()
+            except OSError as e:
+                # Папка недоступна (мережа, права) - не вважаємо треки відсутніми
+                logger.warning(f"Не вдалося перевірити папку {directory}: {e}")
+                continue
+            missing.extend(path for path in file_paths
+                           if os.path.normcase(os.path.basename(path)) not in names)
+        if missing:
+            self._validator._task_finished.emit(self._generation, missing)
+
+
+class TrackValidator(QObject):
+    """Перевіряє наявність треків у фоні, групуючи їх за папками"""
+
+    tracks_missing = pyqtSignal(list)  # Шляхи треків, яких немає на диску
+    _task_finished = pyqtSignal(int, list)  # Внутрішній: з робочого потоку
+
+    def __init__(self, max_threads: int = 2, parent: QObject = None):
+        """
+        Ініціалізує перевірку
+
+        Args:
+            max_threads: Максимальна кількість робочих потоків
+            parent: Батьківський об'єкт
+        """
+        super().__init__(parent)
+        self._generation = 0
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._task_finished.connect(self._on_task_finished)
+
+    def validate(self, file_paths: List[str]):
+        """
+        Ставить треки в чергу перевірки та одразу повертає керування
+
+        Замість stat на кожен файл читається вміст кожної папки один раз;
+        відсутні треки надходять сигналом tracks_missing частинами.
+
+        Args:
+            file_paths: Список шляхів до аудіофайлів
+        """
+        groups = defaultdict(list)
+        for file_path in file_paths:
+            groups[os.path.dirname(file_path)].append(file_path)
+        items = list(groups.items())
+        for start in range(0, len(items), DIRS_PER_TASK):
+            self._pool.start(_ValidateTask(self, items[start:start + DIRS_PER_TASK], self._generation))
+        logger.debug(f"Перевірка {len(file_paths)} треків у {len(items)} папках")
+
+    def cancel(self):
+        """Скасовує всі заплановані перевірки"""
+        self._generation += 1
+        self._pool.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Чекає завершення поточних перевірок
+
+        Args:
+            msecs: Таймаут в мілісекундах (-1 - без обмеження)
+
+        Returns:
+            True якщо перевірок не залишилось
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _on_task_finished(self, generation: int, missing: list):
+        """Передає результат, якщо перевірку не скасовано"""
+        if generation == self._generation:
+            self.tracks_missing.emit(missing)
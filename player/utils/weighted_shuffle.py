@@ -0,0 +1,266 @@
+"""
+Зважений випадковий вибір треків за статистикою відтворення (дерево Фенвіка)
+"""
+from collections import deque
+from datetime import datetime
+from typing import Callable, Hashable, Iterable, List, Optional
+import math
+import random
+import time
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+RECENT_SECONDS = 24 * 60 * 60  # Трек, відтворений протягом доби, вважається нещодавнім
+RECENT_FACTOR = 0.05  # Множник ваги нещодавнього треку
+MAX_STALE_DRAWS = 32  # Після стількох видалених треків поспіль ваги перебудовуються
+
+
+def track_weight(stats: Optional[dict], now: Optional[float] = None) -> float:
+    """
+    Обчислює вагу треку: рідко відтворені частіше, нещодавні - рідше
+
+    Args:
+        stats: Статистика треку з PlayStatistics (None - не відтворювався)
+        now: Поточний час (секунди з епохи)
+
+    Returns:
+        Вага від RECENT_FACTOR / sqrt(1 + play_count) до 1.0
+    """
+    if not stats:
+        return 1.0
+    weight = 1.0 / math.sqrt(1 + stats.get('play_count', 0))
+    last_played = _timestamp(stats.get('last_played'))
+    if last_played is not None and last_played > (now or time.time()) - RECENT_SECONDS:
+        weight *= RECENT_FACTOR
+    return weight
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Перетворює ISO-дату зі статистики на секунди з епохи"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class FenwickTree:
+    """Префіксні суми ваг з оновленням та пошуком за O(log n)"""
+
+    def __init__(self):
+        self._tree = [0.0]  # Індексація з 1
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def append(self, value: float):
+        """Додає елемент у кінець, O(log n)"""
+        index = len(self._tree)
+        # Вузол покриває (index - lowbit, index]: сума попередніх елементів діапазону плюс новий
+        low = index - (index & -index)
+        self._tree.append(value + self.prefix_sum(index - 1) - self.prefix_sum(low))
+
+    def add(self, index: int, delta: float):
+        """Додає delta до елемента index (з 0)"""
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, count: int) -> float:
+        """Сума перших count елементів"""
+        total = 0.0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def total(self) -> float:
+        return self.prefix_sum(len(self))
+
+    def find(self, value: float) -> int:
+        """
+        Знаходить перший елемент, на якому префіксна сума перевищує value
+
+        Returns:
+            Індекс (з 0); len(self) якщо value не менше за суму всіх ваг
+        """
+        index = 0
+        step = 1 << (len(self).bit_length())
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= value:
+                index = nxt
+                value -= self._tree[nxt]
+            step >>= 1
+        return index
+
+
+class WeightedShuffle:
+    """
+    Випадковий вибір треків з вагами за статистикою відтворення
+
+    Кожен трек займає слот у дереві Фенвіка, тож вибір, додавання та
+    оновлення ваги після відтворення коштують O(log n). Нещодавно
+    відтворені треки стоять у черзі охолодження і повертають повну вагу,
+    коли минає RECENT_SECONDS. Видалені треки відкидаються ліниво.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Hashable]],
+                 get_stats: Callable[[Hashable], Optional[dict]],
+                 contains: Optional[Callable[[Hashable], bool]] = None,
+                 rng: Optional[random.Random] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            source: Повертає всі треки (викликається при перебудові)
+            get_stats: Статистика треку (PlayStatistics.get_stats)
+            contains: Перевіряє, чи трек ще існує (None - завжди так)
+            rng: Генератор випадкових чисел (для відтворюваності в тестах)
+            clock: Джерело поточного часу
+        """
+        self._source = source
+        self._get_stats = get_stats
+        self._contains = contains or (lambda item: True)
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._tree = FenwickTree()
+        self._items: List[Optional[Hashable]] = []  # Слот -> трек (None - вільний)
+        self._weights: List[float] = []
+        self._slots = {}  # Трек -> слот
+        self._free: List[int] = []
+        self._cooldown = deque()  # (час закінчення, трек) у порядку відтворення
+        self._fresh = True  # Ваги ще не побудовано з source
+
+    def invalidate(self):
+        """Перебудовує ваги при наступному виборі (вміст джерела змінився повністю)"""
+        self._fresh = True
+
+    def add(self, item: Hashable):
+        """Додає трек з вагою за його статистикою, O(log n)"""
+        if self._fresh or item in self._slots:
+            return
+        self._put(item, self._clock())
+
+    def add_many(self, items: Iterable[Hashable]):
+        """Додає кілька треків"""
+        for item in items:
+            self.add(item)
+
+    def update(self, item: Hashable):
+        """Оновлює вагу треку після зміни статистики (відтворення), O(log n)"""
+        if self._fresh:
+            return
+        now = self._clock()
+        slot = self._slots.get(item)
+        if slot is None:
+            self._put(item, now)
+        else:
+            self._set_weight(slot, self._weight(item, now))
+        self._cooldown.append((now + RECENT_SECONDS, item))
+
+    def next(self, current: Optional[Hashable] = None) -> Optional[Hashable]:
+        """
+        Вибирає трек пропорційно вазі, O(log n)
+
+        Args:
+            current: Трек, що відтворюється зараз (не вибирається, якщо є інші)
+
+        Returns:
+            Трек або None, якщо треків немає
+        """
+        if self._fresh:
+            self._rebuild()
+        self._expire_cooldown()
+
+        excluded = self._slots.get(current) if current is not None else None
+        saved = 0.0
+        if excluded is not None and len(self._slots) > 1:
+            saved = self._weights[excluded]
+            self._set_weight(excluded, 0.0)
+        try:
+            stale = 0
+            while True:
+                total = self._tree.total()
+                if total <= 0:
+                    return current if excluded is not None else None
+                slot = min(self._tree.find(self._rng.random() * total), len(self._items) - 1)
+                item = self._items[slot]
+                if item is not None and self._contains(item):
+                    return item
+                self._release(slot)
+                stale += 1
+                if stale >= MAX_STALE_DRAWS:
+                    # Багато видалених треків - дешевше перебудувати
+                    self._rebuild()
+                    excluded = None
+                    stale = 0
+        finally:
+            if excluded is not None and saved:
+                self._set_weight(excluded, saved)
+
+    def _rebuild(self):
+        """Будує слоти та ваги для всіх треків джерела, O(n log n)"""
+        now = self._clock()
+        self._tree = FenwickTree()
+        self._items, self._weights, self._slots, self._free = [], [], {}, []
+        self._cooldown.clear()
+        recent = []
+        for item in self._source():
+            if item in self._slots:
+                continue
+            stats = self._get_stats(item)
+            self._slots[item] = len(self._items)
+            self._items.append(item)
+            weight = track_weight(stats, now)
+            self._weights.append(weight)
+            self._tree.append(weight)
+            last_played = _timestamp(stats.get('last_played')) if stats else None
+            if last_played is not None and last_played > now - RECENT_SECONDS:
+                recent.append((last_played + RECENT_SECONDS, item))
+        recent.sort(key=lambda entry: entry[0])
+        self._cooldown.extend(recent)
+        self._fresh = False
+        logger.debug(f"Ваги розумного shuffle побудовано: {len(self._items)} треків")
+
+    def _expire_cooldown(self):
+        """Повертає повну вагу трекам, чий час охолодження минув"""
+        now = self._clock()
+        while self._cooldown and self._cooldown[0][0] <= now:
+            _, item = self._cooldown.popleft()
+            slot = self._slots.get(item)
+            if slot is not None:
+                self._set_weight(slot, self._weight(item, now))
+
+    def _weight(self, item: Hashable, now: float) -> float:
+        return track_weight(self._get_stats(item), now)
+
+    def _put(self, item: Hashable, now: float):
+        """Займає вільний слот або додає новий"""
+        weight = self._weight(item, now)
+        if self._free:
+            slot = self._free.pop()
+            self._items[slot] = item
+            self._set_weight(slot, weight)
+        else:
+            slot = len(self._items)
+            self._items.append(item)
+            self._weights.append(weight)
+            self._tree.append(weight)
+        self._slots[item] = slot
+
+    def _release(self, slot: int):
+        """Звільняє слот видаленого треку"""
+        item = self._items[slot]
+        if item is not None:
+            del self._slots[item]
+            self._items[slot] = None
+            self._free.append(slot)
+        self._set_weight(slot, 0.0)
+
+    def _set_weight(self, slot: int, weight: float):
+        self._tree.add(slot, weight - self._weights[slot])
+        self._weights[slot] = weight
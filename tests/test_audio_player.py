@@ -6,7 +6,16 @@ import tempfile
 import os
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtMultimedia import QMediaPlayer
-from player.audio_player import AudioPlayer
+from player.audio_player import AudioPlayer, ShuffleMode
+
+
+@pytest.fixture
+def isolated_files(tmp_path, monkeypatch):
+    """Фікстура: історія, статистика, індекс метаданих та знімки бібліотеки пишуться у тимчасову папку"""
+    monkeypatch.setattr('player.utils.history.HISTORY_FILE', tmp_path / 'history.json')
+    monkeypatch.setattr('player.utils.statistics.STATS_FILE', tmp_path / 'statistics.json')
+    monkeypatch.setattr('player.utils.metadata_index.INDEX_FILE', tmp_path / 'metadata_index.db')
+    monkeypatch.setattr('player.utils.library_scanner.SNAPSHOT_FILE', tmp_path / 'library_snapshots.pkl')
 
 
 # Ініціалізуємо QApplication для тестів
@@ -71,6 +80,185 @@ class TestAudioPlayer:
         assert player.get_shuffle() is True
         player.set_shuffle(False)
         assert player.get_shuffle() is False
+        
+        # Увімкнення кнопкою зберігає вибраний режим
+        player.set_shuffle_mode(ShuffleMode.SMART)
+        assert player.get_shuffle() is True
+        player.set_shuffle(True)
+        assert player.get_shuffle_mode() == ShuffleMode.SMART
+        player.set_shuffle(False)
+        assert player.get_shuffle_mode() == ShuffleMode.OFF
+        player.set_shuffle_mode(42)
+        assert player.get_shuffle_mode() == ShuffleMode.OFF
+    
+    def test_folder_shuffle(self, qapp):
+        """Тест: shuffle за папками відтворює папки цілком"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        tracks = [f"/music/{folder}/{i:02d}.mp3" for folder in "xyz" for i in range(3)]
+        playlist.add_tracks(tracks, validate=False)
+        playlist.set_current_index(0)
+        player.set_shuffle_mode(ShuffleMode.FOLDER)
+        
+        played = [tracks[0]] + [player._get_shuffle_next() for _ in range(8)]
+        assert played[:3] == tracks[:3]
+        assert sorted(played) == tracks
+        for start in (3, 6):
+            assert played[start:start + 3] == sorted(played[start:start + 3])
+            assert len({track.split('/')[2] for track in played[start:start + 3]}) == 1
+        
+        player.set_shuffle_mode(ShuffleMode.RANDOM)
+        assert player._group_shuffle is None
+    
+    def test_play_queue(self, qapp, isolated_files):
+        """Тест: треки черги відтворюються перед порядком плейлиста, плейлист не змінюється"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        
+        tmp_files = []
+        for i in range(5):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp.write(b'fake audio data')
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files[:3])
+            playlist.set_current_index(0)
+            player.load_file(tmp_files[0])
+            
+            # Трек поза плейлистом та альбом цілком
+            player.enqueue(tmp_files[3:])
+            assert player.enqueue([tmp_files[2]], play_next=True) == 3
+            assert player.get_queue() == [tmp_files[2], tmp_files[3], tmp_files[4]]
+            
+            loaded = []
+            player.track_changed.connect(loaded.append)
+            for _ in range(4):
+                player.next()
+            
+            assert loaded == [tmp_files[2], tmp_files[3], tmp_files[4], tmp_files[1]]
+            assert player.get_queue() == []
+            assert playlist.get_tracks() == tmp_files[:3]
+            
+            # Назад можна повернутись і до треків черги поза плейлистом
+            for expected in (tmp_files[4], tmp_files[3], tmp_files[2]):
+                player.previous()
+                assert loaded[-1] == expected
+            
+            player.enqueue(tmp_files[:2])
+            player.clear_queue()
+            assert player.get_queue() == []
+        finally:
+            player.stop()
+            for tmp_file in tmp_files:
+                if os.path.exists(tmp_file):
+                    os.unlink(tmp_file)
+    
+    def test_smart_shuffle(self, qapp):
+        """Тест: розумний shuffle вибирає треки плейлиста, крім поточного"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        tracks = [f"/music/{i:03d}.mp3" for i in range(5)]
+        playlist.add_tracks(tracks, validate=False)
+        playlist.set_current_index(0)
+        player.set_shuffle_mode(ShuffleMode.SMART)
+        
+        for _ in range(20):
+            previous = playlist.get_current_track()
+            track = player._get_shuffle_next()
+            assert track in tracks and track != previous
+            assert playlist.get_current_track() == track
+    
+    def test_shuffle_pass(self, qapp):
+        """Тест: прохід shuffle відтворює кожен трек один раз, враховуючи нові треки"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        playlist.add_tracks([f"/music/{i:03d}.mp3" for i in range(20)], validate=False)
+        playlist.set_current_index(0)
+        player.set_shuffle(True)
+        
+        played = [playlist.get_track_at(0)]
+        for _ in range(9):
+            played.append(player._get_shuffle_next())
+            assert playlist.get_current_track() == played[-1]
+        playlist.add_tracks(["/music/new.mp3"], validate=False)
+        for _ in range(11):
+            played.append(player._get_shuffle_next())
+        
+        assert sorted(played) == sorted(playlist.get_tracks())
+    
+    def test_sequential_previous(self, qapp, isolated_files):
+        """Тест: без shuffle previous послідовно йде назад за плейлистом"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        
+        tmp_files = []
+        for i in range(8):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp.write(b'fake audio data')
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files)
+            playlist.set_current_index(5)
+            player.load_file(tmp_files[5])
+            
+            indices = []
+            for _ in range(3):
+                player.previous()
+                indices.append(playlist.get_current_index())
+            assert indices == [4, 3, 2]
+            
+            # Вперед - тим самим шляхом
+            player.next()
+            assert playlist.get_current_index() == 3
+        finally:
+            player.stop()
+            for tmp_file in tmp_files:
+                if os.path.exists(tmp_file):
+                    os.unlink(tmp_file)
+    
+    def test_shuffle_previous(self, qapp, isolated_files):
+        """Тест: у shuffle previous повертає фактично відтворені треки"""
+        player = AudioPlayer()
+        playlist = player.get_playlist()
+        
+        tmp_files = []
+        for i in range(10):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp.write(b'fake audio data')
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files)
+            playlist.set_current_index(0)
+            player.load_file(tmp_files[0])
+            player.set_shuffle(True)
+            
+            played = [tmp_files[0]]
+            for _ in range(4):
+                player.next()
+                played.append(playlist.get_current_track())
+            
+            player.previous()
+            assert playlist.get_current_track() == played[3]
+            player.previous()
+            assert playlist.get_current_track() == played[2]
+            
+            # Вперед - тим самим шляхом, далі - нові треки без повторів
+            player.next()
+            assert playlist.get_current_track() == played[3]
+            player.next()
+            assert playlist.get_current_track() == played[4]
+            for _ in range(5):
+                player.next()
+                played.append(playlist.get_current_track())
+            assert sorted(played) == sorted(tmp_files)
+        finally:
+            player.stop()
+            for tmp_file in tmp_files:
+                if os.path.exists(tmp_file):
+                    os.unlink(tmp_file)
     
     def test_playlist_integration(self, qapp):
         """Тест інтеграції з плейлистом"""
@@ -132,3 +320,109 @@ class TestAudioPlayer:
         assert info['title'] == 'file'  # Ім'я файлу без розширення
         assert info['artist'] == 'Невідомий виконавець'
 
+    
+    def test_get_track_tags(self, qapp):
+        """Тест отримання тегів без обкладинки"""
+        player = AudioPlayer()
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+            tmp.write(b'fake audio data')
+            tmp_path = tmp.name
+        
+        try:
+            tags = player.get_track_tags(tmp_path)
+            assert 'artwork' not in tags
+            assert tags['title'] == os.path.splitext(os.path.basename(tmp_path))[0]
+            assert tags['format'] == 'MP3'
+            assert tags['file_path'] == tmp_path
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def test_search_tracks(self, qapp, isolated_files):
+        """Тест пошуку треків через індекс"""
+        player = AudioPlayer()
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', prefix='searchable_') as tmp:
+            tmp.write(b'fake audio data')
+            tmp_path = tmp.name
+        
+        try:
+            player.index_tracks([tmp_path])
+            assert player.search_tracks("searchable") == [tmp_path]
+            
+            # Теги, прочитані у фоні, оновлюють індекс
+            player._on_track_tags_ready(tmp_path, {'title': 'Song', 'artist': 'Artist', 'album': 'Album'})
+            assert player.search_tracks("artist song") == [tmp_path]
+            
+            player.forget_tracks([tmp_path])
+            assert player.search_tracks("song") == []
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def test_get_track_info_lazy_artwork(self, qapp):
+        """Тест лінивого завантаження обкладинки"""
+        from player.utils.metadata import TrackInfo
+        
+        calls = []
+        info = TrackInfo({'title': 'Song'}, lambda: calls.append(1) or 'pixmap')
+        assert 'artwork' in info
+        assert info['title'] == 'Song'
+        assert calls == []
+        
+        assert info.get('artwork') == 'pixmap'
+        assert info['artwork'] == 'pixmap'
+        assert calls == [1]
+    
+    def test_prefetch_track_tags(self, qapp, isolated_files):
+        """Тест фонового читання метаданих"""
+        player = AudioPlayer()
+        
+        tmp_files = []
+        for i in range(3):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp.write(b'fake audio data')
+                tmp_files.append(tmp.name)
+        
+        received = {}
+        player.track_tags_ready.connect(lambda path, info: received.update({path: info}))
+        
+        try:
+            player.prefetch_track_tags(tmp_files)
+            assert player.get_metadata_prefetcher().wait(5000)
+            qapp.processEvents()
+            
+            assert set(received) == set(tmp_files)
+            for tmp_path in tmp_files:
+                assert player.get_cached_track_tags(tmp_path) is not None
+        finally:
+            for tmp_path in tmp_files:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    def test_get_track_infos(self, qapp, isolated_files):
+        """Тест пакетного читання метаданих пулом процесів"""
+        player = AudioPlayer()
+        
+        tmp_files = []
+        for i in range(4):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp.write(b'fake audio data')
+                tmp_files.append(tmp.name)
+        
+        try:
+            # chunk_size=1 змушує використати пул процесів
+            infos = list(player.get_track_infos(tmp_files + ["/nonexistent/file.mp3"], chunk_size=1, max_workers=2))
+            assert len(infos) == 5
+            assert {info['file_path'] for info in infos} == set(tmp_files) | {"/nonexistent/file.mp3"}
+            for tmp_path in tmp_files:
+                assert player.get_cached_track_tags(tmp_path) is not None
+            
+            # Повторний виклик бере дані з індексу
+            infos = list(player.get_track_infos(tmp_files))
+            assert len(infos) == 4
+        finally:
+            for tmp_path in tmp_files:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
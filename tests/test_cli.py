@@ -0,0 +1,60 @@
+"""
+Тести для консольних команд
+"""
+import pytest
+import tempfile
+import json
+from pathlib import Path
+from player.cli import build_parser, run_command
+from player.utils import library_scanner, metadata_index
+
+
+@pytest.fixture
+def music_dir(monkeypatch):
+    """Фікстура: папка з аудіофайлами та окремі файли знімків та індексу"""
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr(library_scanner, 'SNAPSHOT_FILE', Path(cache_dir) / "snapshots.pkl")
+        monkeypatch.setattr(metadata_index, 'INDEX_FILE', Path(cache_dir) / "index.db")
+        root = Path(tmp_dir)
+        (root / "sub").mkdir()
+        for name in ("b.mp3", "a.flac", "sub/c.ogg", "cover.jpg"):
+            (root / name).write_bytes(b'fake audio data')
+        yield root
+
+
+def _run(*argv):
+    return run_command(build_parser().parse_args([str(arg) for arg in argv]))
+
+
+class TestCli:
+    """Тести для підкоманд main.py"""
+
+    def test_parser(self):
+        """Тест розбору аргументів підкоманд"""
+        args = build_parser().parse_args(['index', '/music', '--workers', '2'])
+        assert args.command == 'index'
+        assert args.folders == ['/music']
+        assert args.workers == 2
+        assert args.chunk_size == 256
+
+    def test_scan(self, music_dir, capsys):
+        """Тест сканування зі звітом про швидкість"""
+        assert _run('scan', music_dir) == 0
+        output = capsys.readouterr().out
+        assert "Нових: 3" in output
+        assert "файлів/с" in output and "МБ/с" in output
+
+        assert _run('scan', music_dir / "missing") == 2
+
+    def test_index(self, music_dir, capsys):
+        """Тест заповнення індексу метаданих"""
+        assert _run('index', music_dir) == 0
+        assert "Записів в індексі: 3" in capsys.readouterr().out
+
+    def test_export_playlist(self, music_dir):
+        """Тест експорту в JSON з сортуванням за назвою"""
+        output = music_dir / "playlist.json"
+        assert _run('export-playlist', music_dir, '-o', output, '--sort', 'title') == 0
+
+        data = json.loads(output.read_text(encoding='utf-8'))
+        assert [Path(track).name for track in data['tracks']] == ["a.flac", "b.mp3", "c.ogg"]
@@ -0,0 +1,125 @@
+"""
+Тести для модуля fast_tags
+"""
+import pytest
+import tempfile
+import struct
+import os
+from pathlib import Path
+from mutagen import File as MutagenFile
+from mutagen.id3 import ID3, TIT2, TPE1, TALB, APIC
+from mutagen.ogg import OggPage
+from player.utils.fast_tags import read_fast_tags
+
+
+@pytest.fixture
+def tmp_dir():
+    """Фікстура для тимчасової папки"""
+    with tempfile.TemporaryDirectory() as path:
+        yield Path(path)
+
+
+def _vorbis_comment(comments):
+    """Формує Vorbis-коментар"""
+    vendor = b'test'
+    data = struct.pack('<I', len(vendor)) + vendor + struct.pack('<I', len(comments))
+    for comment in comments:
+        data += struct.pack('<I', len(comment)) + comment
+    return data
+
+
+def _atom(atom_type, payload):
+    """Формує атом MP4"""
+    return struct.pack('>I', 8 + len(payload)) + atom_type + payload
+
+
+class TestFastTags:
+    """Тести для швидкого читання тегів"""
+
+    def test_mp3(self, tmp_dir):
+        """Тест MP3 з ID3v2 та великою обкладинкою"""
+        path = tmp_dir / "song.mp3"
+        # 100 фреймів MPEG1 Layer III, 128 кбіт/с, 44100 Гц
+        frame = b'\xff\xfb\x90\x64' + b'\x00' * 413
+        path.write_bytes(frame * 100)
+
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text='Пісня'))
+        tags.add(TPE1(encoding=1, text='Artist'))
+        tags.add(TALB(encoding=0, text='Album'))
+        tags.add(APIC(encoding=3, mime='image/jpeg', type=3, desc='', data=b'\x00' * 1024 * 1024))
+        tags.save(str(path))
+
+        result = read_fast_tags(str(path))
+        assert result is not None
+        assert result['title'] == 'Пісня'
+        assert result['artist'] == 'Artist'
+        assert result['album'] == 'Album'
+
+        expected = int(MutagenFile(str(path)).info.length * 1000)
+        assert abs(result['duration'] - expected) < 100
+
+    def test_flac(self, tmp_dir):
+        """Тест FLAC з STREAMINFO, VORBIS_COMMENT та PICTURE"""
+        path = tmp_dir / "song.flac"
+        sample_rate, total_samples = 44100, 44100 * 3
+        packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | total_samples
+        streaminfo = struct.pack('>HH', 4096, 4096) + b'\x00' * 6 + struct.pack('>Q', packed) + b'\x00' * 16
+        comment = _vorbis_comment([b'TITLE=Song', b'artist=Artist', b'ALBUM=Album'])
+        picture = b'\x00' * 100000
+
+        data = b'fLaC'
+        data += bytes([0]) + len(streaminfo).to_bytes(3, 'big') + streaminfo
+        data += bytes([4]) + len(comment).to_bytes(3, 'big') + comment
+        data += bytes([0x80 | 6]) + len(picture).to_bytes(3, 'big') + picture
+        path.write_bytes(data)
+
+        result = read_fast_tags(str(path))
+        assert result == {'duration': 3000, 'title': 'Song', 'artist': 'Artist', 'album': 'Album'}
+        assert MutagenFile(str(path)).info.length == 3.0
+
+    def test_ogg_vorbis(self, tmp_dir):
+        """Тест Ogg Vorbis"""
+        path = tmp_dir / "song.ogg"
+        ident = b'\x01vorbis' + struct.pack('<IBIiii', 0, 2, 44100, 0, 128000, 0) + b'\xb8\x01'
+        comment = b'\x03vorbis' + _vorbis_comment([b'TITLE=Song', b'ARTIST=Artist', b'ALBUM=Album']) + b'\x01'
+        setup = b'\x05vorbis' + b'\x00' * 32
+
+        pages = []
+        for sequence, (packets, position) in enumerate([([ident], 0), ([comment, setup], 0), ([b'\x00' * 500], 44100 * 4)]):
+            page = OggPage()
+            page.serial = 1
+            page.sequence = sequence
+            page.position = position
+            page.packets = packets
+            page.first = sequence == 0
+            page.last = sequence == 2
+            pages.append(page.write())
+        path.write_bytes(b''.join(pages))
+
+        result = read_fast_tags(str(path))
+        assert result == {'duration': 4000, 'title': 'Song', 'artist': 'Artist', 'album': 'Album'}
+        assert MutagenFile(str(path)).info.length == 4.0
+
+    def test_mp4(self, tmp_dir):
+        """Тест M4A з mdat перед moov та обкладинкою covr"""
+        path = tmp_dir / "song.m4a"
+        mvhd = _atom(b'mvhd', b'\x00' * 4 + struct.pack('>IIII', 0, 0, 1000, 5000) + b'\x00' * 80)
+        ilst = _atom(b'ilst',
+                     _atom(b'\xa9nam', _atom(b'data', struct.pack('>II', 1, 0) + 'Пісня'.encode('utf-8'))) +
+                     _atom(b'\xa9ART', _atom(b'data', struct.pack('>II', 1, 0) + b'Artist')) +
+                     _atom(b'covr', _atom(b'data', struct.pack('>II', 13, 0) + b'\x00' * 100000)))
+        meta = _atom(b'meta', b'\x00' * 4 + _atom(b'hdlr', b'\x00' * 25) + ilst)
+        moov = _atom(b'moov', mvhd + _atom(b'udta', meta))
+        data = _atom(b'ftyp', b'M4A \x00\x00\x00\x00') + _atom(b'mdat', b'\x00' * 100000) + moov
+        path.write_bytes(data)
+
+        result = read_fast_tags(str(path))
+        assert result == {'duration': 5000, 'title': 'Пісня', 'artist': 'Artist'}
+
+    def test_unsupported(self, tmp_dir):
+        """Тест непідтримуваного формату (повертає None для mutagen)"""
+        path = tmp_dir / "song.mp3"
+        path.write_bytes(b'fake audio data')
+        assert read_fast_tags(str(path)) is None
+        assert read_fast_tags(str(tmp_dir / "missing.mp3")) is None
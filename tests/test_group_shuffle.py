@@ -0,0 +1,121 @@
+"""
+Тести для модуля group_shuffle
+"""
+import random
+from itertools import groupby
+from player.utils.group_shuffle import GroupShuffle, album_key, folder_key
+
+
+def _paths():
+    return [f"/music/{folder}/{track:02d}.mp3" for folder in "abcde" for track in range(4)]
+
+
+def _shuffle(tracks, key_func=folder_key, infos=None, seed=0):
+    """Групи над змінним списком треків"""
+    infos = infos if infos is not None else {}
+    get_infos = lambda paths: {path: infos[path] for path in paths if path in infos}
+    return GroupShuffle(lambda: list(tracks), key_func, get_infos, tracks.index,
+                        lambda track: track in tracks, random.Random(seed))
+
+
+def _folders(played):
+    return [folder for folder, _ in groupby(played, key=lambda track: track.split('/')[2])]
+
+
+class TestGroupKeys:
+    """Тести ключів груп"""
+
+    def test_keys(self):
+        """Тест: альбом з тегів, без тегів - папка"""
+        path = "/music/a/01.mp3"
+        assert folder_key(path) == ('dir', "/music/a")
+        assert album_key(path, None) == ('dir', "/music/a")
+        assert album_key(path, {'artist': "Гурт", 'album': "Альбом"}) == ('album', "гурт", "альбом")
+        assert album_key(path, {'artist': "ГУРТ", 'album': "АЛЬБОМ"}) == album_key(path, {'artist': "Гурт", 'album': "Альбом"})
+
+
+class TestGroupShuffle:
+    """Тести для GroupShuffle"""
+
+    def test_whole_groups_in_order(self):
+        """Тест: кожна група відтворюється цілком і в порядку плейлиста"""
+        tracks = _paths()
+        shuffle = _shuffle(tracks)
+        played = [shuffle.next() for _ in range(len(tracks))]
+
+        assert sorted(played) == sorted(tracks)
+        assert len(_folders(played)) == 5
+        for folder in _folders(played):
+            group = [track for track in played if track.split('/')[2] == folder]
+            assert group == sorted(group)
+
+    def test_reset_finishes_current_group(self):
+        """Тест: після reset дограє група поточного треку"""
+        tracks = _paths()
+        shuffle = _shuffle(tracks)
+        shuffle.reset("/music/c/01.mp3")
+
+        assert [shuffle.next() for _ in range(2)] == ["/music/c/02.mp3", "/music/c/03.mp3"]
+        played = [shuffle.next() for _ in range(16)]
+        assert 'c' not in _folders(played)
+        assert len(_folders(played)) == 4
+
+    def test_add_remove_and_regroup(self):
+        """Тест: нові треки та групи враховуються, видалені - пропускаються"""
+        tracks = _paths()
+        infos = {}
+        shuffle = _shuffle(tracks, album_key, infos)
+        assert shuffle.get_group_count() == 5
+
+        tracks.append("/music/f/01.mp3")
+        shuffle.add("/music/f/01.mp3")
+        tracks.remove("/music/a/00.mp3")
+        assert shuffle.get_group_count() == 6
+
+        # Теги прочитано - треки двох папок належать одному альбому
+        for track in tracks:
+            if track.split('/')[2] in "de":
+                shuffle.regroup(track, {'artist': "Гурт", 'album': "Альбом"})
+        assert shuffle.get_group_count() == 5
+
+        played = [shuffle.next() for _ in range(len(tracks))]
+        assert sorted(played) == sorted(tracks)
+        album = [track for track in played if track.split('/')[2] in "de"]
+        assert played[played.index(album[0]):][:8] == album
+
+    def test_build_from_known_tags(self):
+        """Тест: альбоми з тегів, відомих на момент побудови, одним запитом"""
+        tracks = _paths()
+        infos = {track: {'artist': "Гурт", 'album': "Альбом"} for track in tracks[8:]}
+        requests = []
+        shuffle = GroupShuffle(lambda: list(tracks), album_key,
+                               lambda paths: requests.append(paths) or infos,
+                               tracks.index, lambda track: track in tracks)
+        assert shuffle.get_group_count() == 3
+        assert len(requests) == 1
+
+    def test_regroup_playing_group(self):
+        """Тест: трек, перенесений з групи, що грає, не звучить двічі"""
+        tracks = _paths()
+        shuffle = _shuffle(tracks, album_key)
+        shuffle.reset("/music/a/00.mp3")
+        shuffle.regroup("/music/a/02.mp3", {'artist': "Гурт", 'album': "Альбом"})
+
+        played = ["/music/a/00.mp3"] + [shuffle.next() for _ in range(len(tracks) - 1)]
+        assert sorted(played) == sorted(tracks)
+
+    def test_set_current(self):
+        """Тест: вибраний трек продовжує свою групу"""
+        tracks = _paths()
+        shuffle = _shuffle(tracks)
+        shuffle.next()
+        shuffle.set_current("/music/e/02.mp3")
+        assert shuffle.next() == "/music/e/03.mp3"
+        assert shuffle.next().split('/')[2] != 'e'
+
+    def test_single_group_and_empty(self):
+        """Тест: єдина група повторюється, без треків - None"""
+        tracks = ["/music/a/00.mp3", "/music/a/01.mp3"]
+        shuffle = _shuffle(tracks)
+        assert [shuffle.next() for _ in range(4)] == tracks * 2
+        assert _shuffle([]).next() is None
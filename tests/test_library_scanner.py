@@ -0,0 +1,156 @@
+"""
+Тести для модуля library_scanner
+"""
+import pytest
+import tempfile
+import os
+from pathlib import Path
+from player.utils.library_scanner import scan_audio_files, is_audio_file, LibraryScanner
+
+
+@pytest.fixture
+def library():
+    """Фікстура з деревом папок"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        (root / "b_album").mkdir()
+        (root / "a_album" / "cd2").mkdir(parents=True)
+        for name in ["a_album/01.mp3", "a_album/02.FLAC", "a_album/cover.jpg",
+                     "a_album/cd2/01.ogg", "b_album/01.m4a", "top.wav", "notes.txt"]:
+            (root / name).write_bytes(b'data')
+        yield root
+
+
+@pytest.fixture
+def snapshot_file():
+    """Фікстура для файлу знімків (поза деревом бібліотеки)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield Path(tmp_dir) / "snapshots.pkl"
+
+
+def _age_tree(root):
+    """Зсуває mtime папок у минуле, щоб знімки вважались стабільними"""
+    past = 1_000_000_000
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (past, past))
+
+
+class TestLibraryScanner:
+    """Тести для сканера бібліотеки"""
+
+    def test_is_audio_file(self):
+        """Тест фільтра розширень"""
+        assert is_audio_file("/music/song.MP3")
+        assert not is_audio_file("/music/cover.jpg")
+
+    def test_recursive_scan(self, library):
+        """Тест рекурсивного сканування за один прохід"""
+        found = [os.path.relpath(p, library) for p in scan_audio_files([str(library)])]
+        expected = ["top.wav", "a_album/01.mp3", "a_album/02.FLAC", "a_album/cd2/01.ogg", "b_album/01.m4a"]
+        assert found == [os.path.normpath(p) for p in expected]
+
+    def test_scan_files_and_missing(self, library):
+        """Тест сканування окремих файлів та неіснуючих шляхів"""
+        paths = [str(library / "top.wav"), str(library / "notes.txt"), str(library / "missing")]
+        assert list(scan_audio_files(paths)) == [str(library / "top.wav")]
+
+    @pytest.mark.skipif(not hasattr(os, 'symlink') or os.name == 'nt', reason="Потрібні символічні посилання")
+    def test_symlink_loop(self, library):
+        """Тест захисту від циклів символічних посилань"""
+        os.symlink(library, library / "b_album" / "loop")
+
+        found = list(scan_audio_files([str(library)]))
+        assert len(found) == 5
+
+        found = list(scan_audio_files([str(library)], follow_symlinks=True))
+        assert len(found) == 5
+
+
+class TestIncrementalScanner:
+    """Тести для інкрементального сканера"""
+
+    def test_first_scan(self, library, snapshot_file):
+        """Тест першого (повного) сканування"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        delta = scanner.scan(str(library))
+        assert len(delta.added) == 5
+        assert delta.removed == [] and delta.changed == []
+        assert delta.dirs_listed == 4
+        assert scanner.get_files(str(library)) == list(scan_audio_files([str(library)]))
+        assert scanner.get_roots() == [str(library)]
+
+    def test_rescan_unchanged(self, library, snapshot_file):
+        """Тест пересканування без змін (вміст папок не перечитується)"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        _age_tree(library)
+        scanner.scan(str(library))
+        delta = scanner.scan(str(library))
+        assert delta.added == [] and delta.removed == [] and delta.changed == []
+        assert delta.dirs_listed == 0
+        assert delta.dirs_skipped == 4
+
+    def test_rescan_delta(self, library, snapshot_file):
+        """Тест пересканування зі змінами у вкладених папках"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        _age_tree(library)
+        scanner.scan(str(library))
+
+        (library / "a_album" / "cd2" / "02.ogg").write_bytes(b'new')
+        (library / "a_album" / "01.mp3").unlink()
+        (library / "a_album" / "02.FLAC").write_bytes(b'changed data')
+        (library / "new_album").mkdir()
+        (library / "new_album" / "01.mp3").write_bytes(b'data')
+        os.unlink(library / "b_album" / "01.m4a")
+        os.rmdir(library / "b_album")
+
+        # Знімки зберігаються між запусками
+        delta = LibraryScanner(snapshot_file=snapshot_file).scan(str(library))
+        rel = lambda paths: sorted(os.path.relpath(p, library) for p in paths)
+        assert rel(delta.added) == [os.path.normpath("a_album/cd2/02.ogg"), os.path.normpath("new_album/01.mp3")]
+        assert rel(delta.removed) == [os.path.normpath("a_album/01.mp3"), os.path.normpath("b_album/01.m4a")]
+        assert rel(delta.changed) == [os.path.normpath("a_album/02.FLAC")]
+
+    def test_forget(self, library, snapshot_file):
+        """Тест видалення папки зі сканера"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        scanner.scan(str(library))
+        scanner.forget(str(library))
+        assert scanner.get_roots() == []
+        assert scanner.get_files(str(library)) == []
+
+    def test_rename_detection(self, library, snapshot_file):
+        """Тест розпізнавання переміщень (однакові розмір та mtime)"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        _age_tree(library)
+        scanner.scan(str(library))
+
+        os.rename(library / "a_album" / "cd2", library / "b_album" / "cd2")
+        os.rename(library / "top.wav", library / "a_album" / "renamed.wav")
+
+        delta = scanner.scan(str(library))
+        assert delta.added == [] and delta.removed == []
+        assert sorted(delta.renamed) == sorted([
+            (str(library / "a_album" / "cd2" / "01.ogg"), str(library / "b_album" / "cd2" / "01.ogg")),
+            (str(library / "top.wav"), str(library / "a_album" / "renamed.wav")),
+        ])
+
+        playlist = [str(library / "top.wav"), str(library / "a_album" / "01.mp3")]
+        assert delta.apply_to(playlist) == [str(library / "a_album" / "renamed.wav"), playlist[1]]
+
+    def test_rescan_directories(self, library, snapshot_file):
+        """Тест пересканування окремих папок (без обходу відомих вкладених)"""
+        scanner = LibraryScanner(snapshot_file=snapshot_file)
+        scanner.scan(str(library))
+
+        (library / "a_album" / "cd2" / "02.ogg").write_bytes(b'new')
+        (library / "a_album" / "cd3").mkdir()
+        (library / "a_album" / "cd3" / "01.mp3").write_bytes(b'new data')
+
+        delta = scanner.rescan_directories([str(library / "a_album")])
+        # cd2 відома і не перечитується; cd3 нова і сканується повністю
+        assert delta.added == [str(library / "a_album" / "cd3" / "01.mp3")]
+        assert delta.dirs_listed == 2
+        assert str(library / "a_album" / "cd3") in scanner.get_directories(str(library))
+
+        delta = scanner.rescan_directories([str(library / "a_album" / "cd2")])
+        assert delta.added == [str(library / "a_album" / "cd2" / "02.ogg")]
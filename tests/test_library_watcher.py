@@ -0,0 +1,89 @@
+"""
+Тести для модуля library_watcher
+"""
+import pytest
+import tempfile
+import os
+from pathlib import Path
+from PyQt6.QtWidgets import QApplication
+from player.utils.library_scanner import LibraryScanner
+from player.utils.library_watcher import LibraryWatcher
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Фікстура для QApplication"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def watcher(qapp):
+    """Фікстура зі спостерігачем над тимчасовою бібліотекою"""
+    with tempfile.TemporaryDirectory() as library_dir, tempfile.TemporaryDirectory() as cache_dir:
+        root = Path(library_dir)
+        (root / "album").mkdir()
+        (root / "album" / "01.mp3").write_bytes(b'data')
+        scanner = LibraryScanner(snapshot_file=Path(cache_dir) / "snapshots.pkl")
+        library_watcher = LibraryWatcher(scanner, debounce_ms=10)
+        library_watcher.watch(str(root))
+        yield library_watcher, root
+        library_watcher.stop()
+
+
+def _wait_for_change(qapp, watcher, timeout_ms=3000):
+    """Чекає на сигнал library_changed"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    received = []
+    loop = QEventLoop()
+    watcher.library_changed.connect(lambda delta: (received.append(delta), loop.quit()))
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    return received[0] if received else None
+
+
+class TestLibraryWatcher:
+    """Тести для спостерігача за бібліотекою"""
+
+    def test_watch(self, watcher):
+        """Тест нагляду за всіма папками дерева"""
+        library_watcher, root = watcher
+        assert library_watcher.get_folders() == [str(root)]
+        assert sorted(library_watcher._watcher.directories()) == [str(root), str(root / "album")]
+
+    def test_process_pending(self, watcher):
+        """Тест пакетної обробки змін у папці"""
+        library_watcher, root = watcher
+        received = []
+        library_watcher.library_changed.connect(received.append)
+
+        os.rename(root / "album" / "01.mp3", root / "album" / "02.mp3")
+        (root / "album" / "03.mp3").write_bytes(b'new data')
+        library_watcher._on_directory_changed(str(root / "album"))
+        library_watcher.process_pending()
+
+        assert len(received) == 1
+        delta = received[0]
+        assert delta.renamed == [(str(root / "album" / "01.mp3"), str(root / "album" / "02.mp3"))]
+        assert delta.added == [str(root / "album" / "03.mp3")]
+
+    def test_filesystem_event(self, qapp, watcher):
+        """Тест реакції на подію файлової системи"""
+        library_watcher, root = watcher
+        (root / "album" / "cd2").mkdir()
+        (root / "album" / "cd2" / "01.flac").write_bytes(b'data')
+
+        delta = _wait_for_change(qapp, library_watcher)
+        if delta is None:
+            pytest.skip("Події файлової системи недоступні")
+        assert delta.added == [str(root / "album" / "cd2" / "01.flac")]
+        assert str(root / "album" / "cd2") in library_watcher._watcher.directories()
+
+    def test_unwatch(self, watcher):
+        """Тест припинення нагляду"""
+        library_watcher, root = watcher
+        library_watcher.unwatch(str(root))
+        assert library_watcher.get_folders() == []
+        assert library_watcher._watcher.directories() == []
@@ -0,0 +1,74 @@
+"""
+Тести для модуля metadata_cache
+"""
+import tempfile
+import os
+from player.utils.metadata_cache import TrackTagsCache
+from player.utils.metadata_index import get_file_signature
+
+
+class TestTrackTagsCache:
+    """Тести для класу TrackTagsCache"""
+
+    def test_hit_and_miss(self):
+        """Тест влучань та промахів"""
+        cache = TrackTagsCache()
+        assert cache.get("/music/a.mp3") is None
+
+        cache.put("/music/a.mp3", None, {'title': 'A'})
+        assert cache.get("/music/a.mp3") == {'title': 'A'}
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_eviction_by_count(self):
+        """Тест витіснення найдавніше використаних записів"""
+        cache = TrackTagsCache(max_entries=2)
+        cache.put("/music/a.mp3", None, {'title': 'A'})
+        cache.put("/music/b.mp3", None, {'title': 'B'})
+        cache.get("/music/a.mp3")  # a стає найсвіжішим
+        cache.put("/music/c.mp3", None, {'title': 'C'})
+
+        assert cache.get("/music/b.mp3") is None
+        assert cache.get("/music/a.mp3") is not None
+        assert cache.get("/music/c.mp3") is not None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_eviction_by_bytes(self):
+        """Тест витіснення за обмеженням розміру"""
+        cache = TrackTagsCache(max_bytes=2000)
+        for i in range(50):
+            cache.put(f"/music/{i}.mp3", None, {'title': 'x' * 100})
+
+        stats = cache.get_stats()
+        assert stats['bytes'] <= 2000
+        assert stats['evictions'] > 0
+        assert stats['entries'] < 50
+
+    def test_revalidation_by_mtime(self):
+        """Тест перевірки актуальності за mtime"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+            tmp.write(b'fake audio data')
+            tmp_path = tmp.name
+
+        try:
+            cache = TrackTagsCache(revalidate_interval=0)
+            cache.put(tmp_path, get_file_signature(tmp_path), {'title': 'Song'})
+            assert cache.get(tmp_path) is not None
+
+            with open(tmp_path, 'ab') as f:
+                f.write(b'more data')
+            assert cache.get(tmp_path) is None
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def test_invalidate(self):
+        """Тест ручної інвалідації"""
+        cache = TrackTagsCache()
+        cache.put("/music/a.mp3", None, {'title': 'A'})
+        cache.invalidate("/music/a.mp3")
+        assert cache.get("/music/a.mp3") is None
+        assert cache.get_stats()['bytes'] == 0
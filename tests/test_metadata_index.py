@@ -0,0 +1,142 @@
+"""
+Тести для модуля metadata_index
+"""
+import pytest
+import tempfile
+import os
+from pathlib import Path
+from player.utils.metadata_index import MetadataIndex, get_file_signature
+
+
+@pytest.fixture
+def index():
+    """Фікстура для індексу у тимчасовій папці"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        idx = MetadataIndex(Path(tmp_dir) / "index.db")
+        yield idx
+        idx.close()
+
+
+class TestMetadataIndex:
+    """Тести для класу MetadataIndex"""
+
+    def test_put_and_get(self, index):
+        """Тест збереження та читання запису"""
+        info = {'title': 'Song', 'artist': 'Artist', 'album': 'Album', 'duration': 1000, 'format': 'MP3'}
+        index.put("/music/song.mp3", 100, 2000, info)
+
+        result = index.get("/music/song.mp3", 100, 2000)
+        assert result is not None
+        assert result['title'] == 'Song'
+        assert result['artist'] == 'Artist'
+        assert result['album'] == 'Album'
+        assert result['duration'] == 1000
+        assert result['format'] == 'MP3'
+        assert result['file_path'] == "/music/song.mp3"
+        assert index.get_count() == 1
+
+    def test_stale_entry(self, index):
+        """Тест застарілого запису (змінено mtime або розмір)"""
+        info = {'title': 'Song', 'artist': 'Artist', 'album': 'Album', 'duration': 1000, 'format': 'MP3'}
+        index.put("/music/song.mp3", 100, 2000, info)
+
+        assert index.get("/music/song.mp3", 101, 2000) is None
+        assert index.get("/music/song.mp3", 100, 2001) is None
+        assert index.get("/music/other.mp3", 100, 2000) is None
+
+    def test_remove_and_clear(self, index):
+        """Тест видалення записів"""
+        info = {'title': 'Song', 'artist': 'Artist', 'album': 'Album', 'duration': 1000, 'format': 'MP3'}
+        index.put_many([
+            ("/music/a.mp3", 1, 1, info),
+            ("/music/b.mp3", 1, 1, info),
+        ])
+        assert index.get_count() == 2
+
+        index.remove("/music/a.mp3")
+        assert index.get("/music/a.mp3", 1, 1) is None
+        assert index.get_count() == 1
+
+        index.clear()
+        assert index.get_count() == 0
+
+    def test_persistence(self):
+        """Тест збереження індексу між сесіями"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = Path(tmp_dir) / "index.db"
+            info = {'title': 'Song', 'artist': 'Artist', 'album': 'Album', 'duration': 1000, 'format': 'MP3'}
+
+            idx = MetadataIndex(db_path)
+            idx.put("/music/song.mp3", 100, 2000, info)
+            idx.close()
+
+            idx = MetadataIndex(db_path)
+            assert idx.get("/music/song.mp3", 100, 2000)['title'] == 'Song'
+            idx.close()
+
+    def test_file_signature(self):
+        """Тест підпису файлу"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+            tmp.write(b'fake audio data')
+            tmp_path = tmp.name
+
+        try:
+            signature = get_file_signature(tmp_path)
+            assert signature is not None
+            assert signature[1] == len(b'fake audio data')
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        assert get_file_signature("/nonexistent/file.mp3") is None
+
+
+class TestFacets:
+    """Тести для агрегатів перегляду бібліотеки"""
+
+    @staticmethod
+    def _info(artist, album, duration, genre=None):
+        return {'title': 'Song', 'artist': artist, 'album': album, 'duration': duration,
+                'format': 'MP3', 'genre': genre}
+
+    def test_aggregates(self, index):
+        """Тест лічильників та тривалостей виконавців, альбомів і жанрів"""
+        index.put_many([
+            ("/music/a1.mp3", 1, 1, self._info('Artist', 'One', 1000, 'Rock')),
+            ("/music/a2.mp3", 1, 1, self._info('Artist', 'One', 2000, 'Rock')),
+            ("/music/a3.mp3", 1, 1, self._info('Artist', 'Two', 3000)),
+            ("/music/b1.mp3", 1, 1, self._info('Band', 'Three', 4000, 'Pop')),
+        ])
+
+        assert index.get_artists() == [('Artist', 3, 6000), ('Band', 1, 4000)]
+        assert index.get_albums('Artist') == [('One', 2, 3000), ('Two', 1, 3000)]
+        assert index.get_genres() == [('', 1, 3000), ('Pop', 1, 4000), ('Rock', 2, 3000)]
+
+        tracks = index.get_facet_tracks(artist='Artist', album='One')
+        assert [path for path, _, _ in tracks] == ["/music/a1.mp3", "/music/a2.mp3"]
+        assert [path for path, _, _ in index.get_facet_tracks(genre='')] == ["/music/a3.mp3"]
+
+    def test_incremental_updates(self, index):
+        """Тест оновлення агрегатів при зміні, перейменуванні та видаленні"""
+        index.put("/music/a1.mp3", 1, 1, self._info('Artist', 'One', 1000))
+        index.put("/music/a2.mp3", 1, 1, self._info('Artist', 'One', 2000))
+
+        # Повторний запис того самого шляху не подвоює лічильники
+        index.put("/music/a2.mp3", 2, 2, self._info('Artist', 'One', 2500))
+        assert index.get_albums('Artist') == [('One', 2, 3500)]
+
+        # Зміна виконавця переносить трек в іншу групу
+        index.put("/music/a1.mp3", 2, 2, self._info('Other', 'One', 1000))
+        assert index.get_artists() == [('Artist', 1, 2500), ('Other', 1, 1000)]
+
+        index.rename("/music/a2.mp3", "/music/moved.mp3")
+        assert index.get_artists() == [('Artist', 1, 2500), ('Other', 1, 1000)]
+
+        # Порожні групи зникають
+        index.remove_many(["/music/moved.mp3"])
+        assert index.get_artists() == [('Other', 1, 1000)]
+        assert index.get_albums('Artist') == []
+
+        index.clear()
+        assert index.get_artists() == []
+        assert index.get_genres() == []
@@ -0,0 +1,91 @@
+"""
+Тести для модуля navigation
+"""
+from player.utils.navigation import NavigationHistory
+
+
+class TestNavigationHistory:
+    """Тести для NavigationHistory"""
+
+    def test_back_and_forward(self):
+        """Тест кроків назад та вперед"""
+        history = NavigationHistory()
+        for track in "abcd":
+            history.push(track)
+
+        assert history.back() == 'c'
+        assert history.back() == 'b'
+        assert history.forward() == 'c'
+        assert history.current() == 'c'
+        assert history.forward() == 'd'
+        assert history.forward() is None
+        assert history.current() == 'd'
+
+    def test_push_after_back(self):
+        """Тест: новий трек після кроку назад відкидає записи попереду"""
+        history = NavigationHistory()
+        for track in "abcd":
+            history.push(track)
+        history.back()
+        history.back()
+
+        # Той самий трек, що був попереду, лише зсуває курсор
+        history.push('c')
+        assert history.forward() == 'd'
+
+        history.back()
+        history.back()
+        history.push('x')
+        assert len(history) == 3
+        assert history.forward() is None
+        assert history.back() == 'b'
+
+    def test_push_back(self):
+        """Тест: трек перед поточним не стає кроком вперед"""
+        history = NavigationHistory(max_size=3)
+        history.push('e')
+        for track in "dcb":
+            history.push_back(track)
+            assert history.current() == track
+            assert history.back() is None
+
+        # Повна історія: відкидається найдальший запис попереду
+        assert len(history) == 3
+        assert history.forward() == 'c'
+        assert history.forward() == 'd'
+        assert history.forward() is None
+
+    def test_repeat_not_recorded(self):
+        """Тест: повтор поточного треку (RepeatMode.ONE) не додає запис"""
+        history = NavigationHistory()
+        history.push('a')
+        history.push('a')
+        assert len(history) == 1
+        assert history.back() is None
+
+    def test_bounded(self):
+        """Тест: найстаріші записи відкидаються"""
+        history = NavigationHistory(max_size=3)
+        for track in "abcde":
+            history.push(track)
+
+        assert len(history) == 3
+        assert history.back() == 'd'
+        assert history.back() == 'c'
+        assert history.back() is None
+        assert history.current() == 'c'
+
+    def test_skips_removed(self):
+        """Тест: треки, яких уже немає, пропускаються"""
+        existing = set("abcd")
+        history = NavigationHistory(contains=existing.__contains__)
+        for track in "abcd":
+            history.push(track)
+        existing.discard('c')
+
+        assert history.back() == 'b'
+        assert history.forward() == 'd'
+        existing.discard('a')
+        history.back()
+        assert history.back() is None
+        assert history.current() == 'b'
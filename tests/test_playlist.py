@@ -2,6 +2,7 @@
 Тести для модуля playlist
 """
 import pytest
+import random
 import tempfile
 import os
 from pathlib import Path
@@ -73,6 +74,14 @@ class TestPlaylist:
                 if os.path.exists(tmp_path):
                     os.unlink(tmp_path)
     
+    def test_add_tracks_without_validation(self):
+        """Тест додавання без перевірки наявності файлів"""
+        playlist = Playlist()
+        added = playlist.add_tracks(["/nonexistent1.mp3", "/nonexistent2.mp3", "/nonexistent1.mp3"],
+                                    validate=False)
+        assert added == 2
+        assert playlist.get_tracks() == ["/nonexistent1.mp3", "/nonexistent2.mp3"]
+    
     def test_remove_track(self):
         """Тест видалення треку"""
         playlist = Playlist()
@@ -131,6 +140,153 @@ class TestPlaylist:
                 if os.path.exists(tmp_path):
                     os.unlink(tmp_path)
     
+    def test_remove_tracks(self):
+        """Тест видалення кількох треків за шляхами"""
+        playlist = Playlist()
+        
+        tmp_files = []
+        for i in range(5):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files)
+            playlist.set_current_index(2)
+            
+            # Видаляємо трек перед поточним та сам поточний
+            removed = playlist.remove_tracks([tmp_files[0], tmp_files[2], "/nonexistent.mp3"])
+            assert removed == 2
+            assert playlist.get_tracks() == [tmp_files[1], tmp_files[3], tmp_files[4]]
+            assert playlist.get_current_track() == tmp_files[3]  # Має перейти до наступного
+            
+            # Видаляємо хвіст разом з поточним
+            playlist.remove_tracks(tmp_files[3:])
+            assert playlist.get_current_index() == 0
+            
+            playlist.remove_tracks(tmp_files)
+            assert playlist.get_current_index() == -1
+        finally:
+            for tmp_path in tmp_files:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    def test_index_of(self):
+        """Тест пошуку позиції треку після видалення, перейменування та очищення"""
+        playlist = Playlist()
+        
+        tmp_files = []
+        for i in range(5):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files[:4])
+            assert playlist.index_of(tmp_files[3]) == 3
+            assert playlist.index_of(tmp_files[4]) == -1
+            assert tmp_files[0] in playlist
+            
+            playlist.remove_track(1)
+            assert playlist.index_of(tmp_files[1]) == -1
+            assert playlist.index_of(tmp_files[2]) == 1
+            assert playlist.index_of(tmp_files[3]) == 2
+            
+            playlist.rename_track(tmp_files[2], tmp_files[4])
+            assert not playlist.contains(tmp_files[2])
+            assert playlist.index_of(tmp_files[4]) == 1
+            
+            playlist.remove_tracks([tmp_files[0]])
+            assert [playlist.index_of(path) for path in playlist.get_tracks()] == [0, 1]
+            
+            playlist.clear()
+            assert not playlist.contains(tmp_files[3])
+            assert playlist.add_track(tmp_files[3])
+            assert playlist.index_of(tmp_files[3]) == 0
+        finally:
+            for tmp_path in tmp_files:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    def test_move(self):
+        """Тест переносу треків зі збереженням поточного треку"""
+        paths = [f"/music/{i}.mp3" for i in range(6)]
+        playlist = Playlist()
+        playlist.add_tracks(paths, validate=False)
+        playlist.set_current_index(1)
+        
+        # Переносимо 1-2 в кінець
+        assert playlist.move(range(1, 3), 6)
+        assert playlist.get_tracks() == [paths[i] for i in (0, 3, 4, 5, 1, 2)]
+        assert playlist.get_current_track() == paths[1]
+        
+        # Переносимо останній трек на початок
+        assert playlist.move(range(5, 6), 0)
+        assert playlist.get_tracks() == [paths[i] for i in (2, 0, 3, 4, 5, 1)]
+        assert playlist.get_current_track() == paths[1]
+        assert [playlist.index_of(path) for path in playlist.get_tracks()] == list(range(6))
+        
+        # Перенос на місце та невірні діапазони
+        assert not playlist.move(range(1, 3), 3)
+        assert not playlist.move(range(4, 8), 0)
+        assert not playlist.move(range(0, 4, 2), 5)
+    
+    def test_apply_permutation(self):
+        """Тест перестановки треків (сортування)"""
+        paths = [f"/music/{i}.mp3" for i in range(4)]
+        playlist = Playlist()
+        playlist.add_tracks(paths, validate=False)
+        playlist.set_current_index(0)
+        
+        assert playlist.apply_permutation([3, 2, 1, 0])
+        assert playlist.get_tracks() == paths[::-1]
+        assert playlist.get_current_index() == 3
+        assert playlist.index_of(paths[0]) == 3
+        
+        assert not playlist.apply_permutation([0, 0, 1, 2])
+        assert not playlist.apply_permutation([0, 1])
+    
+    def test_tracks_view(self, monkeypatch):
+        """Тест: представлення треків лишається дійсним після переходу на компактне сховище"""
+        monkeypatch.setattr('player.playlist.COMPACT_THRESHOLD', 4)
+        paths = [f"/music/{i}.mp3" for i in range(5)]
+        playlist = Playlist()
+        playlist.add_tracks(paths[:2], validate=False)
+        view = playlist.get_tracks_view()
+        
+        playlist.add_tracks(paths[2:], validate=False)
+        assert playlist.is_compact()
+        assert list(view) == paths
+        assert list(view[1:3]) == paths[1:3]
+        assert paths[4] in view
+    
+    def test_compact_mode(self, monkeypatch):
+        """Тест автоматичного переходу на компактне сховище"""
+        import player.playlist
+        monkeypatch.setattr(player.playlist, 'COMPACT_THRESHOLD', 3)
+        playlist = Playlist()
+        
+        tmp_files = []
+        for i in range(4):
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
+                tmp_files.append(tmp.name)
+        
+        try:
+            playlist.add_tracks(tmp_files[:2])
+            assert not playlist.is_compact()
+            playlist.add_tracks(tmp_files[2:])
+            assert playlist.is_compact()
+            
+            playlist.set_current_index(1)
+            assert playlist.get_current_track() == tmp_files[1]
+            assert playlist.get_tracks() == tmp_files
+            
+            playlist.remove_track(0)
+            assert playlist.get_current_track() == tmp_files[1]
+            assert playlist.index_of(tmp_files[3]) == 2
+        finally:
+            for tmp_path in tmp_files:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
     def test_clear(self):
         """Тест очищення плейлисту"""
         playlist = Playlist()
@@ -266,3 +422,133 @@ class TestPlaylist:
                 if os.path.exists(tmp_path):
                     os.unlink(tmp_path)
 
+
+
+class TestPlaylistSignals:
+    """Тести сигналів змін плейлисту"""
+    
+    @staticmethod
+    def _record(playlist):
+        """Підключає всі сигнали та повертає список подій"""
+        events = []
+        playlist.rows_inserted.connect(lambda first, last: events.append(('inserted', first, last)))
+        playlist.rows_removed.connect(lambda first, last: events.append(('removed', first, last)))
+        playlist.rows_moved.connect(lambda start, end, dest: events.append(('moved', start, end, dest)))
+        playlist.row_changed.connect(lambda row: events.append(('changed', row)))
+        playlist.playlist_reset.connect(lambda: events.append(('reset',)))
+        playlist.current_index_changed.connect(lambda index: events.append(('current', index)))
+        return events
+    
+    def test_row_signals(self):
+        """Тест: кожна зміна повідомляє лише змінені рядки"""
+        paths = [f"/music/{i}.mp3" for i in range(6)]
+        playlist = Playlist()
+        events = self._record(playlist)
+        
+        playlist.add_tracks(paths[:4], validate=False)
+        playlist.add_tracks(paths[2:], validate=False)
+        assert events == [('inserted', 0, 3), ('inserted', 4, 5)]
+        
+        events.clear()
+        playlist.set_current_index(3)
+        playlist.remove_tracks([paths[0], paths[1], paths[4]])
+        assert events == [('current', 3), ('removed', 4, 4), ('removed', 0, 1), ('current', 1)]
+        
+        events.clear()
+        playlist.move(range(0, 1), 3)
+        playlist.rename_track(paths[5], "/music/new.mp3")
+        assert events == [('moved', 0, 0, 3), ('current', 0), ('changed', 1)]
+        
+        events.clear()
+        playlist.clear()
+        assert events == [('reset',), ('current', -1)]
+
+
+class TestPlaylistJournal:
+    """Тести журналу undo/redo"""
+    
+    def test_random_undo_redo(self):
+        """Тест: undo повертає кожен попередній стан, redo - наступний"""
+        rng = random.Random(3)
+        paths = [f"/music/{i}.mp3" for i in range(200)]
+        playlist = Playlist()
+        states = [(playlist.get_tracks(), playlist.get_current_index())]
+        
+        for _ in range(120):
+            count = playlist.get_count()
+            action = rng.random()
+            if count:
+                playlist.set_current_index(rng.randrange(count))
+                states[-1] = (playlist.get_tracks(), playlist.get_current_index())
+            if action < 0.3 or count < 3:
+                changed = playlist.add_tracks(rng.sample(paths, 5), validate=False) > 0
+            elif action < 0.45:
+                changed = playlist.remove_track(rng.randrange(count))
+            elif action < 0.6:
+                changed = playlist.remove_tracks(rng.sample(playlist.get_tracks(), 3)) > 0
+            elif action < 0.75:
+                start = rng.randrange(count - 1)
+                stop = rng.randint(start + 1, count - 1)
+                changed = playlist.move(range(start, stop), rng.choice([0, count]))
+            elif action < 0.85:
+                perm = list(range(count))
+                rng.shuffle(perm)
+                changed = playlist.apply_permutation(perm)
+            elif action < 0.93:
+                changed = playlist.rename_track(rng.choice(playlist.get_tracks()), f"/renamed/{rng.random()}.mp3")
+            else:
+                playlist.clear()
+                changed = count > 0
+            if changed:
+                states.append((playlist.get_tracks(), playlist.get_current_index()))
+        
+        for state in reversed(states[:-1]):
+            assert playlist.undo()
+            assert (playlist.get_tracks(), playlist.get_current_index()) == state
+            assert [playlist.index_of(path) for path in playlist.get_tracks()] == list(range(playlist.get_count()))
+        assert not playlist.undo()
+        
+        for state in states[1:]:
+            assert playlist.redo()
+            assert (playlist.get_tracks(), playlist.get_current_index()) == state
+        assert not playlist.redo()
+    
+    def test_new_edit_drops_redo(self):
+        """Тест: нова зміна після undo очищує стек повтору"""
+        playlist = Playlist()
+        playlist.add_tracks(["/a.mp3", "/b.mp3"], validate=False)
+        playlist.clear()
+        assert playlist.undo()
+        assert playlist.get_tracks() == ["/a.mp3", "/b.mp3"]
+        assert playlist.can_redo()
+        playlist.remove_track(0)
+        assert not playlist.can_redo()
+    
+    def test_budget(self):
+        """Тест: журнал не перевищує бюджет пам'яті, відкидаючи найстаріші зміни"""
+        paths = [f"/music/{i:04d}.mp3" for i in range(1000)]
+        playlist = Playlist(journal_budget=20_000)
+        playlist.add_tracks(paths, validate=False)
+        playlist.apply_permutation(list(range(999, -1, -1)))  # ~4 КБ
+        playlist.clear()  # ~200 КБ - більше за бюджет
+        assert not playlist.can_undo()
+        
+        playlist.set_journal_budget(0)
+        playlist.add_tracks(paths, validate=False)
+        assert not playlist.can_undo() and not playlist.undo()
+    
+    def test_unrecorded_removal(self):
+        """Тест: треки, прибрані системою, не повертаються через undo"""
+        playlist = Playlist()
+        playlist.add_tracks(["/a.mp3", "/b.mp3", "/c.mp3"], validate=False)
+        playlist.remove_track(0)
+        
+        playlist.rename_track("/b.mp3", "/moved/b.mp3", record=False)
+        assert playlist.undo()
+        assert playlist.get_tracks() == ["/a.mp3", "/moved/b.mp3", "/c.mp3"]
+        
+        playlist.remove_tracks(["/c.mp3"], record=False)
+        assert playlist.get_tracks() == ["/a.mp3", "/moved/b.mp3"]
+        assert not playlist.can_undo() and not playlist.can_redo()
+        assert not playlist.undo()
+        assert playlist.get_tracks() == ["/a.mp3", "/moved/b.mp3"]
@@ -0,0 +1,70 @@
+"""
+Тести для модуля playlist_view
+"""
+import pytest
+from PyQt6.QtCore import Qt, QModelIndex
+from PyQt6.QtWidgets import QApplication, QListWidget
+from player.playlist import Playlist
+from player.ui.playlist_view import PlaylistBinding
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Фікстура для QApplication"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _rows(widget):
+    """Повертає шляхи рядків списку"""
+    return [widget.item(row).data(Qt.ItemDataRole.UserRole) for row in range(widget.count())]
+
+
+class TestPlaylistBinding:
+    """Тести синхронізації списку з плейлистом"""
+
+    def test_incremental_updates(self, qapp):
+        """Тест: список повторює зміни плейлисту, не перестворюючи наявні рядки"""
+        paths = [f"/music/{i}.mp3" for i in range(5)]
+        playlist = Playlist()
+        playlist.add_tracks(paths[:3], validate=False)
+        widget = QListWidget()
+        binding = PlaylistBinding(playlist, widget, lambda item, path: item.setText(path))
+        first_item = widget.item(0)
+
+        playlist.add_tracks(paths[3:], validate=False)
+        assert _rows(widget) == paths
+        assert widget.item(0) is first_item
+
+        playlist.remove_tracks([paths[1], paths[3]])
+        playlist.move(range(0, 1), 3)
+        playlist.rename_track(paths[4], "/music/new.mp3")
+        assert _rows(widget) == playlist.get_tracks()
+        assert binding.item("/music/new.mp3").text() == "/music/new.mp3"
+        assert binding.item(paths[4]) is None
+
+        playlist.set_current_index(1)
+        assert widget.currentRow() == 1
+
+        playlist.apply_permutation([2, 1, 0])
+        assert _rows(widget) == playlist.get_tracks()
+
+        binding.unbind()
+        playlist.clear()
+        assert widget.count() == 3
+
+    def test_drag_in_widget(self, qapp):
+        """Тест: перетягування в списку переносить трек у плейлисті один раз"""
+        paths = [f"/music/{i}.mp3" for i in range(4)]
+        playlist = Playlist()
+        playlist.add_tracks(paths, validate=False)
+        widget = QListWidget()
+        PlaylistBinding(playlist, widget, lambda item, path: item.setText(path))
+        widget.model().rowsMoved.connect(
+            lambda parent, start, end, destination, row: playlist.move(range(start, end + 1), row))
+
+        widget.model().moveRow(QModelIndex(), 0, QModelIndex(), 3)
+        assert playlist.get_tracks() == [paths[1], paths[2], paths[0], paths[3]]
+        assert _rows(widget) == playlist.get_tracks()
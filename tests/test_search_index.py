@@ -0,0 +1,117 @@
+"""
+Тести для модуля search_index
+"""
+import pytest
+from player.utils.search_index import SearchIndex, tokenize, normalize, _edit_distance
+
+
+@pytest.fixture
+def index():
+    """Фікстура з кількома документами"""
+    search_index = SearchIndex()
+    search_index.add("/music/1.mp3", ("Bohemian Rhapsody", "Queen", "A Night at the Opera", "01"))
+    search_index.add("/music/2.mp3", ("Show Must Go On", "Queen", "Innuendo", "02"))
+    search_index.add("/music/3.mp3", ("Океан", "Океан Ельзи", "Модель", "03 okean"))
+    return search_index
+
+
+class TestSearchIndex:
+    """Тести для пошукового індексу"""
+
+    def test_tokenize(self):
+        """Тест нормалізації та розбиття на токени"""
+        assert tokenize("Show-Must Go_On!") == ["show", "must", "go_on"]
+        assert tokenize("ОКЕАН Ельзи") == ["океан", "ельзи"]
+        assert tokenize("") == []
+
+    def test_substring_search(self, index):
+        """Тест пошуку підрядка через триграми"""
+        assert index.search("rhaps") == ["/music/1.mp3"]
+        assert index.search("QUEEN") == ["/music/1.mp3", "/music/2.mp3"]
+        assert index.search("ельз") == ["/music/3.mp3"]
+        assert index.search("missing") == []
+
+    def test_short_prefix_search(self, index):
+        """Тест префіксного пошуку для коротких слів"""
+        assert index.search("o") == ["/music/1.mp3", "/music/2.mp3", "/music/3.mp3"]
+        assert index.search("ok") == ["/music/3.mp3"]
+        assert index.search("ue") == []  # Не префікс жодного токена
+
+    def test_multi_term_search(self, index):
+        """Тест запиту з кількох слів (усі слова мають збігтися)"""
+        assert index.search("queen innu") == ["/music/2.mp3"]
+        assert index.search("queen океан") == []
+        assert index.search("   ") == []
+
+    def test_update_and_remove(self, index):
+        """Тест інкрементального оновлення та видалення"""
+        index.add("/music/2.mp3", ("The Show Must Go On", "Queen", "Innuendo", "02"))
+        assert index.search("innuendo the") == ["/music/2.mp3"]
+
+        index.remove("/music/1.mp3")
+        assert "/music/1.mp3" not in index
+        assert len(index) == 2
+        assert index.search("rhaps") == []
+        assert index.search("bo") == []  # Токен зник зі словника
+
+        index.clear()
+        assert len(index) == 0
+        assert index.search("queen") == []
+
+    def test_limit(self, index):
+        """Тест обмеження кількості результатів"""
+        assert index.search("queen", limit=1) == ["/music/1.mp3"]
+
+    def test_normalize(self):
+        """Тест нормалізації: регістр, діакритика, транслітерація"""
+        assert normalize("Beyoncé") == "beyonce"
+        assert normalize("MÖTLEY") == "motley"
+        assert normalize("Ельзи") == "elzy"
+        assert normalize("Їжак") == "izhak"
+
+    def test_cross_script_search(self, index):
+        """Тест пошуку латиницею по кириличних тегах і навпаки"""
+        assert index.search("okean elzy") == ["/music/3.mp3"]
+        assert index.search("океан") == ["/music/3.mp3"]
+
+    def test_edit_distance(self):
+        """Тест обмеженої відстані редагування"""
+        assert _edit_distance("beatls", "beatles", 2) == 1
+        assert _edit_distance("abey", "abbey", 1) == 1
+        assert _edit_distance("qeuen", "queen", 1) == 1  # Перестановка
+        assert _edit_distance("abcdef", "uvwxyz", 2) == 3
+
+
+class TestRankedSearch:
+    """Тести для ранжованого пошуку з урахуванням помилок"""
+
+    @pytest.fixture
+    def library(self):
+        """Фікстура з бібліотекою для ранжування"""
+        search_index = SearchIndex()
+        search_index.add("/music/beatles/come.mp3", ("Come Together", "The Beatles", "Abbey Road", "01"))
+        search_index.add("/music/beatles/help.mp3", ("Help!", "The Beatles", "Help!", "01"))
+        search_index.add("/music/other/abbey.mp3", ("Abbey", "Beatless", "Covers", "01"))
+        search_index.add("/music/other/road.mp3", ("Road", "Someone", "Abbey Road Sessions", "02"))
+        return search_index
+
+    def test_typo_tolerance(self, library):
+        """Тест запиту з помилками"""
+        assert library.rank("beatls abey")[0] == "/music/beatles/come.mp3"
+        assert library.search("beatls abey") == []  # Точний пошук помилок не прощає
+
+    def test_ranking_order(self, library):
+        """Тест порядку: точні збіги вище за збіги з помилками"""
+        # Рівні оцінки - у порядку додавання
+        assert library.rank("abbey") == ["/music/beatles/come.mp3", "/music/other/abbey.mp3",
+                                         "/music/other/road.mp3"]
+
+        result = library.rank("beatles")
+        assert result[:2] == ["/music/beatles/come.mp3", "/music/beatles/help.mp3"]
+        assert result[2] == "/music/other/abbey.mp3"  # "beatless" - префіксний збіг
+
+    def test_short_terms_without_typos(self, library):
+        """Тест коротких слів (без допуску помилок)"""
+        assert library.rank("hlp") == []
+        assert library.rank("he") == ["/music/beatles/help.mp3"]
+        assert library.rank("", limit=5) == []
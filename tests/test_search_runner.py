@@ -0,0 +1,56 @@
+"""
+Тести для модуля search_runner
+"""
+import pytest
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from player.utils.search_index import SearchIndex
+from player.utils.search_runner import SearchRunner
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Фікстура для QApplication"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def runner(qapp):
+    """Фікстура з виконавцем запитів"""
+    index = SearchIndex()
+    index.add("/music/1.mp3", ("Come Together", "The Beatles", "Abbey Road", "01"))
+    index.add("/music/2.mp3", ("Bohemian Rhapsody", "Queen", "A Night at the Opera", "02"))
+    search_runner = SearchRunner(index, debounce_ms=20)
+    yield search_runner
+    search_runner.cancel()
+    search_runner.wait()
+
+
+def _collect(runner, timeout_ms=300):
+    """Збирає результати протягом timeout_ms"""
+    received = []
+    runner.results_ready.connect(lambda query, keys: received.append((query, keys)))
+    loop = QEventLoop()
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    return received
+
+
+class TestSearchRunner:
+    """Тести для фонового виконання запитів"""
+
+    def test_superseded_queries(self, runner):
+        """Тест: швидке введення дає лише результат останнього запиту"""
+        for query in ["b", "be", "bea", "beatls"]:
+            runner.submit(query)
+        received = _collect(runner)
+        assert received == [("beatls", ["/music/1.mp3"])]
+
+    def test_cancel(self, runner):
+        """Тест скасування запланованого запиту"""
+        runner.submit("queen")
+        runner.cancel()
+        assert _collect(runner) == []
@@ -0,0 +1,78 @@
+"""
+Тести для модуля shuffle
+"""
+import random
+from player.utils.shuffle import ShuffleEngine
+
+
+def _engine(items, seed=0):
+    """Рушій над змінним списком (видалення перевіряються через contains)"""
+    return ShuffleEngine(lambda: list(items), lambda item: item in items, random.Random(seed))
+
+
+class TestShuffleEngine:
+    """Тести для ShuffleEngine"""
+
+    def test_pass_without_repeats(self):
+        """Тест: прохід містить кожен елемент рівно один раз"""
+        items = list(range(100))
+        engine = _engine(items)
+        engine.reset(0)
+
+        drawn = [engine.next() for _ in range(99)]
+        assert sorted(drawn + [0]) == items
+
+        # Новий прохід не повторює останній елемент одразу
+        second = [engine.next() for _ in range(99)]
+        assert sorted(second + [drawn[-1]]) == items
+
+    def test_insert_and_remove_mid_pass(self):
+        """Тест: додані елементи потрапляють у прохід, видалені - ні"""
+        items = list(range(10))
+        engine = _engine(items)
+        drawn = [engine.next() for _ in range(3)]
+
+        removed = [item for item in items if item not in drawn][:2]
+        for item in removed:
+            items.remove(item)
+        items.extend([100, 101])
+        engine.add(100)
+        engine.add(101)
+
+        rest = [engine.next() for _ in range(len(items) - 3)]
+        assert sorted(drawn + rest) == sorted(items)
+
+    def test_set_current(self):
+        """Тест: вибраний вручну елемент не повторюється в проході"""
+        items = list(range(10))
+        engine = _engine(items)
+        drawn = [engine.next() for _ in range(4)]
+
+        chosen = next(item for item in items if item not in drawn)
+        engine.set_current(chosen)
+        assert engine.current() == chosen
+
+        # Повернення до вже відтвореного елемента не змінює пул
+        engine.set_current(drawn[1])
+        assert engine.get_remaining_count() == 5
+
+        rest = [engine.next() for _ in range(5)]
+        assert sorted(drawn + [chosen] + rest) == items
+
+    def test_invalidate(self):
+        """Тест: після повної заміни джерела пул перебудовується"""
+        items = list(range(5))
+        engine = _engine(items)
+        first = engine.next()
+
+        items[:] = [first] + list(range(50, 55))
+        engine.invalidate()
+        assert sorted(engine.next() for _ in range(5)) == list(range(50, 55))
+
+    def test_single_and_empty(self):
+        """Тест: єдиний елемент повторюється, порожнє джерело дає None"""
+        assert _engine([]).next() is None
+
+        engine = _engine(['a'])
+        assert engine.next() == 'a'
+        assert engine.next() == 'a'
@@ -0,0 +1,141 @@
+"""
+Тести для модуля track_store
+"""
+import pytest
+import random
+import tracemalloc
+from player.utils.track_store import TrackList, CompactTrackList, TrackView
+
+
+def _paths(count, start=0):
+    return [f"/music/Artist {i % 50}/Альбом {i % 7}/{i:05d} - Пісня.mp3" for i in range(start, start + count)]
+
+
+@pytest.fixture(params=[TrackList, CompactTrackList])
+def store_class(request):
+    """Фікстура: обидва сховища мають однаковий інтерфейс"""
+    return request.param
+
+
+class TestTrackStore:
+    """Тести для TrackList та CompactTrackList"""
+
+    def test_basic_operations(self, store_class):
+        """Тест додавання, пошуку, видалення та заміни"""
+        paths = _paths(10)
+        store = store_class(paths[:5])
+        for path in paths[5:]:
+            store.append(path)
+
+        assert len(store) == 10
+        assert list(store) == paths
+        assert store[3] == paths[3] and store[-1] == paths[-1]
+        assert store.index_of(paths[7]) == 7
+        assert paths[2] in store and "/other.mp3" not in store
+
+        assert store.pop(2) == paths[2]
+        assert paths[2] not in store
+        assert store.index_of(paths[3]) == 2
+        assert store.index_of(paths[9]) == 8
+
+        store.replace(0, "C:\\Music\\нова.flac")
+        assert store[0] == "C:\\Music\\нова.flac"
+        assert store.index_of(paths[0]) == -1
+        assert store.index_of("C:\\Music\\нова.flac") == 0
+
+        store.clear()
+        assert len(store) == 0 and store.to_list() == []
+
+    def test_unusual_names(self, store_class):
+        """Тест шляхів без папки, з емодзі та недекодованими байтами"""
+        paths = ["song.mp3", "/", "/music/🎵.ogg", "/music/bad\udcff.mp3"]
+        store = store_class(paths)
+        assert store.to_list() == paths
+        assert [store.index_of(path) for path in paths] == [0, 1, 2, 3]
+
+    def test_random_operations(self, store_class):
+        """Тест узгодженості позицій при випадкових змінах"""
+        rng = random.Random(42)
+        store = store_class()
+        reference = []
+        pool = _paths(3000)
+        next_path = iter(pool)
+        for _ in range(2000):
+            action = rng.random()
+            if action < 0.55 or not reference:
+                path = next(next_path)
+                store.append(path)
+                reference.append(path)
+            elif action < 0.85:
+                index = rng.randrange(len(reference))
+                assert store.pop(index) == reference.pop(index)
+            elif action < 0.95:
+                start = rng.randrange(len(reference))
+                stop = rng.randint(start + 1, len(reference))
+                targets = [*range(start), *range(stop + 1, len(reference) + 1)]
+                if targets:
+                    dest = rng.choice(targets)
+                    store.move(start, stop, dest)
+                    block = reference[start:stop]
+                    rest = reference[:start] + reference[stop:]
+                    insert_at = dest if dest < start else dest - len(block)
+                    reference = rest[:insert_at] + block + rest[insert_at:]
+            else:
+                index = rng.randrange(len(reference))
+                path = next(next_path)
+                store.replace(index, path)
+                reference[index] = path
+
+        assert store.to_list() == reference
+        for index, path in enumerate(reference):
+            assert store.index_of(path) == index
+
+    def test_permute(self, store_class):
+        """Тест перестановки записів"""
+        paths = _paths(100)
+        order = list(range(100))
+        random.Random(7).shuffle(order)
+        store = store_class(paths)
+        store.permute(order)
+        assert store.to_list() == [paths[index] for index in order]
+        assert [store.index_of(path) for path in store] == list(range(100))
+
+    def test_view(self, store_class):
+        """Тест представлення без копіювання: індекси, зрізи, пошук, живі зміни"""
+        paths = _paths(10)
+        store = store_class(paths)
+        view = TrackView(lambda: store)
+        assert len(view) == 10 and list(view) == paths
+        assert view[-1] == paths[-1]
+        assert paths[4] in view and view.index(paths[4]) == 4
+
+        window = view[2:6]
+        assert isinstance(window, TrackView)
+        assert list(window) == paths[2:6] and window[0] == paths[2]
+        assert paths[1] not in window and window.index(paths[5]) == 3
+        assert list(view[::-3]) == paths[::-3]
+        with pytest.raises(ValueError):
+            window.index(paths[7])
+        with pytest.raises(IndexError):
+            window[4]
+
+        store.append("/music/new.mp3")
+        assert len(view) == 11 and view[10] == "/music/new.mp3"
+        assert len(window) == 4
+
+    def test_compact_memory(self):
+        """Тест: компактне сховище займає в рази менше пам'яті"""
+        paths = [f"/home/user/Music/Artist {i % 500}/Album {i % 3}/{i:06d} - Track title.flac"
+                 for i in range(50000)]
+
+        def measure(store_class):
+            tracemalloc.start()
+            copies = [''.join(path) for path in paths]  # Нові рядки - враховуються в розмірі
+            store = store_class(copies)
+            del copies
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(store) == len(paths)
+            return size
+
+        assert measure(CompactTrackList) * 2.5 < measure(TrackList)
@@ -0,0 +1,103 @@
+"""
+Тести для модуля track_validator
+"""
+import pytest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from PyQt6.QtWidgets import QApplication
+from player.playlist import Playlist
+from player.ui.main_window import MainWindow
+from player.utils import track_validator
+from player.utils.track_validator import TrackValidator
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Фікстура для QApplication"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def library():
+    """Фікстура з тимчасовою бібліотекою: дві папки по два файли"""
+    with tempfile.TemporaryDirectory() as library_dir:
+        root = Path(library_dir)
+        paths = []
+        for album in ("a", "b"):
+            (root / album).mkdir()
+            for name in ("01.mp3", "02.mp3"):
+                (root / album / name).write_bytes(b'data')
+                paths.append(str(root / album / name))
+        yield root, paths
+
+
+def _collect(qapp, validator, file_paths):
+    """Запускає перевірку та збирає всі відсутні треки"""
+    missing = []
+    validator.tracks_missing.connect(missing.extend)
+    validator.validate(file_paths)
+    assert validator.wait(3000)
+    qapp.processEvents()
+    return sorted(missing)
+
+
+class TestTrackValidator:
+    """Тести для фонової перевірки наявності треків"""
+
+    def test_all_present(self, qapp, library):
+        """Тест: наявні треки не повідомляються"""
+        _, paths = library
+        assert _collect(qapp, TrackValidator(), paths) == []
+
+    def test_missing_files(self, qapp, library):
+        """Тест виявлення відсутніх файлів та папок"""
+        root, paths = library
+        Path(paths[0]).unlink()
+        gone = [str(root / "gone" / "01.mp3"), str(root / "gone" / "02.mp3")]
+        not_dir = str(root / "a" / "02.mp3" / "x.mp3")
+        assert _collect(qapp, TrackValidator(), paths + gone + [not_dir]) == sorted([paths[0], not_dir] + gone)
+
+    def test_one_listing_per_directory(self, qapp, library, monkeypatch):
+        """Тест: кожна папка читається один раз, скільки б треків у ній не було"""
+        _, paths = library
+        listed = []
+        original = track_validator.os.scandir
+        monkeypatch.setattr(track_validator.os, 'scandir',
+                            lambda directory: listed.append(directory) or original(directory))
+        _collect(qapp, TrackValidator(), paths * 3)
+        assert sorted(listed) == sorted({str(Path(path).parent) for path in paths})
+
+    def test_cancel(self, qapp, library):
+        """Тест: після скасування результати не надходять"""
+        root, _ = library
+        validator = TrackValidator()
+        missing = []
+        validator.tracks_missing.connect(missing.extend)
+        validator.validate([str(root / "gone" / "01.mp3")])
+        validator.cancel()
+        validator.wait(3000)
+        qapp.processEvents()
+        assert missing == []
+
+    def test_pruned_tracks_not_undoable(self, qapp, library):
+        """Тест: undo після фонового прибирання не повертає відсутні треки"""
+        _, paths = library
+        playlist = Playlist()
+        playlist.add_tracks(paths, validate=False)
+        forgotten = []
+        window = SimpleNamespace(_player=SimpleNamespace(get_playlist=lambda: playlist,
+                                                         forget_tracks=forgotten.extend))
+        Path(paths[1]).unlink()
+        Path(paths[3]).unlink()
+
+        missing = _collect(qapp, TrackValidator(), paths)
+        MainWindow._on_tracks_missing(window, missing)
+        assert playlist.get_tracks() == [paths[0], paths[2]]
+        assert forgotten == missing
+
+        playlist.undo()
+        assert playlist.get_tracks() == [paths[0], paths[2]]
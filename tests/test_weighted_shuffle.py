@@ -0,0 +1,106 @@
+"""
+Тести для модуля weighted_shuffle
+"""
+from collections import Counter
+from datetime import datetime
+import random
+import pytest
+from player.utils.weighted_shuffle import (
+    FenwickTree, WeightedShuffle, track_weight, RECENT_SECONDS, RECENT_FACTOR
+)
+
+
+class TestFenwickTree:
+    """Тести для FenwickTree"""
+
+    def test_against_plain_sums(self):
+        """Тест: префіксні суми та пошук збігаються з простим обчисленням"""
+        rng = random.Random(1)
+        tree, values = FenwickTree(), []
+        for _ in range(200):
+            value = float(rng.randint(0, 5))
+            tree.append(value)
+            values.append(value)
+        for _ in range(200):
+            index = rng.randrange(len(values))
+            delta = float(rng.randint(-int(values[index]), 3))
+            tree.add(index, delta)
+            values[index] += delta
+
+        for count in range(len(values) + 1):
+            assert tree.prefix_sum(count) == pytest.approx(sum(values[:count]))
+        for target in range(int(sum(values))):
+            index = tree.find(target + 0.5)
+            assert sum(values[:index]) <= target + 0.5 < sum(values[:index + 1])
+        assert tree.find(sum(values)) == len(values)
+
+
+class TestWeightedShuffle:
+    """Тести для WeightedShuffle"""
+
+    NOW = datetime(2026, 1, 1, 12).timestamp()
+
+    def _shuffle(self, items, stats, seed=0, clock=None):
+        return WeightedShuffle(lambda: list(items), stats.get, lambda item: item in items,
+                               random.Random(seed), clock or (lambda: self.NOW))
+
+    def test_track_weight(self):
+        """Тест: рідко відтворені важать більше, нещодавні - менше"""
+        old = datetime.fromtimestamp(self.NOW - 2 * RECENT_SECONDS).isoformat()
+        recent = datetime.fromtimestamp(self.NOW - 60).isoformat()
+
+        assert track_weight(None, self.NOW) == 1.0
+        assert track_weight({'play_count': 3, 'last_played': old}, self.NOW) == pytest.approx(0.5)
+        assert track_weight({'play_count': 3, 'last_played': recent}, self.NOW) == pytest.approx(0.5 * RECENT_FACTOR)
+
+    def test_distribution(self):
+        """Тест: частота вибору пропорційна вазі"""
+        old = datetime.fromtimestamp(self.NOW - 2 * RECENT_SECONDS).isoformat()
+        items = ['rare', 'popular']
+        stats = {'popular': {'play_count': 99, 'last_played': old}}
+        shuffle = self._shuffle(items, stats)
+
+        counts = Counter(shuffle.next() for _ in range(11000))
+        # Ваги 1.0 та 0.1
+        assert counts['rare'] / counts['popular'] == pytest.approx(10, rel=0.2)
+
+    def test_excludes_current(self):
+        """Тест: поточний трек не вибирається, якщо є інші"""
+        items = ['a', 'b', 'c']
+        shuffle = self._shuffle(items, {})
+        assert all(shuffle.next('a') != 'a' for _ in range(100))
+        assert self._shuffle(['a'], {}).next('a') == 'a'
+        assert self._shuffle([], {}).next() is None
+
+    def test_update_and_cooldown(self):
+        """Тест: відтворений трек отримує меншу вагу до кінця охолодження"""
+        now = [self.NOW]
+        items = ['a', 'b']
+        stats = {}
+        shuffle = self._shuffle(items, stats, clock=lambda: now[0])
+        shuffle.next()
+
+        stats['a'] = {'play_count': 0, 'last_played': datetime.fromtimestamp(now[0]).isoformat()}
+        shuffle.update('a')
+        counts = Counter(shuffle.next() for _ in range(2100))
+        assert counts['b'] > 15 * counts['a']
+
+        now[0] += RECENT_SECONDS + 1
+        counts = Counter(shuffle.next() for _ in range(2000))
+        assert counts['a'] == pytest.approx(1000, rel=0.15)
+
+    def test_add_and_remove(self):
+        """Тест: нові треки вибираються, видалені - ні"""
+        items = [f"t{i}" for i in range(50)]
+        shuffle = self._shuffle(items, {})
+        shuffle.next()
+
+        del items[10:]
+        items.append('new')
+        shuffle.add('new')
+        drawn = {shuffle.next() for _ in range(500)}
+        assert drawn == set(items)
+
+        items[:] = ['x', 'y']
+        shuffle.invalidate()
+        assert {shuffle.next() for _ in range(50)} == {'x', 'y'}